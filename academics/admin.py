@@ -23,9 +23,11 @@ from django.contrib import admin, messages
 from .models import (
     SchoolClass, Subject, ClassSubject, StudentResult,
     StudentAttendance, StudentAffectiveTraits, StudentPsychomotorTraits,
-    StudentTermReport, ClassTermInfo
+    StudentTermReport, ClassTermInfo, TermComputationRun, GradingScale, GradingBand, CommentRule,
+    ResultPublication
 )
-from .services import compute_term_results
+from .grading import get_grading_scale, regrade_results
+from .services import compute_term_results_batch, delete_results, save_result
 from students.models import Student
 
 
@@ -92,22 +94,42 @@ class StudentResultAdmin(admin.ModelAdmin):
 
         return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
+    # Score edits here must keep the term and session summaries in step
+    def save_model(self, request, obj, form, change):
+        save_result(obj)
+
+    def delete_model(self, request, obj):
+        delete_results(StudentResult.objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        delete_results(queryset)
+
     def compute_results(self, request, queryset):
         if not queryset.exists():
             self.message_user(request, "No results selected.", messages.WARNING)
             return
 
-        sample = queryset.first()
-
-        compute_term_results(
-            school_class=sample.school_class,
-            academic_session=sample.academic_session,
-            term=sample.term,
+        # Every class/session/term touched by the selection, not just the first row's
+        jobs = list(
+            queryset
+            .values_list("school_class_id", "academic_session_id", "term")
+            .distinct()
+            .order_by()
         )
+        outcomes = compute_term_results_batch(jobs)
+        failed = [job for job, error in outcomes if error]
+
+        if failed:
+            self.message_user(
+                request,
+                f"Computed {len(jobs) - len(failed)} of {len(jobs)} class terms; {len(failed)} failed.",
+                messages.WARNING,
+            )
+            return
 
         self.message_user(
             request,
-            "Term results computed successfully.",
+            f"Term results computed successfully for {len(jobs)} class term(s).",
             messages.SUCCESS,
         )
 
@@ -146,3 +168,46 @@ class StudentTermReportAdmin(admin.ModelAdmin):
 class ClassTermInfoAdmin(admin.ModelAdmin):
     list_display = ("school_class", "academic_session", "term", "class_population", "times_school_opened", "next_term_begins")
     list_filter = ("school_class", "academic_session", "term")
+
+
+@admin.register(TermComputationRun)
+class TermComputationRunAdmin(admin.ModelAdmin):
+    list_display = ("__str__", "session_name", "term", "total_classes", "started_at", "finished_at")
+    list_filter = ("school", "term")
+    readonly_fields = ("completed_class_ids", "failed_class_ids", "started_at", "finished_at")
+
+
+class GradingBandInline(admin.TabularInline):
+    model = GradingBand
+    extra = 0
+
+
+class CommentRuleInline(admin.TabularInline):
+    model = CommentRule
+    extra = 0
+
+
+@admin.register(GradingScale)
+class GradingScaleAdmin(admin.ModelAdmin):
+    list_display = ("school", "name", "pass_mark", "updated_at")
+    search_fields = ("school__name",)
+    inlines = [GradingBandInline, CommentRuleInline]
+    actions = ["regrade_school_results"]
+
+    def regrade_school_results(self, request, queryset):
+        updated = 0
+        for grading_scale in queryset:
+            updated += regrade_results(
+                StudentResult.objects.filter(school_class__school_id=grading_scale.school_id),
+                get_grading_scale(grading_scale.school_id),
+            )
+        self.message_user(request, f"Re-graded {updated} results.", messages.SUCCESS)
+
+    regrade_school_results.short_description = "Re-grade existing results with this scale"
+
+
+@admin.register(ResultPublication)
+class ResultPublicationAdmin(admin.ModelAdmin):
+    list_display = ("school_class", "academic_session", "term", "version", "student_count", "published_by", "published_at")
+    list_filter = ("academic_session", "term")
+    readonly_fields = ("school_class", "academic_session", "term", "version", "student_count", "published_by", "published_at")
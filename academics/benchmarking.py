@@ -0,0 +1,56 @@
+"""
+Synthetic data for the benchmark management commands. Callers create it
+inside a transaction and roll it back when they are done.
+"""
+from academics.models import ClassSubject, SchoolClass, StudentResult, Subject
+from schools.models import AcademicSession, School
+from students.models import Student
+
+
+def build_synthetic_class(size, subject_count, rng, term="First"):
+    """
+    A school with one session and one class of size students taking
+    subject_count subjects, every student with random scores for every
+    subject in the term. Returns (school_class, session).
+    """
+    school = School.objects.create(name=f"Benchmark School {size}", address="-")
+    session = AcademicSession.objects.create(school=school, name="2025/2026")
+    school_class = SchoolClass.objects.create(school=school, name=f"BENCH{size}")
+
+    subjects = Subject.objects.bulk_create(
+        Subject(school=school, name=f"Subject {i}") for i in range(subject_count)
+    )
+    ClassSubject.objects.bulk_create(
+        ClassSubject(school_class=school_class, subject=subject) for subject in subjects
+    )
+    # bulk_create skips the post_save signal that provisions a login per student
+    students = Student.objects.bulk_create(
+        Student(
+            school=school,
+            school_class=school_class,
+            first_name=f"Student{i}",
+            last_name="Bench",
+            admission_number=f"BENCH/{size}/{i}",
+        )
+        for i in range(size)
+    )
+
+    results = []
+    for student in students:
+        for subject in subjects:
+            test1, test2, exam = rng.randint(0, 20), rng.randint(0, 20), rng.randint(0, 60)
+            result = StudentResult(
+                student=student,
+                school_class=school_class,
+                subject=subject,
+                academic_session=session,
+                term=term,
+                test1=test1,
+                test2=test2,
+                exam=exam,
+            )
+            result.total = test1 + test2 + exam
+            results.append(result)
+    StudentResult.objects.bulk_create(results, batch_size=500)
+
+    return school_class, session
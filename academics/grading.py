@@ -0,0 +1,273 @@
+"""
+Grading scales compiled to lookup tables.
+
+A school's GradingScale is compiled once per process into a 101-entry
+array mapping every whole score 0-100 to its band, so grading a single
+score or a whole array of scores is an index operation. Its comment
+rules are compiled alongside and applied to whole arrays of students at
+once. Saving or deleting a GradingScale, GradingBand or CommentRule gives the
+scale a new revision; every lookup reads the revision (one indexed
+query) and recompiles when it has changed, so other worker processes pick up the
+change on their next lookup rather than when they restart.
+"""
+from collections import defaultdict, namedtuple
+
+import numpy as np
+from django.db.models import Case, Value, When
+
+Band = namedtuple("Band", "grade min_score remark label teacher_comment principal_comment")
+Rule = namedtuple("Rule", "comment_type grade trend min_failed max_failed comment")
+
+DEFAULT_PASS_MARK = 40
+# Term averages within this many points of last term's count as steady
+TREND_MARGIN = 2.0
+
+DEFAULT_BANDS = (
+    Band("A", 80, "Excellent", "Excellent",
+         "An excellent result. You are a star! Keep up the brilliant performance.",
+         "Excellent performance."),
+    Band("B", 70, "Very Good", "Very Good",
+         "A very good performance. You have shown great potential. Keep it up.",
+         "Very Good performance."),
+    Band("C", 60, "Good", "Good",
+         "A good result. With more focus on your weak areas, you can do even better.",
+         "Good performance."),
+    Band("D", 50, "Pass", "Pass",
+         "A fair performance. You need to put in more effort to reach your full potential.",
+         "Fair performance."),
+    Band("E", 40, "Fail", "Fair",
+         "Pass mark obtained. You are capable of much more; please study harder next term.",
+         "Poor performance."),
+    Band("F", 0, "Fail", "Fail",
+         "Poor performance. You need to be far more serious with your studies. See me for counseling.",
+         "Fail. Needs to repeat."),
+)
+
+
+class CompiledGradingScale:
+    """
+    Bands ordered best first plus a lookup array from whole score to band
+    index. Scores are floored and clipped to 0-100 before lookup; scores
+    below the lowest band's min_score fall into the lowest band.
+    """
+
+    def __init__(self, bands, pass_mark=DEFAULT_PASS_MARK, rules=()):
+        self.bands = tuple(sorted(bands, key=lambda band: band.min_score, reverse=True))
+        if not self.bands:
+            raise ValueError("A grading scale needs at least one band")
+        self.pass_mark = pass_mark
+        self.rules = tuple(rules)
+
+        self.lookup = np.full(101, len(self.bands) - 1, dtype=np.intp)
+        for index in range(len(self.bands) - 1, -1, -1):
+            self.lookup[self.bands[index].min_score:] = index
+
+        self._grades = np.array([band.grade for band in self.bands], dtype=object)
+        self._remarks = np.array([band.remark for band in self.bands], dtype=object)
+
+    def band_indexes(self, scores):
+        """Band index for every score in an array."""
+        scores = np.floor(np.asarray(scores, dtype=float))
+        return self.lookup[np.clip(scores, 0, 100).astype(np.intp)]
+
+    def grades(self, scores):
+        return self._grades[self.band_indexes(scores)]
+
+    def remarks(self, scores):
+        return self._remarks[self.band_indexes(scores)]
+
+    def band(self, score):
+        return self.bands[int(self.band_indexes(score))]
+
+    def grade(self, score):
+        return self.band(score).grade
+
+    def remark(self, score):
+        return self.band(score).remark
+
+    def teacher_comment(self, score):
+        return self.band(score).teacher_comment
+
+    def principal_comment(self, score):
+        return self.band(score).principal_comment
+
+    def comments(self, averages, failed_counts, previous_averages, comment_type="teacher"):
+        """
+        Automatic comment for each student from their term average, number
+        of failed subjects and last term's average (None when there is
+        none). The first matching rule of the comment type wins; students
+        no rule matches get their band's comment.
+        """
+        averages = np.asarray(averages, dtype=float)
+        failed_counts = np.asarray(failed_counts, dtype=int)
+        previous = np.array([np.nan if value is None else value for value in previous_averages], dtype=float)
+
+        band_indexes = self.band_indexes(averages)
+        band_comment = "teacher_comment" if comment_type == "teacher" else "principal_comment"
+        comments = np.array([getattr(band, band_comment) for band in self.bands], dtype=object)[band_indexes]
+        grades = self._grades[band_indexes]
+
+        change = averages - previous
+        trends = np.full(len(averages), "", dtype=object)
+        has_previous = ~np.isnan(previous)
+        trends[has_previous & (change >= TREND_MARGIN)] = "UP"
+        trends[has_previous & (change <= -TREND_MARGIN)] = "DOWN"
+        trends[has_previous & (np.abs(change) < TREND_MARGIN)] = "STEADY"
+
+        unmatched = np.ones(len(averages), dtype=bool)
+        for rule in self.rules:
+            if rule.comment_type != comment_type:
+                continue
+            match = unmatched.copy()
+            if rule.grade:
+                match &= grades == rule.grade
+            if rule.trend:
+                match &= trends == rule.trend
+            if rule.min_failed is not None:
+                match &= failed_counts >= rule.min_failed
+            if rule.max_failed is not None:
+                match &= failed_counts <= rule.max_failed
+            comments[match] = rule.comment
+            unmatched &= ~match
+        return comments.tolist()
+
+    def to_data(self):
+        """The bands and pass mark as plain JSON-ready data, for from_data()."""
+        return {"pass_mark": self.pass_mark, "bands": [band._asdict() for band in self.bands]}
+
+    @classmethod
+    def from_data(cls, data):
+        """A scale rebuilt from to_data() output, without its comment rules."""
+        return cls([Band(**band) for band in data["bands"]], data["pass_mark"])
+
+    def key_rows(self):
+        """Key to grading lines, e.g. 'A (Excellent) = 80 - 100%'."""
+        rows = []
+        upper = 100
+        for band in self.bands:
+            rows.append(f"{band.grade} ({band.label}) = {band.min_score} - {upper}%")
+            upper = band.min_score - 1
+        return rows
+
+
+DEFAULT_SCALE = CompiledGradingScale(DEFAULT_BANDS)
+
+# school id -> (GradingScale.revision or None without a scale, compiled scale)
+_compiled_scales = {}
+
+
+def _compile(school_id):
+    from .models import CommentRule, GradingScale
+
+    scale = GradingScale.objects.filter(school_id=school_id).values("pass_mark").first()
+    if scale is None:
+        return DEFAULT_SCALE
+
+    rules = [
+        Rule(
+            comment_type=row["comment_type"],
+            grade=row["grade"],
+            trend=row["trend"],
+            min_failed=row["min_failed_subjects"],
+            max_failed=row["max_failed_subjects"],
+            comment=row["comment"],
+        )
+        for row in CommentRule.objects.filter(scale__school_id=school_id).values(
+            "comment_type", "grade", "trend", "min_failed_subjects", "max_failed_subjects", "comment"
+        )
+    ]
+    return CompiledGradingScale(_load_bands(school_id) or DEFAULT_BANDS, scale["pass_mark"], rules)
+
+
+def _load_bands(school_id):
+    from .models import GradingBand
+
+    bands = []
+    for row in GradingBand.objects.filter(scale__school_id=school_id).values(
+        "grade", "min_score", "remark", "label", "teacher_comment", "principal_comment"
+    ):
+        bands.append(Band(
+            grade=row["grade"],
+            min_score=row["min_score"],
+            remark=row["remark"],
+            label=row["label"] or row["remark"],
+            teacher_comment=row["teacher_comment"] or row["remark"],
+            principal_comment=row["principal_comment"] or row["remark"],
+        ))
+    return bands
+
+
+def get_grading_scale(school):
+    """
+    Compiled grading scale for a school (a School or its id); the default
+    scale when the school has not configured one.
+    """
+    school_id = getattr(school, "pk", school)
+    if school_id is None:
+        return DEFAULT_SCALE
+
+    from .models import GradingScale
+
+    revision = GradingScale.objects.filter(school_id=school_id).values_list("revision", flat=True).first()
+    return _scale_at(school_id, revision)
+
+
+def get_class_grading_scale(school_class_id):
+    """
+    get_grading_scale() for the school of a class given by id, with the
+    school and its scale's revision read in one query.
+    """
+    from .models import SchoolClass
+
+    row = (
+        SchoolClass.objects.filter(pk=school_class_id)
+        .values_list("school_id", "school__grading_scale__revision")
+        .first()
+    )
+    if row is None:
+        return DEFAULT_SCALE
+    return _scale_at(*row)
+
+
+def _scale_at(school_id, revision):
+    """The school's compiled scale, recompiled when its revision has moved on."""
+    cached = _compiled_scales.get(school_id)
+    if cached is None or cached[0] != revision:
+        cached = (revision, _compile(school_id))
+        _compiled_scales[school_id] = cached
+    return cached[1]
+
+
+def invalidate_grading_scales():
+    _compiled_scales.clear()
+
+
+def regrade_results(results, scale, batch_size=2000):
+    """
+    Recomputes grade and remark of every result in the queryset from its
+    stored total with the given scale, one UPDATE per batch of results.
+    Returns the number of results updated.
+    """
+    rows = list(results.values_list("id", "total"))
+    updated = 0
+
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        band_indexes = scale.band_indexes([total for _, total in batch])
+
+        ids_by_band = defaultdict(list)
+        for (result_id, _), index in zip(batch, band_indexes.tolist()):
+            ids_by_band[index].append(result_id)
+
+        updated += results.model.objects.filter(id__in=[result_id for result_id, _ in batch]).update(
+            grade=Case(*(
+                When(id__in=band_ids, then=Value(scale.bands[index].grade))
+                for index, band_ids in ids_by_band.items()
+            )),
+            remark=Case(*(
+                When(id__in=band_ids, then=Value(scale.bands[index].remark))
+                for index, band_ids in ids_by_band.items()
+            )),
+        )
+
+    return updated
@@ -0,0 +1,40 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from academics.benchmarking import build_synthetic_class
+from academics.services import compute_term_results
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark compute_term_results on synthetic classes of increasing size. "
+        "All data is created inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="10,30,60,120", help="Comma separated class sizes")
+        parser.add_argument("--subjects", type=int, default=14)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        sizes = [int(s) for s in options["sizes"].split(",") if s.strip()]
+        rng = random.Random(options["seed"])
+
+        self.stdout.write(f"{'students':>8} {'results':>8} {'queries':>8} {'seconds':>8}")
+        with transaction.atomic():
+            for size in sizes:
+                school_class, session = build_synthetic_class(size, options["subjects"], rng)
+
+                with CaptureQueriesContext(connection) as ctx:
+                    started = time.perf_counter()
+                    compute_term_results(school_class, session, "First")
+                    elapsed = time.perf_counter() - started
+
+                results = size * options["subjects"]
+                self.stdout.write(f"{size:>8} {results:>8} {len(ctx.captured_queries):>8} {elapsed:>8.3f}")
+
+            transaction.set_rollback(True)
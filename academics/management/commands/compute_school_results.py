@@ -0,0 +1,88 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from academics.models import SchoolClass, TermComputationRun, TERM_CHOICES
+from academics.services import compute_term_results_batch, school_term_jobs
+from schools.models import School
+
+
+class Command(BaseCommand):
+    help = (
+        "Compute term results (subject positions, summaries and class positions) "
+        "for every class of a school, or of every school, in parallel. "
+        "An interrupted run resumes where it stopped unless --restart is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--term", required=True, choices=[t[0] for t in TERM_CHOICES])
+        parser.add_argument("--school", type=int, help="School id (default: every active school)")
+        parser.add_argument("--session", default="", help="Session name, e.g. 2024/2025 (default: active session)")
+        parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+        parser.add_argument("--restart", action="store_true", help="Ignore any unfinished run and start over")
+
+    def handle(self, *args, **options):
+        term = options["term"]
+        session_name = options["session"]
+
+        school = None
+        if options["school"]:
+            try:
+                school = School.objects.get(id=options["school"])
+            except School.DoesNotExist:
+                raise CommandError(f"School {options['school']} not found")
+
+        jobs = school_term_jobs(term, school=school, session_name=session_name)
+        if not jobs:
+            self.stdout.write("No results found for this term; nothing to compute.")
+            return
+
+        run = None
+        if not options["restart"]:
+            run = TermComputationRun.objects.filter(
+                school=school, session_name=session_name, term=term, finished_at__isnull=True
+            ).first()
+        if run:
+            done = set(run.completed_class_ids)
+            self.stdout.write(f"Resuming run #{run.id}: {len(done)} classes already computed.")
+            jobs = [job for job in jobs if job[0] not in done]
+        else:
+            run = TermComputationRun.objects.create(
+                school=school, session_name=session_name, term=term, total_classes=len(jobs)
+            )
+
+        names = dict(
+            SchoolClass.objects
+            .filter(id__in=[job[0] for job in jobs])
+            .values_list("id", "name")
+        )
+
+        def on_progress(job, error, done, total):
+            class_id = job[0]
+            if error:
+                if class_id not in run.failed_class_ids:
+                    run.failed_class_ids.append(class_id)
+                self.stderr.write(f"[{done}/{total}] {names.get(class_id, class_id)}: FAILED - {error}")
+            else:
+                run.completed_class_ids.append(class_id)
+                if class_id in run.failed_class_ids:
+                    run.failed_class_ids.remove(class_id)
+                self.stdout.write(f"[{done}/{total}] {names.get(class_id, class_id)}: done")
+            # Checkpoint after every class so a crash can resume from here
+            run.save(update_fields=["completed_class_ids", "failed_class_ids"])
+
+        started = timezone.now()
+        compute_term_results_batch(jobs, workers=options["workers"], on_progress=on_progress)
+
+        if run.failed_class_ids:
+            self.stderr.write(
+                f"Run #{run.id} finished with {len(run.failed_class_ids)} failed classes; "
+                f"re-run the command to retry them."
+            )
+            return
+
+        run.finished_at = timezone.now()
+        run.save(update_fields=["finished_at"])
+        elapsed = (run.finished_at - started).total_seconds()
+        self.stdout.write(self.style.SUCCESS(
+            f"Computed {len(run.completed_class_ids)} classes in {elapsed:.1f}s."
+        ))
@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from academics.models import CommentRule, SchoolClass, TERM_CHOICES
+from academics.services import generate_term_comments
+from schools.models import AcademicSession, School
+
+
+class Command(BaseCommand):
+    help = (
+        "Write automatic class teacher (or principal) comments on the term "
+        "reports of every class of a school, or of every school, using each "
+        "school's comment rules."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--term", required=True, choices=[t[0] for t in TERM_CHOICES])
+        parser.add_argument("--school", type=int, help="School id (default: every active school)")
+        parser.add_argument("--session", default="", help="Session name, e.g. 2024/2025 (default: active session)")
+        parser.add_argument(
+            "--type", dest="comment_type", default=CommentRule.TEACHER,
+            choices=[choice[0] for choice in CommentRule.COMMENT_TYPE_CHOICES],
+        )
+
+    def handle(self, *args, **options):
+        schools = School.objects.filter(is_active=True)
+        if options["school"]:
+            if not School.objects.filter(id=options["school"]).exists():
+                raise CommandError(f"School {options['school']} not found")
+            schools = School.objects.filter(id=options["school"])
+
+        for school in schools:
+            sessions = AcademicSession.objects.filter(school=school)
+            if options["session"]:
+                sessions = sessions.filter(name=options["session"])
+            else:
+                sessions = sessions.filter(is_active=True)
+
+            for session in sessions:
+                started = time.perf_counter()
+                written = generate_term_comments(
+                    SchoolClass.objects.filter(school=school, is_active=True),
+                    session,
+                    options["term"],
+                    options["comment_type"],
+                )
+                self.stdout.write(
+                    f"{school.name} {session.name}: {written} comments in {time.perf_counter() - started:.2f}s"
+                )
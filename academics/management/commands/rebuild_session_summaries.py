@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from academics.models import SchoolClass, StudentResult
+from academics.services import refresh_session_summaries
+from schools.models import AcademicSession, School
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild cumulative session summaries (totals, averages, subject counts "
+        "and positions) from the stored results. Use to repair summaries after "
+        "results were changed outside the portal."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--school", type=int, help="School id (default: every active school)")
+        parser.add_argument("--session", default="", help="Session name, e.g. 2024/2025 (default: active session)")
+
+    def handle(self, *args, **options):
+        sessions = AcademicSession.objects.filter(school__is_active=True)
+        if options["school"]:
+            if not School.objects.filter(id=options["school"]).exists():
+                raise CommandError(f"School {options['school']} not found")
+            sessions = sessions.filter(school_id=options["school"])
+        if options["session"]:
+            sessions = sessions.filter(name=options["session"])
+        else:
+            sessions = sessions.filter(is_active=True)
+
+        pairs = list(
+            StudentResult.objects
+            .filter(academic_session__in=sessions, school_class__is_active=True)
+            .values_list("school_class_id", "academic_session_id")
+            .distinct()
+            .order_by("school_class_id")
+        )
+        classes = SchoolClass.objects.in_bulk({class_id for class_id, _ in pairs})
+        sessions = AcademicSession.objects.in_bulk({session_id for _, session_id in pairs})
+
+        for class_id, session_id in pairs:
+            refresh_session_summaries(classes[class_id], sessions[session_id])
+            self.stdout.write(f"{classes[class_id].name} ({sessions[session_id].name}): rebuilt")
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt session summaries for {len(pairs)} classes."))
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0014_alter_cbtexam_unique_together_cbtexam_cbt_type_and_more'),
+        ('schools', '0004_school_principal_signature_school_stamp'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TermComputationRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('session_name', models.CharField(blank=True, help_text="Academic session name (e.g. 2024/2025); empty means each school's active session", max_length=20)),
+                ('term', models.CharField(choices=[('First', 'First Term'), ('Second', 'Second Term'), ('Third', 'Third Term')], max_length=10)),
+                ('total_classes', models.PositiveIntegerField(default=0)),
+                ('completed_class_ids', models.JSONField(blank=True, default=list)),
+                ('failed_class_ids', models.JSONField(blank=True, default=list)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('school', models.ForeignKey(blank=True, help_text='Leave empty for a run across every school', null=True, on_delete=django.db.models.deletion.CASCADE, to='schools.school')),
+            ],
+            options={
+                'ordering': ['-started_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:05
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0015_termcomputationrun'),
+        ('schools', '0004_school_principal_signature_school_stamp'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='studentresult',
+            name='grade',
+            field=models.CharField(default='F', editable=False, max_length=3),
+        ),
+        migrations.CreateModel(
+            name='GradingScale',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(default='Default', max_length=100)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('school', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='grading_scale', to='schools.school')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='GradingBand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('grade', models.CharField(max_length=3)),
+                ('min_score', models.PositiveSmallIntegerField(help_text='Lowest score (0-100) that earns this grade', validators=[django.core.validators.MaxValueValidator(100)])),
+                ('remark', models.CharField(max_length=20)),
+                ('label', models.CharField(blank=True, help_text='Shown in the key to grading (defaults to the remark)', max_length=30)),
+                ('teacher_comment', models.TextField(blank=True, help_text='Automatic class teacher comment')),
+                ('principal_comment', models.TextField(blank=True, help_text='Automatic principal comment')),
+                ('scale', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bands', to='academics.gradingscale')),
+            ],
+            options={
+                'ordering': ['-min_score'],
+                'unique_together': {('scale', 'min_score')},
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0016_gradingscale'),
+        ('schools', '0004_school_principal_signature_school_stamp'),
+        ('students', '0003_student_date_of_birth_student_gender'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SessionResultSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_score', models.PositiveIntegerField(default=0)),
+                ('average', models.FloatField(default=0.0)),
+                ('subject_count', models.PositiveIntegerField(default=0)),
+                ('position', models.PositiveIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('academic_session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='schools.academicsession')),
+                ('school_class', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='academics.schoolclass')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='session_summaries', to='students.student')),
+            ],
+            options={
+                'ordering': ['position'],
+                'unique_together': {('student', 'school_class', 'academic_session')},
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:08
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0017_sessionresultsummary'),
+        ('schools', '0004_school_principal_signature_school_stamp'),
+        ('students', '0003_student_date_of_birth_student_gender'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResultPublication',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(choices=[('First', 'First Term'), ('Second', 'Second Term'), ('Third', 'Third Term')], max_length=10)),
+                ('version', models.PositiveIntegerField(default=1)),
+                ('student_count', models.PositiveIntegerField(default=0)),
+                ('published_at', models.DateTimeField(auto_now_add=True)),
+                ('academic_session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='schools.academicsession')),
+                ('published_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+                ('school_class', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='result_publications', to='academics.schoolclass')),
+            ],
+            options={
+                'ordering': ['-version'],
+                'unique_together': {('school_class', 'academic_session', 'term', 'version')},
+            },
+        ),
+        migrations.CreateModel(
+            name='PublishedResultSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('data', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='published_results', to='students.student')),
+                ('publication', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='academics.resultpublication')),
+            ],
+            options={
+                'unique_together': {('publication', 'student')},
+            },
+        ),
+    ]
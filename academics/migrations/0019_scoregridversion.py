@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0018_resultpublication'),
+        ('schools', '0004_school_principal_signature_school_stamp'),
+        ('students', '0003_student_date_of_birth_student_gender'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoreGridVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(choices=[('First', 'First Term'), ('Second', 'Second Term'), ('Third', 'Third Term')], max_length=10)),
+                ('version', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='studentresult',
+            name='version',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='studentresult',
+            index=models.Index(fields=['school_class', 'subject', 'academic_session', 'term', 'version'], name='result_grid_version_idx'),
+        ),
+        migrations.AddField(
+            model_name='scoregridversion',
+            name='academic_session',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='schools.academicsession'),
+        ),
+        migrations.AddField(
+            model_name='scoregridversion',
+            name='school_class',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='academics.schoolclass'),
+        ),
+        migrations.AddField(
+            model_name='scoregridversion',
+            name='subject',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='academics.subject'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='scoregridversion',
+            unique_together={('school_class', 'subject', 'academic_session', 'term')},
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:21
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0019_scoregridversion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gradingscale',
+            name='pass_mark',
+            field=models.PositiveSmallIntegerField(default=40, help_text='Subject totals below this count as failed subjects', validators=[django.core.validators.MaxValueValidator(100)]),
+        ),
+        migrations.CreateModel(
+            name='CommentRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('comment_type', models.CharField(choices=[('teacher', 'Class teacher'), ('principal', 'Principal')], default='teacher', max_length=10)),
+                ('priority', models.PositiveSmallIntegerField(default=0, help_text='Lower numbers are tried first')),
+                ('grade', models.CharField(blank=True, help_text='Grade of the term average (blank: any)', max_length=3)),
+                ('trend', models.CharField(blank=True, choices=[('UP', 'Improved on last term'), ('DOWN', 'Dropped from last term'), ('STEADY', 'About the same as last term')], help_text='Blank: any', max_length=10)),
+                ('min_failed_subjects', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('max_failed_subjects', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('comment', models.TextField()),
+                ('scale', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comment_rules', to='academics.gradingscale')),
+            ],
+            options={
+                'ordering': ['comment_type', 'priority', 'id'],
+            },
+        ),
+    ]
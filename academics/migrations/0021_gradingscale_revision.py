@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:53
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0020_commentrule'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gradingscale',
+            name='revision',
+            field=models.UUIDField(default=uuid.uuid4, editable=False),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0021_gradingscale_revision'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sessionresultsummary',
+            name='subjects',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -1,7 +1,12 @@
+import uuid
 
-from django.db import models
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, models, transaction
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from schools.models import School, AcademicSession
 from teachers.models import TeacherProfile
 
@@ -28,6 +33,38 @@ class TermResultSummary(models.Model):
     def __str__(self):
         return f"{self.student} - {self.term} ({self.average})"
 
+
+# -------------------------
+# SessionResultSummary (cumulative session results)
+# -------------------------
+class SessionResultSummary(models.Model):
+    """
+    A student's cumulative result for a whole session, kept in step with
+    the term results by academics.services so cumulative reads do not
+    have to re-aggregate every term's StudentResult rows.
+    """
+    student = models.ForeignKey('students.Student', on_delete=models.CASCADE, related_name='session_summaries')
+    school_class = models.ForeignKey('academics.SchoolClass', on_delete=models.CASCADE)
+    academic_session = models.ForeignKey('schools.AcademicSession', on_delete=models.CASCADE)
+    total_score = models.PositiveIntegerField(default=0)
+    average = models.FloatField(default=0.0)
+    subject_count = models.PositiveIntegerField(default=0)
+    position = models.PositiveIntegerField(null=True, blank=True)
+    # The cumulative card's subject rows ({subject: {First, Second, Third,
+    # total, avg}}); grades are applied on read with the current scale
+    subjects = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = (
+            'student', 'school_class', 'academic_session'
+        )
+        ordering = ['position']
+
+    def __str__(self):
+        return f"{self.student} - {self.academic_session} ({self.average})"
+
 # ...existing code...
 
 
@@ -189,6 +226,182 @@ TERM_CHOICES = (
 )
 
 
+# -------------------------
+# Grading Scale (per school)
+# -------------------------
+class GradingScale(models.Model):
+    """
+    A school's grading scale. Schools without one use the default
+    A-F scale in academics.grading.
+    """
+    school = models.OneToOneField(
+        School,
+        on_delete=models.CASCADE,
+        related_name="grading_scale"
+    )
+    name = models.CharField(max_length=100, default="Default")
+    pass_mark = models.PositiveSmallIntegerField(
+        default=40,
+        validators=[MaxValueValidator(100)],
+        help_text="Subject totals below this count as failed subjects"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+    # Replaced by every change to the scale, its bands or its comment rules,
+    # so each process can tell its compiled copy is out of date. A fresh
+    # value rather than a counter: saving a stale instance writes its old
+    # value back, which must never match a copy compiled since.
+    revision = models.UUIDField(default=uuid.uuid4, editable=False)
+
+    def __str__(self):
+        return f"{self.school.name} - {self.name}"
+
+
+class GradingBand(models.Model):
+    """
+    One grade of a grading scale: every score from min_score up to the
+    next band's min_score gets this grade, remark and comments.
+    """
+    scale = models.ForeignKey(
+        GradingScale,
+        on_delete=models.CASCADE,
+        related_name="bands"
+    )
+    grade = models.CharField(max_length=3)
+    min_score = models.PositiveSmallIntegerField(
+        validators=[MaxValueValidator(100)],
+        help_text="Lowest score (0-100) that earns this grade"
+    )
+    remark = models.CharField(max_length=20)
+    label = models.CharField(
+        max_length=30,
+        blank=True,
+        help_text="Shown in the key to grading (defaults to the remark)"
+    )
+    teacher_comment = models.TextField(blank=True, help_text="Automatic class teacher comment")
+    principal_comment = models.TextField(blank=True, help_text="Automatic principal comment")
+
+    class Meta:
+        ordering = ["-min_score"]
+        unique_together = ("scale", "min_score")
+
+    def __str__(self):
+        return f"{self.grade} ({self.min_score}+)"
+
+
+class CommentRule(models.Model):
+    """
+    Automatic comment for students matching every condition set on the
+    rule; blank conditions match anyone. Rules are tried by priority and
+    the first match wins. Students no rule matches get their grading
+    band's comment.
+    """
+    TEACHER = "teacher"
+    PRINCIPAL = "principal"
+    COMMENT_TYPE_CHOICES = (
+        (TEACHER, "Class teacher"),
+        (PRINCIPAL, "Principal"),
+    )
+    TREND_CHOICES = (
+        ("UP", "Improved on last term"),
+        ("DOWN", "Dropped from last term"),
+        ("STEADY", "About the same as last term"),
+    )
+
+    scale = models.ForeignKey(
+        GradingScale,
+        on_delete=models.CASCADE,
+        related_name="comment_rules"
+    )
+    comment_type = models.CharField(max_length=10, choices=COMMENT_TYPE_CHOICES, default=TEACHER)
+    priority = models.PositiveSmallIntegerField(default=0, help_text="Lower numbers are tried first")
+    grade = models.CharField(max_length=3, blank=True, help_text="Grade of the term average (blank: any)")
+    trend = models.CharField(max_length=10, choices=TREND_CHOICES, blank=True, help_text="Blank: any")
+    min_failed_subjects = models.PositiveSmallIntegerField(null=True, blank=True)
+    max_failed_subjects = models.PositiveSmallIntegerField(null=True, blank=True)
+    comment = models.TextField()
+
+    class Meta:
+        ordering = ["comment_type", "priority", "id"]
+
+    def __str__(self):
+        return f"{self.get_comment_type_display()} rule {self.priority}: {self.comment[:40]}"
+
+
+@receiver([post_save, post_delete], sender=GradingScale)
+@receiver([post_save, post_delete], sender=GradingBand)
+@receiver([post_save, post_delete], sender=CommentRule)
+def invalidate_compiled_grading_scale(sender, instance, **kwargs):
+    from .grading import invalidate_grading_scales
+    scale_id = instance.pk if sender is GradingScale else instance.scale_id
+    GradingScale.objects.filter(pk=scale_id).update(revision=uuid.uuid4())
+    invalidate_grading_scales()
+
+
+# -------------------------
+# Score Grid Versions (delta sync)
+# -------------------------
+class ScoreGridVersion(models.Model):
+    """
+    Change counter for one score grid (class, subject, session, term).
+    Every write to the grid bumps the counter and stamps the written
+    results with the new value, so clients can ask for "changes since N"
+    and detect edits made after the version they last saw.
+    """
+    school_class = models.ForeignKey(SchoolClass, on_delete=models.CASCADE)
+    subject = models.ForeignKey(Subject, on_delete=models.CASCADE)
+    academic_session = models.ForeignKey(AcademicSession, on_delete=models.CASCADE)
+    term = models.CharField(max_length=10, choices=TERM_CHOICES)
+    version = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        unique_together = (
+            "school_class",
+            "subject",
+            "academic_session",
+            "term",
+        )
+
+    def __str__(self):
+        return f"{self.school_class} - {self.subject_id} ({self.term}) v{self.version}"
+
+    @classmethod
+    def bump(cls, school_class_id, subject_id, academic_session_id, term):
+        """
+        Increments the grid's counter and returns the new value. Inside a
+        transaction the UPDATE holds the counter's row lock until commit,
+        which serialises concurrent writers to the same grid.
+        """
+        grid = cls.objects.filter(
+            school_class_id=school_class_id,
+            subject_id=subject_id,
+            academic_session_id=academic_session_id,
+            term=term,
+        )
+        if not grid.update(version=models.F("version") + 1):
+            try:
+                with transaction.atomic():
+                    cls.objects.create(
+                        school_class_id=school_class_id,
+                        subject_id=subject_id,
+                        academic_session_id=academic_session_id,
+                        term=term,
+                        version=1,
+                    )
+            except IntegrityError:
+                # Created by a concurrent writer in the meantime
+                grid.update(version=models.F("version") + 1)
+        return grid.values_list("version", flat=True).get()
+
+    @classmethod
+    def current(cls, school_class_id, subject_id, academic_session_id, term):
+        return cls.objects.filter(
+            school_class_id=school_class_id,
+            subject_id=subject_id,
+            academic_session_id=academic_session_id,
+            term=term,
+        ).values_list("version", flat=True).first() or 0
+
+
 # -------------------------
 # Student Result (Per Subject)
 # -------------------------
@@ -254,7 +467,7 @@ class StudentResult(models.Model):
 
     # Computed fields
     total = models.PositiveIntegerField(default=0, editable=False)
-    grade = models.CharField(max_length=1, default='F', editable=False)
+    grade = models.CharField(max_length=3, default='F', editable=False)
     
     # Subject position and highest in class
     subject_position = models.PositiveIntegerField(null=True, blank=True)
@@ -270,6 +483,9 @@ class StudentResult(models.Model):
     )
     remark = models.CharField(max_length=20, blank=True)
 
+    # Score grid version at this row's last change (see ScoreGridVersion)
+    version = models.PositiveBigIntegerField(default=0)
+
     class Meta:
         unique_together = (
             "student",
@@ -278,45 +494,73 @@ class StudentResult(models.Model):
             "academic_session",
             "term",
         )
+        indexes = [
+            models.Index(
+                fields=["school_class", "subject", "academic_session", "term", "version"],
+                name="result_grid_version_idx",
+            ),
+        ]
+
+    SCORE_FIELDS = ("ca1", "ca2", "ca3", "ca4", "test1", "test2", "exam")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Scores as loaded, so save() can tell whether they were edited
+        loaded = dict(zip(field_names, values))
+        if all(field in loaded for field in cls.SCORE_FIELDS):
+            instance._loaded_scores = tuple(loaded[field] for field in cls.SCORE_FIELDS)
+        return instance
+
+    def _scores_changed(self):
+        loaded = getattr(self, "_loaded_scores", None)
+        return loaded is None or loaded != tuple(getattr(self, field) for field in self.SCORE_FIELDS)
+
+    @staticmethod
+    def calculate_total(ca1=0, ca2=0, ca3=0, ca4=0, test1=0, test2=0, exam=0):
+        # Priority: CA1-4 if any are non-zero, otherwise Test1/2
+        ca_total = ca1 + ca2 + ca3 + ca4
+        if ca_total > 0:
+            return ca_total + exam
+        return test1 + test2 + exam
 
     def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and not set(update_fields) & set(self.SCORE_FIELDS):
+            # Partial saves that leave the scores alone keep what is computed from them
+            return super().save(*args, **kwargs)
+
         # Calculate total
-        # Priority: CA1-4 if any are non-zero, otherwise Test1/2
-        ca_total = self.ca1 + self.ca2 + self.ca3 + self.ca4
-        if ca_total > 0:
-            self.total = ca_total + self.exam
-        else:
-            self.total = self.test1 + self.test2 + self.exam
+        self.total = self.calculate_total(
+            self.ca1, self.ca2, self.ca3, self.ca4, self.test1, self.test2, self.exam
+        )
             
-        self.grade = self.calculate_grade()
-        self.remark = self.calculate_remark()
+        scale = self.grading_scale()
+        self.grade = self.calculate_grade(scale)
+        self.remark = self.calculate_remark(scale)
+        computed = {"total", "grade", "remark"}
+        # Only an actual score edit is a change delta sync clients need to see
+        if self._state.adding or self._scores_changed():
+            self.version = ScoreGridVersion.bump(
+                self.school_class_id, self.subject_id, self.academic_session_id, self.term
+            )
+            computed.add("version")
+        # Computed fields always go with the scores they are computed from
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, *computed}
         super().save(*args, **kwargs)
+        self._loaded_scores = tuple(getattr(self, field) for field in self.SCORE_FIELDS)
+
+    def grading_scale(self):
+        from .grading import get_class_grading_scale
+        return get_class_grading_scale(self.school_class_id)
 
-    # Grade calculation based on the grading key
-    def calculate_grade(self):
-        if self.total >= 80:
-            return "A"
-        elif self.total >= 70:
-            return "B"
-        elif self.total >= 60:
-            return "C"
-        elif self.total >= 50:
-            return "D"
-        elif self.total >= 40:
-            return "E"
-        return "F"
+    # Grade calculation based on the school's grading scale
+    def calculate_grade(self, scale=None):
+        return (scale or self.grading_scale()).grade(self.total)
     
-    def calculate_remark(self):
-        if self.total >= 80:
-            return "Excellent"
-        elif self.total >= 70:
-            return "Very Good"
-        elif self.total >= 60:
-            return "Good"
-        elif self.total >= 50:
-            return "Pass"
-        else:
-            return "Fail"
+    def calculate_remark(self, scale=None):
+        return (scale or self.grading_scale()).remark(self.total)
 
 
 # -------------------------
@@ -556,6 +800,111 @@ class StudentTermReport(models.Model):
         return f"{self.student} - Term Report ({self.term})"
 
 
+# -------------------------
+# Batch Term Computation Runs
+# -------------------------
+class TermComputationRun(models.Model):
+    """
+    A batch computation of term results across every class of a school
+    (or of every school when school is empty).
+    Completed classes are recorded as they finish so an interrupted run
+    can resume where it stopped.
+    """
+    school = models.ForeignKey(
+        School,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        help_text="Leave empty for a run across every school"
+    )
+    session_name = models.CharField(
+        max_length=20,
+        blank=True,
+        help_text="Academic session name (e.g. 2024/2025); empty means each school's active session"
+    )
+    term = models.CharField(max_length=10, choices=TERM_CHOICES)
+
+    total_classes = models.PositiveIntegerField(default=0)
+    completed_class_ids = models.JSONField(default=list, blank=True)
+    failed_class_ids = models.JSONField(default=list, blank=True)
+
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-started_at"]
+
+    def __str__(self):
+        scope = self.school.name if self.school else "All schools"
+        return f"{scope} - {self.term} ({len(self.completed_class_ids)}/{self.total_classes})"
+
+
+# -------------------------
+# Published Results (frozen report cards)
+# -------------------------
+class ResultPublication(models.Model):
+    """
+    One publication of a class's term results. Each publish creates a new
+    version; students are served the latest version's snapshots, so
+    republishing never changes what an earlier version holds.
+    """
+    school_class = models.ForeignKey(
+        SchoolClass,
+        on_delete=models.CASCADE,
+        related_name="result_publications"
+    )
+    academic_session = models.ForeignKey(
+        AcademicSession,
+        on_delete=models.CASCADE
+    )
+    term = models.CharField(max_length=10, choices=TERM_CHOICES)
+    version = models.PositiveIntegerField(default=1)
+    student_count = models.PositiveIntegerField(default=0)
+    published_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True
+    )
+    published_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = (
+            "school_class",
+            "academic_session",
+            "term",
+            "version",
+        )
+        ordering = ["-version"]
+
+    def __str__(self):
+        return f"{self.school_class} - {self.term} ({self.academic_session}) v{self.version}"
+
+
+class PublishedResultSnapshot(models.Model):
+    """
+    A student's complete report card as it was when the class was
+    published, stored as a single JSON document.
+    """
+    publication = models.ForeignKey(
+        ResultPublication,
+        on_delete=models.CASCADE,
+        related_name="snapshots"
+    )
+    student = models.ForeignKey(
+        "students.Student",
+        on_delete=models.CASCADE,
+        related_name="published_results"
+    )
+    data = models.JSONField(encoder=DjangoJSONEncoder)
+
+    class Meta:
+        unique_together = ("publication", "student")
+
+    def __str__(self):
+        return f"{self.student} - {self.publication}"
+
+
 # -------------------------
 # Class Population (for term)
 # -------------------------
@@ -0,0 +1,173 @@
+"""
+Publishing term results as frozen per-student report cards.
+
+publish_class_results() gathers everything a report card shows (scores,
+positions, attendance, traits, comments, class info, the session's other
+terms, the grading scale in force and the school's letterhead, layout and
+asset files) for a whole class in a handful of
+queries and stores one JSON snapshot per student under a new
+ResultPublication version. Readers only ever touch the snapshot table, so
+a published card keeps its grading key, average grade and automatic
+comments when the school's bands change later. The new version is
+written in one transaction, so readers keep getting the previous version
+until it commits.
+"""
+from django.db import transaction
+from django.db.models import Max
+
+from .grading import get_grading_scale
+from .models import (
+    ClassTermInfo,
+    PublishedResultSnapshot,
+    ResultPublication,
+    StudentAffectiveTraits,
+    SchoolClass,
+    StudentAttendance,
+    StudentPsychomotorTraits,
+    StudentResult,
+    StudentTermReport,
+)
+from .services import load_class_result_matrix
+
+# Keys dropped from assessment rows before they go into a snapshot
+_ROW_KEYS_EXCLUDED = {
+    "id", "student_id", "school_class_id", "academic_session_id", "term", "created_at", "updated_at",
+}
+
+
+def _rows_by_student(model, school_class, academic_session, term):
+    rows = model.objects.filter(
+        school_class=school_class, academic_session=academic_session, term=term
+    ).values()
+    return {
+        row["student_id"]: {key: value for key, value in row.items() if key not in _ROW_KEYS_EXCLUDED}
+        for row in rows
+    }
+
+
+def build_class_snapshots(school_class, academic_session, term):
+    """
+    Report card documents for every active student of the class, keyed by
+    student id, built from one query per table.
+    """
+    matrix = load_class_result_matrix(school_class, academic_session, term)
+    students = {student.id: student for student in matrix.students}
+
+    attendance = _rows_by_student(StudentAttendance, school_class, academic_session, term)
+    affective = _rows_by_student(StudentAffectiveTraits, school_class, academic_session, term)
+    psychomotor = _rows_by_student(StudentPsychomotorTraits, school_class, academic_session, term)
+    term_reports = _rows_by_student(StudentTermReport, school_class, academic_session, term)
+
+    class_info = ClassTermInfo.objects.filter(
+        school_class=school_class, academic_session=academic_session, term=term
+    ).values("class_population", "times_school_opened", "next_term_begins").first()
+    if class_info is None:
+        class_info = {
+            "class_population": len(students),
+            "times_school_opened": 0,
+            "next_term_begins": None,
+        }
+
+    # Every term of the session, for the report card's term columns
+    all_term_results = {}
+    for student_id, result_term, subject_name, total, grade in (
+        StudentResult.objects
+        .filter(student_id__in=students, academic_session=academic_session)
+        .values_list("student_id", "term", "subject__name", "total", "grade")
+    ):
+        all_term_results.setdefault(student_id, {}).setdefault(result_term, {})[subject_name] = {
+            "total": total,
+            "grade": grade,
+        }
+
+    subjects = [subject.name for subject in matrix.subjects]
+    grading_scale = get_grading_scale(school_class.school_id).to_data()
+    school = school_class.school
+    school_data = {
+        "name": school.name,
+        "address": school.address,
+        "motto": school.motto,
+        "report_card_layout": school.report_card_layout,
+        # Stored names of the asset files; a replaced upload gets a new name
+        "logo": school.logo.name or None,
+        "principal_signature": school.principal_signature.name or None,
+        "stamp": school.stamp.name or None,
+    }
+    form_teacher = str(school_class.form_teacher) if school_class.form_teacher_id else None
+    snapshots = {}
+    for row in matrix.student_rows():
+        student = students[row["student_id"]]
+        snapshots[student.id] = {
+            "student": {
+                "id": student.id,
+                "name": str(student),
+                "admission_number": student.admission_number,
+                "gender": student.gender,
+                "age": student.age,
+            },
+            "school": school_data,
+            "school_class": {"id": school_class.id, "name": school_class.name, "form_teacher": form_teacher},
+            "academic_session": {"id": academic_session.id, "name": academic_session.name},
+            "term": term,
+            "subjects": subjects,
+            "result": row,
+            "attendance": attendance.get(student.id),
+            "affective_traits": affective.get(student.id),
+            "psychomotor_traits": psychomotor.get(student.id),
+            "term_report": term_reports.get(student.id),
+            "class_info": class_info,
+            "all_term_results": all_term_results.get(student.id, {}),
+            "grading_scale": grading_scale,
+        }
+    return snapshots
+
+
+@transaction.atomic
+def publish_class_results(school_class, academic_session, term, published_by=None):
+    """
+    Freezes the class's current term results into a new publication
+    version and returns it.
+    """
+    snapshots = build_class_snapshots(school_class, academic_session, term)
+
+    # Concurrent publishes of the class queue here instead of both taking
+    # the same next version
+    SchoolClass.objects.select_for_update().filter(pk=school_class.pk).first()
+    latest = ResultPublication.objects.filter(
+        school_class=school_class, academic_session=academic_session, term=term
+    ).aggregate(version=Max("version"))["version"] or 0
+
+    publication = ResultPublication.objects.create(
+        school_class=school_class,
+        academic_session=academic_session,
+        term=term,
+        version=latest + 1,
+        student_count=len(snapshots),
+        published_by=published_by,
+    )
+    for data in snapshots.values():
+        data["version"] = publication.version
+        data["published_at"] = publication.published_at
+
+    PublishedResultSnapshot.objects.bulk_create(
+        [
+            PublishedResultSnapshot(publication=publication, student_id=student_id, data=data)
+            for student_id, data in snapshots.items()
+        ],
+        batch_size=500,
+    )
+    return publication
+
+
+def get_published_snapshot(student, academic_session, term):
+    """
+    The student's snapshot from the latest publication for the session and
+    term, or None when it has not been published.
+    """
+    return (
+        PublishedResultSnapshot.objects
+        .filter(student=student, publication__academic_session=academic_session, publication__term=term)
+        .select_related("publication")
+        .order_by("-publication__published_at", "-publication__version")
+        .first()
+    )
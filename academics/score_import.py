@@ -0,0 +1,207 @@
+"""
+Score sheet import (CSV or XLSX) for one class, subject and term.
+
+Sheets are read in chunks so a large upload never sits in memory as one
+DataFrame. Rows are matched to students by admission number and checked
+against the same ranges as the score grid; a blank score cell leaves the
+stored score as it is. plan_score_import() returns
+what would change without writing anything; the caller applies the plan
+with save_subject_scores().
+"""
+import pandas as pd
+
+from .models import StudentResult
+from .services import validate_scores
+
+IMPORT_FIELDS = ("test1", "test2", "exam")
+CHUNK_SIZE = 500
+
+# Normalised header -> field
+HEADER_ALIASES = {
+    "admissionnumber": "admission_number",
+    "admissionno": "admission_number",
+    "admission": "admission_number",
+    "regno": "admission_number",
+    "test1": "test1",
+    "firsttest": "test1",
+    "test2": "test2",
+    "secondtest": "test2",
+    "exam": "exam",
+    "examination": "exam",
+}
+
+
+class ScoreSheetError(Exception):
+    """The sheet as a whole cannot be read (bad format or missing columns)."""
+
+
+def _normalise_header(value):
+    return "".join(ch for ch in str(value).lower() if ch.isalnum())
+
+
+def _rename_columns(columns):
+    mapping = {}
+    for column in columns:
+        field = HEADER_ALIASES.get(_normalise_header(column))
+        if field and field not in mapping.values():
+            mapping[column] = field
+    missing = {"admission_number", *IMPORT_FIELDS} - set(mapping.values())
+    if missing:
+        raise ScoreSheetError(f"Missing column(s): {', '.join(sorted(missing))}")
+    return mapping
+
+
+def _csv_chunks(uploaded_file, chunk_size):
+    try:
+        reader = pd.read_csv(uploaded_file, dtype=str, keep_default_na=False, chunksize=chunk_size)
+        for chunk in reader:
+            yield chunk
+    except (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError) as e:
+        raise ScoreSheetError(f"Could not read CSV: {e}")
+
+
+def _xlsx_chunks(uploaded_file, chunk_size):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ScoreSheetError("XLSX upload needs openpyxl installed; upload a CSV instead")
+
+    try:
+        workbook = load_workbook(uploaded_file, read_only=True, data_only=True)
+    except Exception as e:
+        raise ScoreSheetError(f"Could not read XLSX: {e}")
+
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        header = ["" if value is None else str(value) for value in header]
+
+        batch = []
+        for row in rows:
+            batch.append(["" if value is None else str(value) for value in row])
+            if len(batch) == chunk_size:
+                yield pd.DataFrame(batch, columns=header)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=header)
+    finally:
+        workbook.close()
+
+
+def iter_sheet_rows(uploaded_file, chunk_size=CHUNK_SIZE):
+    """
+    Yields (line_number, row) for every data row of the sheet, where row
+    has admission_number and the IMPORT_FIELDS as strings. Line numbers
+    count the header as line 1, as a spreadsheet shows them.
+    """
+    name = (uploaded_file.name or "").lower()
+    if name.endswith(".csv"):
+        chunks = _csv_chunks(uploaded_file, chunk_size)
+    elif name.endswith(".xlsx"):
+        chunks = _xlsx_chunks(uploaded_file, chunk_size)
+    else:
+        raise ScoreSheetError("Upload a .csv or .xlsx file")
+
+    line_number = 1
+    mapping = None
+    for chunk in chunks:
+        if mapping is None:
+            mapping = _rename_columns(chunk.columns)
+        chunk = chunk[list(mapping)].rename(columns=mapping)
+        for row in chunk.to_dict("records"):
+            line_number += 1
+            yield line_number, {key: str(value).strip() for key, value in row.items()}
+
+
+def _parse_score(value):
+    # Spreadsheets often hand back whole numbers as "12.0"
+    if value.endswith(".0"):
+        value = value[:-2]
+    return value
+
+
+def plan_score_import(uploaded_file, school_class, subject, academic_session, term):
+    """
+    Reads the sheet and works out what importing it would do.
+
+    Returns a dict with:
+    - scores: {student_id: {test1, test2, exam}} for every valid row,
+      ready for save_subject_scores()
+    - changes: one entry per new or changed student with before/after
+    - unchanged: number of valid rows that match what is stored
+    - row_errors: [{line, admission_number, error}] for rejected rows
+    Raises ScoreSheetError when the sheet itself cannot be read.
+    """
+    students = {
+        admission_number.strip().lower(): (student_id, admission_number)
+        for student_id, admission_number in school_class.students.filter(is_active=True)
+        .values_list("id", "admission_number")
+    }
+    existing = {
+        row["student_id"]: row
+        for row in StudentResult.objects.filter(
+            school_class=school_class, subject=subject, academic_session=academic_session, term=term
+        ).values("student_id", "ca1", "ca2", "ca3", "ca4", *IMPORT_FIELDS)
+    }
+
+    scores = {}
+    lines = {}
+    changes = []
+    unchanged = 0
+    row_errors = []
+
+    for line, row in iter_sheet_rows(uploaded_file):
+        admission_number = row["admission_number"]
+        if not admission_number and not any(row[field] for field in IMPORT_FIELDS):
+            continue  # blank line
+
+        def reject(error):
+            row_errors.append({"line": line, "admission_number": admission_number, "error": error})
+
+        match = students.get(admission_number.lower())
+        if match is None:
+            reject("No active student with this admission number in the class")
+            continue
+        student_id, admission_number = match
+        if student_id in lines:
+            reject(f"Duplicate of line {lines[student_id]}")
+            continue
+
+        stored = existing.get(student_id)
+        cells = {field: _parse_score(row[field]) for field in IMPORT_FIELDS}
+        # A blank cell keeps the stored score instead of zeroing it
+        cells = {
+            field: (stored[field] if stored else 0) if value == "" else value
+            for field, value in cells.items()
+        }
+        values, error = validate_scores(cells, IMPORT_FIELDS)
+        if error:
+            reject(error)
+            continue
+
+        lines[student_id] = line
+        scores[student_id] = values
+
+        # Saving a sheet clears CA scores, as the score grid does
+        before = {field: stored[field] for field in IMPORT_FIELDS} if stored else None
+        cleared_cas = bool(stored) and any(stored[f"ca{i}"] for i in range(1, 5))
+        if before == values and not cleared_cas:
+            unchanged += 1
+            continue
+        changes.append({
+            "line": line,
+            "student_id": student_id,
+            "admission_number": admission_number,
+            "status": "new" if stored is None else "changed",
+            "before": before,
+            "after": values,
+        })
+
+    return {
+        "scores": scores,
+        "changes": changes,
+        "unchanged": unchanged,
+        "row_errors": row_errors,
+    }
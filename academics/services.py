@@ -1,57 +1,98 @@
-def get_cumulative_result_data(student, academic_session):
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import numpy as np
+from django.db import connection, connections, transaction
+from django.db.models import Case, Count, F, FilteredRelation, Q, Sum, Value, When
+from schools.models import AcademicSession
+from .grading import get_grading_scale
+from .models import (
+    SchoolClass, Subject, StudentResult, TermResultSummary, SessionResultSummary, ScoreGridVersion,
+    ClassTermInfo, StudentAttendance, StudentAffectiveTraits, StudentPsychomotorTraits, StudentTermReport,
+    RATING_CHOICES, TERM_CHOICES
+)
+
+
+def rank_scores(scores):
     """
-    Returns (results_data, cumulative_stats) for a student's cumulative session result.
-    results_data: {subject: {First, Second, Third, total, avg, grade}}
-    cumulative_stats: {average, position, total_score, subject_count, ...}
+    Competition ranking of scores in descending order (1, 1, 3, ...).
+    Equal scores share a position and the positions after a tie are skipped,
+    e.g. [70, 90, 70, 50] -> [2, 1, 2, 4].
     """
-    from academics.models import StudentResult, Subject
-    results = StudentResult.objects.filter(
-        student=student,
-        academic_session=academic_session
+    scores = np.asarray(scores, dtype=float)
+    ordered = np.sort(scores)
+    # Position = 1 + number of scores strictly greater than this one
+    return len(ordered) - np.searchsorted(ordered, scores, side='right') + 1
+
+
+def _rank_subjects(result_ids, subject_ids, totals, ranked_subject_ids):
+    """
+    Ranks each subject slice of the fetched results.
+    Returns ({result_id: subject_position}, {subject_id: subject_highest}).
+    """
+    positions = {}
+    highest_by_subject = {}
+
+    for subject_id in ranked_subject_ids:
+        mask = subject_ids == subject_id
+        if not mask.any():
+            continue
+
+        subject_totals = totals[mask]
+        highest_by_subject[subject_id] = int(subject_totals.max())
+        for result_id, position in zip(result_ids[mask], rank_scores(subject_totals)):
+            positions[int(result_id)] = int(position)
+
+    return positions, highest_by_subject
+
+
+def _write_subject_positions(results, positions, highest_by_subject):
+    """
+    Writes subject_position/subject_highest for the given result ids in a
+    single UPDATE.
+    """
+    if not positions:
+        return
+
+    ids_by_position = defaultdict(list)
+    for result_id, position in positions.items():
+        ids_by_position[position].append(result_id)
+
+    results.filter(id__in=positions).update(
+        subject_position=Case(*(
+            When(id__in=ids, then=Value(position))
+            for position, ids in ids_by_position.items()
+        )),
+        subject_highest=Case(*(
+            When(subject_id=subject_id, then=Value(highest))
+            for subject_id, highest in highest_by_subject.items()
+        )),
+    )
+
+
+def _save_summaries(school_class, academic_session, term, rows):
+    """
+    Upserts TermResultSummary rows given as (student_id, total_score, average, position).
+    """
+    TermResultSummary.objects.bulk_create(
+        [
+            TermResultSummary(
+                student_id=student_id,
+                school_class=school_class,
+                academic_session=academic_session,
+                term=term,
+                total_score=total_score,
+                average=average,
+                position=position,
+            )
+            for student_id, total_score, average, position in rows
+        ],
+        update_conflicts=True,
+        unique_fields=["student", "school_class", "academic_session", "term"],
+        update_fields=["total_score", "average", "position", "updated_at"],
     )
-    subjects = Subject.objects.filter(
-        id__in=results.values_list('subject', flat=True).distinct()
-    )
-    results_data = {}
-    total_score = 0
-    subject_count = 0
-    for subject in subjects:
-        subj_results = results.filter(subject=subject)
-        term_scores = {term: None for term in ['First', 'Second', 'Third']}
-        for r in subj_results:
-            term_scores[r.term] = r.total
-        # Calculate total and average for this subject
-        term_vals = [v for v in term_scores.values() if v is not None]
-        subj_total = sum(term_vals)
-        subj_avg = subj_total / len(term_vals) if term_vals else 0
-        grade = 'F'
-        if subj_avg >= 80: grade = 'A'
-        elif subj_avg >= 70: grade = 'B'
-        elif subj_avg >= 60: grade = 'C'
-        elif subj_avg >= 50: grade = 'D'
-        elif subj_avg >= 40: grade = 'E'
-        results_data[subject.name] = {
-            'First': term_scores['First'] or '-',
-            'Second': term_scores['Second'] or '-',
-            'Third': term_scores['Third'] or '-',
-            'total': subj_total,
-            'avg': subj_avg,
-            'grade': grade
-        }
-        total_score += subj_total
-        subject_count += 1
-    cumulative_avg = total_score / subject_count if subject_count else 0
-    # Position logic (optional, can be improved for class-wide)
-    cumulative_stats = {
-        'average': cumulative_avg,
-        'position': '-',  # Position calculation can be added
-        'total_score': total_score,
-        'subject_count': subject_count
-    }
-    return results_data, cumulative_stats
-from django.db import transaction
-from django.db.models import Sum
-from .models import StudentResult, TermResultSummary
 
 
 @transaction.atomic
@@ -62,79 +103,1258 @@ def compute_term_results(school_class, academic_session, term):
     - Total score per student
     - Average score
     - Class position
+
+    All results for the class/session/term are fetched in one query and ranked
+    in memory, then written back with one UPDATE and one upsert, so the number
+    of queries does not grow with the size of the class.
     """
+    results = StudentResult.objects.filter(
+        school_class=school_class,
+        academic_session=academic_session,
+        term=term,
+    )
+    rows = list(results.values_list("id", "student_id", "subject_id", "total"))
+    if not rows:
+        return
+
+    result_ids, student_ids, subject_ids, totals = (np.array(col) for col in zip(*rows))
 
     # 1. Update subject-wise positions and highest scores
-    subjects = school_class.class_subjects.all().values_list('subject', flat=True)
-    
-    for subject_id in subjects:
-        subject_results = StudentResult.objects.filter(
-            school_class=school_class,
-            subject_id=subject_id,
-            academic_session=academic_session,
-            term=term
-        ).order_by('-total')
-        
-        if not subject_results:
-            continue
-            
-        highest_score = subject_results[0].total
-        
-        # Assign positions for this subject
-        current_pos = 1
-        last_score = None
-        for index, res in enumerate(subject_results):
-            if last_score is not None and res.total < last_score:
-                current_pos = index + 1
-            
-            res.subject_position = current_pos
-            res.subject_highest = highest_score
-            res.save(update_fields=['subject_position', 'subject_highest'])
-            last_score = res.total
+    class_subject_ids = set(school_class.class_subjects.values_list("subject", flat=True))
+    positions, highest_by_subject = _rank_subjects(result_ids, subject_ids, totals, class_subject_ids)
+    _write_subject_positions(results, positions, highest_by_subject)
 
     # 2. Update overall term summaries
-    results = (
+    students, inverse = np.unique(student_ids, return_inverse=True)
+    total_scores = np.bincount(inverse, weights=totals).astype(int)
+    subject_counts = np.bincount(inverse)
+    averages = [int(t) / int(c) for t, c in zip(total_scores, subject_counts)]
+
+    # Class positions by average (handles ties correctly)
+    class_positions = rank_scores(averages)
+
+    _save_summaries(school_class, academic_session, term, [
+        (int(student_id), int(total_score), average, int(position))
+        for student_id, total_score, average, position
+        in zip(students, total_scores, averages, class_positions)
+    ])
+
+    # 3. Keep the class's cumulative session summaries in step
+    refresh_session_summaries(school_class, academic_session)
+
+
+@transaction.atomic
+def refresh_term_results(school_class, academic_session, term, changed):
+    """
+    Incrementally keeps computed term results current after score edits.
+
+    `changed` is an iterable of (student_id, subject_id) pairs whose
+    StudentResult was just saved. Only the affected subject slices are
+    re-ranked, only the edited students' summaries are re-totalled, and only
+    the rows whose stored position actually moves are written back.
+
+    Class positions are only maintained once compute_term_results has run for
+    the class/term; before that there are no summaries to keep in step. The
+    cumulative session summaries are kept in step either way.
+    """
+    changed = list(changed)
+    if not changed:
+        return
+
+    changed_students = {student_id for student_id, _ in changed}
+    changed_subjects = set(
+        school_class.class_subjects
+        .filter(subject_id__in={subject_id for _, subject_id in changed})
+        .values_list("subject", flat=True)
+    )
+
+    results = StudentResult.objects.filter(
+        school_class=school_class,
+        academic_session=academic_session,
+        term=term,
+    )
+
+    # 1. Re-rank only the edited subject slices
+    rows = list(
+        results
+        .filter(subject_id__in=changed_subjects)
+        .values_list("id", "subject_id", "total", "subject_position", "subject_highest")
+    )
+    if rows:
+        result_ids, subject_ids, totals = (np.array(col) for col in list(zip(*rows))[:3])
+        positions, highest_by_subject = _rank_subjects(result_ids, subject_ids, totals, changed_subjects)
+
+        stored = {
+            result_id: (subject_id, position, highest)
+            for result_id, subject_id, _, position, highest in rows
+        }
+        moved = {
+            result_id: position
+            for result_id, position in positions.items()
+            if stored[result_id][1:] != (position, highest_by_subject[stored[result_id][0]])
+        }
+        _write_subject_positions(results, moved, highest_by_subject)
+
+    # 2. Re-total the edited students and re-rank the class around them
+    summaries = {
+        student_id: (total_score, average, position)
+        for student_id, total_score, average, position in (
+            TermResultSummary.objects
+            .filter(school_class=school_class, academic_session=academic_session, term=term)
+            .values_list("student_id", "total_score", "average", "position")
+        )
+    }
+    if summaries:
+        without_results = set(changed_students)
+        for row in results.filter(student_id__in=changed_students).values("student_id").annotate(
+            total_score=Sum("total"), subject_count=Count("id")
+        ):
+            total_score = row["total_score"] or 0
+            average = total_score / row["subject_count"] if row["subject_count"] else 0
+            previous = summaries.get(row["student_id"], (None, None, None))
+            summaries[row["student_id"]] = (total_score, average, previous[2])
+            without_results.discard(row["student_id"])
+
+        # A student whose last result in the term was deleted has no summary
+        gone = {student_id for student_id in without_results if student_id in summaries}
+        if gone:
+            TermResultSummary.objects.filter(
+                school_class=school_class, academic_session=academic_session, term=term,
+                student_id__in=gone,
+            ).delete()
+            for student_id in gone:
+                summaries.pop(student_id)
+
+        student_ids = list(summaries)
+        class_positions = rank_scores([summaries[student_id][1] for student_id in student_ids])
+
+        updates = []
+        for student_id, position in zip(student_ids, class_positions):
+            total_score, average, old_position = summaries[student_id]
+            if student_id in changed_students or old_position != position:
+                updates.append((student_id, total_score, average, int(position)))
+
+        _save_summaries(school_class, academic_session, term, updates)
+
+    # 3. Session totals include this term whether or not it has been computed
+    refresh_session_summaries(school_class, academic_session, student_ids=changed_students)
+
+
+def _refresh_result_keys(keys):
+    """refresh_term_results() for StudentResult rows given by their RESULT_KEY_FIELDS."""
+    slots = defaultdict(set)
+    for student_id, class_id, subject_id, session_id, term in keys:
+        slots[(class_id, session_id, term)].add((student_id, subject_id))
+    classes = SchoolClass.objects.in_bulk({class_id for class_id, _, _ in slots})
+    sessions = AcademicSession.objects.in_bulk({session_id for _, session_id, _ in slots})
+    for (class_id, session_id, term), changed in slots.items():
+        refresh_term_results(classes[class_id], sessions[session_id], term, changed)
+
+
+@transaction.atomic
+def save_result(result):
+    """
+    Saves one StudentResult and keeps the computed term results and session
+    summaries of its class in step, including those of the class/term it
+    was moved out of. Single-result edits go through here rather than
+    calling save() directly; bulk paths use upsert_results and refresh once.
+    """
+    keys = [tuple(getattr(result, key) for key in RESULT_KEY_FIELDS)]
+    if result.pk:
+        keys += StudentResult.objects.filter(pk=result.pk).values_list(*RESULT_KEY_FIELDS)
+    result.save()
+    _refresh_result_keys(set(keys))
+    return result
+
+
+@transaction.atomic
+def delete_results(results):
+    """Deletes a StudentResult queryset and refreshes the summaries it fed."""
+    keys = set(results.values_list(*RESULT_KEY_FIELDS))
+    results.delete()
+    _refresh_result_keys(keys)
+
+
+# -------------------------
+# Bulk score saving
+# -------------------------
+SCORE_FIELDS = ("ca1", "ca2", "ca3", "ca4", "test1", "test2", "exam")
+SCORE_LIMITS = {"ca1": 10, "ca2": 10, "ca3": 10, "ca4": 10, "test1": 20, "test2": 20, "exam": 60}
+SCORE_LABELS = {
+    "ca1": "CA 1", "ca2": "CA 2", "ca3": "CA 3", "ca4": "CA 4",
+    "test1": "Test 1", "test2": "Test 2", "exam": "Exam",
+}
+RESULT_KEY_FIELDS = ("student_id", "school_class_id", "subject_id", "academic_session_id", "term")
+
+
+def upsert_results(entries, fields, scale):
+    """
+    Saves many StudentResult rows in one statement per 500 rows.
+
+    Each entry is a dict with the RESULT_KEY_FIELDS and a value for every
+    score field in `fields`. Score fields not in `fields` keep the value of
+    the existing row (0 for new rows), which costs one extra query; totals,
+    grades and remarks are recomputed exactly as StudentResult.save() would,
+    with every row graded in one lookup. Stored positions are left alone.
+    A key repeated in `entries` keeps its last entry. Written rows are
+    stamped with their score grid's new version, which is also set on the
+    returned entries.
+    """
+    entries = list({tuple(entry[key] for key in RESULT_KEY_FIELDS): entry for entry in entries}.values())
+    if not entries:
+        return []
+
+    existing = {}
+    if set(fields) != set(SCORE_FIELDS):
+        for row in StudentResult.objects.filter(
+            student_id__in={entry["student_id"] for entry in entries},
+            subject_id__in={entry["subject_id"] for entry in entries},
+            school_class_id__in={entry["school_class_id"] for entry in entries},
+            academic_session_id__in={entry["academic_session_id"] for entry in entries},
+            term__in={entry["term"] for entry in entries},
+        ).values(*RESULT_KEY_FIELDS, *SCORE_FIELDS):
+            existing[tuple(row[key] for key in RESULT_KEY_FIELDS)] = row
+
+    rows = []
+    for entry in entries:
+        row = existing.get(tuple(entry[key] for key in RESULT_KEY_FIELDS))
+        row = {field: row[field] if row else 0 for field in SCORE_FIELDS}
+        row.update({field: entry[field] for field in fields})
+        rows.append(row)
+
+    totals = [StudentResult.calculate_total(**row) for row in rows]
+    grades = scale.grades(totals)
+    remarks = scale.remarks(totals)
+
+    # One version bump per score grid written to
+    versions = {}
+    for entry in entries:
+        grid = (entry["school_class_id"], entry["subject_id"], entry["academic_session_id"], entry["term"])
+        if grid not in versions:
+            versions[grid] = ScoreGridVersion.bump(*grid)
+        entry["version"] = versions[grid]
+
+    StudentResult.objects.bulk_create(
+        [
+            StudentResult(
+                **{key: entry[key] for key in RESULT_KEY_FIELDS},
+                total=total,
+                grade=grade,
+                remark=remark,
+                version=entry["version"],
+                **row,
+            )
+            for entry, row, total, grade, remark in zip(entries, rows, totals, grades, remarks)
+        ],
+        update_conflicts=True,
+        unique_fields=["student", "school_class", "subject", "academic_session", "term"],
+        update_fields=[*fields, "total", "grade", "remark", "version"],
+        batch_size=500,
+    )
+    return entries
+
+
+def save_subject_scores(school_class, subject, academic_session, term, scores):
+    """
+    Upserts the results of one subject for many students in a single
+    statement. `scores` maps student_id to a dict of score fields; every
+    score field is written (missing ones as 0). Totals, grades and remarks
+    are computed as StudentResult.save() would. Returns the saved student ids.
+    """
+    upsert_results(
+        [
+            {
+                "student_id": student_id,
+                "school_class_id": school_class.id,
+                "subject_id": subject.id,
+                "academic_session_id": academic_session.id,
+                "term": term,
+                **{field: values.get(field, 0) for field in SCORE_FIELDS},
+            }
+            for student_id, values in scores.items()
+        ],
+        SCORE_FIELDS,
+        get_grading_scale(school_class.school_id),
+    )
+    return list(scores)
+
+
+def validate_scores(row, fields):
+    """
+    Parses the score fields of one submitted row.
+    Returns (scores, error) where error is a message or None.
+    """
+    scores = {}
+    for field in fields:
+        try:
+            value = int(row.get(field) or 0)
+        except (TypeError, ValueError):
+            return None, f"{SCORE_LABELS[field]} must be a whole number"
+        if not (0 <= value <= SCORE_LIMITS[field]):
+            return None, f"{SCORE_LABELS[field]} must be 0-{SCORE_LIMITS[field]}"
+        scores[field] = value
+    return scores, None
+
+
+def resolve_result_rows(rows, school, fields=("test1", "test2", "exam")):
+    """
+    Resolves submitted result rows (student_id, class_id, subject_id,
+    session_id, term and score fields) against the database with one
+    in_bulk() per model, checking that everything belongs to `school`.
+
+    Returns (entries, row_errors): entries are ready for upsert_results and
+    row_errors is a list of {row, student_id, error} for rejected rows,
+    where row is the row's index in the submitted list.
+    """
+    from students.models import Student
+
+    def ids(key):
+        return {int(row[key]) for row in rows if str(row.get(key, "")).isdigit()}
+
+    students = Student.objects.in_bulk(ids("student_id"))
+    classes = SchoolClass.objects.in_bulk(ids("class_id"))
+    subjects = Subject.objects.in_bulk(ids("subject_id"))
+    sessions = AcademicSession.objects.in_bulk(ids("session_id"))
+    terms = {value for value, _ in TERM_CHOICES}
+
+    entries = []
+    row_errors = []
+
+    def reject(index, row, error):
+        row_errors.append({"row": index, "student_id": row.get("student_id"), "error": error})
+
+    for index, row in enumerate(rows):
+        references = {}
+        for key, objects, label in (
+            ("student_id", students, "Student"),
+            ("class_id", classes, "Class"),
+            ("subject_id", subjects, "Subject"),
+            ("session_id", sessions, "Session"),
+        ):
+            value = row.get(key)
+            obj = objects.get(int(value)) if str(value or "").isdigit() else None
+            if obj is None:
+                reject(index, row, f"{label} {value} not found")
+                break
+            references[key] = obj
+        else:
+            student = references["student_id"]
+            if any(obj.school_id != school.id for obj in references.values()):
+                reject(index, row, f"Access denied for {student.admission_number}")
+                continue
+            if row.get("term") not in terms:
+                reject(index, row, f"Invalid term {row.get('term')!r}")
+                continue
+
+            scores, error = validate_scores(row, fields)
+            if error:
+                reject(index, row, f"{student.admission_number}: {error}")
+                continue
+
+            entries.append({
+                "student_id": student.id,
+                "school_class_id": references["class_id"].id,
+                "subject_id": references["subject_id"].id,
+                "academic_session_id": references["session_id"].id,
+                "term": row["term"],
+                **scores,
+            })
+
+    return entries, row_errors
+
+
+def load_subject_score_grid(school_class, subject_id, academic_session_id, term, fields):
+    """
+    Active students of the class (last name, first name) with their result
+    for one subject/session/term, from a single LEFT JOIN query.
+
+    Returns a list of plain dicts with the student's id, first_name,
+    last_name and admission_number, plus result_id and the requested result
+    fields, which are None when the student has no result yet.
+    """
+    from students.models import Student
+
+    return list(
+        Student.objects
+        .filter(school_class=school_class, is_active=True)
+        .annotate(result=FilteredRelation(
+            "results",
+            condition=Q(
+                results__school_class=school_class,
+                results__subject_id=subject_id,
+                results__academic_session_id=academic_session_id,
+                results__term=term,
+            ),
+        ))
+        .order_by("last_name", "first_name")
+        .values(
+            "id", "first_name", "last_name", "admission_number",
+            result_id=F("result__id"),
+            **{field: F(f"result__{field}") for field in fields},
+        )
+    )
+
+
+# -------------------------
+# Score grid delta sync
+# -------------------------
+SYNC_FIELDS = ("test1", "test2", "exam")
+
+
+def score_grid_changes(school_class, subject, academic_session, term, since):
+    """
+    Results of the grid written after version `since`, newest last, from
+    one indexed query.
+    """
+    return list(
         StudentResult.objects
         .filter(
             school_class=school_class,
+            subject=subject,
             academic_session=academic_session,
             term=term,
+            version__gt=since,
+        )
+        .order_by("version", "student_id")
+        .values("student_id", "version", *SYNC_FIELDS, "total", "grade", result_id=F("id"))
+    )
+
+
+@transaction.atomic
+def sync_score_grid(school_class, subject, academic_session, term, changes):
+    """
+    Applies edited cells to a score grid with optimistic concurrency.
+
+    Each change is {student_id, base_version, <some of SYNC_FIELDS>}, where
+    base_version is the row version the client last saw (0 for a row it
+    saw as blank). A change whose base_version no longer matches the
+    stored row is not applied and is returned as a conflict with the
+    server's current values. A change matching what is already stored is
+    reported as applied whatever its base_version, so replaying a batch is
+    harmless. Accepted cells are written in one bulk upsert.
+
+    Returns (applied, conflicts, errors) where applied is
+    [{student_id, version}].
+    """
+    # Take the grid's lock first so the version check and write are atomic
+    ScoreGridVersion.bump(school_class.id, subject.id, academic_session.id, term)
+
+    current = {
+        row["student_id"]: row
+        for row in school_class.students.filter(is_active=True).annotate(
+            result=FilteredRelation(
+                "results",
+                condition=Q(
+                    results__school_class=school_class,
+                    results__subject=subject,
+                    results__academic_session=academic_session,
+                    results__term=term,
+                ),
+            )
+        ).values(
+            student_id=F("id"),
+            version=F("result__version"),
+            **{field: F(f"result__{field}") for field in SYNC_FIELDS},
+        )
+    }
+
+    accepted = {}
+    unchanged = []
+    conflicts = []
+    errors = []
+    for change in changes:
+        student_id = change.get("student_id")
+        row = current.get(int(student_id)) if str(student_id).isdigit() else None
+        if row is None:
+            errors.append({"student_id": student_id, "error": "Student not found in this class"})
+            continue
+
+        edited = [field for field in SYNC_FIELDS if field in change]
+        values, error = validate_scores(change, edited)
+        if error:
+            errors.append({"student_id": student_id, "error": error})
+            continue
+
+        student_id = row["student_id"]
+        if student_id in accepted:
+            # A second edit of the same row in this batch builds on the first
+            accepted[student_id].update(values)
+            continue
+
+        server_version = row["version"] or 0
+        if all((row[field] or 0) == values[field] for field in edited):
+            # Already stored, e.g. a retry of a batch whose response was lost
+            unchanged.append({"student_id": student_id, "version": server_version})
+            continue
+        if change.get("base_version") != server_version:
+            conflicts.append({
+                "student_id": student_id,
+                "base_version": change.get("base_version"),
+                "version": server_version,
+                "server": {field: row[field] or 0 for field in SYNC_FIELDS},
+            })
+            continue
+
+        merged = {field: row[field] or 0 for field in SYNC_FIELDS}
+        merged.update(values)
+        accepted[student_id] = {
+            "student_id": student_id,
+            "school_class_id": school_class.id,
+            "subject_id": subject.id,
+            "academic_session_id": academic_session.id,
+            "term": term,
+            **merged,
+        }
+
+    saved = upsert_results(accepted.values(), SYNC_FIELDS, get_grading_scale(school_class.school_id))
+    if saved:
+        refresh_term_results(
+            school_class, academic_session, term,
+            [(entry["student_id"], subject.id) for entry in saved]
+        )
+
+    applied = [{"student_id": entry["student_id"], "version": entry["version"]} for entry in saved]
+    return applied + unchanged, conflicts, errors
+
+
+# -------------------------
+# Form teacher assessments (attendance, traits, term reports)
+# -------------------------
+AFFECTIVE_FIELDS = (
+    "punctuality", "mental_alertness", "respect", "neatness", "honesty", "politeness",
+    "relationship_with_peers", "willingness_to_learn", "spirit_of_teamwork",
+)
+PSYCHOMOTOR_FIELDS = ("games_and_sports", "verbal_skills", "artistic_creativity", "musical_skills", "dance_skills")
+ASSESSMENT_KEY_FIELDS = ("student", "school_class", "academic_session", "term")
+
+
+def validate_class_assessments(school_class, data):
+    """
+    Checks a combined assessment payload for a class:
+    class_info {times_school_opened, next_term_begins}, attendance
+    [{student_id, times_present}], affective_traits and psychomotor_traits
+    [{student_id, <trait>: rating}] and reports [{student_id,
+    class_teacher_comment, promotion_status}]. Every section is optional.
+
+    Returns (sections, errors): sections maps each section to its cleaned
+    {student_id: values} (class_info to a dict) and errors lists
+    {section, student_id, error} for everything that was rejected.
+    """
+    from students.models import Student
+
+    ratings = {code for code, _ in RATING_CHOICES}
+    promotion_statuses = {code for code, _ in StudentTermReport.PROMOTION_CHOICES}
+    class_students = set(Student.objects.filter(school_class=school_class).values_list("id", flat=True))
+
+    sections = {}
+    errors = []
+
+    class_info = data.get("class_info")
+    if class_info is not None:
+        cleaned = {}
+        if "times_school_opened" in class_info:
+            try:
+                cleaned["times_school_opened"] = int(class_info["times_school_opened"] or 0)
+                if cleaned["times_school_opened"] < 0:
+                    raise ValueError
+            except (TypeError, ValueError):
+                errors.append({"section": "class_info", "student_id": None,
+                               "error": "Times school opened must be a whole number"})
+        if class_info.get("next_term_begins"):
+            try:
+                cleaned["next_term_begins"] = datetime.strptime(class_info["next_term_begins"], "%Y-%m-%d").date()
+            except (TypeError, ValueError):
+                errors.append({"section": "class_info", "student_id": None,
+                               "error": "Next term begins must be a date (YYYY-MM-DD)"})
+        sections["class_info"] = cleaned
+
+    def clean_rows(section, clean_row):
+        rows = data.get(section)
+        if rows is None:
+            return
+        if not isinstance(rows, list):
+            errors.append({"section": section, "student_id": None, "error": f"{section} must be a list"})
+            return
+        cleaned = {}
+        for row in rows:
+            student_id = row.get("student_id")
+            if not str(student_id).isdigit() or int(student_id) not in class_students:
+                errors.append({"section": section, "student_id": student_id, "error": "Student not found in this class"})
+                continue
+            values, error = clean_row(row)
+            if error:
+                errors.append({"section": section, "student_id": student_id, "error": error})
+                continue
+            cleaned[int(student_id)] = values
+        sections[section] = cleaned
+
+    def clean_attendance(row):
+        try:
+            times_present = int(row.get("times_present") or 0)
+        except (TypeError, ValueError):
+            return None, "Times present must be a whole number"
+        if times_present < 0:
+            return None, "Times present cannot be negative"
+        return {"times_present": times_present}, None
+
+    def clean_traits(fields):
+        def clean(row):
+            values = {field: row.get(field) or "C" for field in fields}
+            bad = [field for field, rating in values.items() if rating not in ratings]
+            if bad:
+                return None, f"Invalid rating for {', '.join(bad)}"
+            return values, None
+        return clean
+
+    def clean_report(row):
+        promotion_status = row.get("promotion_status") or "PENDING"
+        if promotion_status not in promotion_statuses:
+            return None, f"Invalid promotion status {promotion_status}"
+        return {
+            "class_teacher_comment": row.get("class_teacher_comment") or "",
+            "promotion_status": promotion_status,
+        }, None
+
+    clean_rows("attendance", clean_attendance)
+    clean_rows("affective_traits", clean_traits(AFFECTIVE_FIELDS))
+    clean_rows("psychomotor_traits", clean_traits(PSYCHOMOTOR_FIELDS))
+    clean_rows("reports", clean_report)
+    return sections, errors
+
+
+@transaction.atomic
+def save_class_assessments(school_class, academic_session, term, sections, class_teacher_name=""):
+    """
+    Writes validated assessment sections in one transaction: the class term
+    info first (attendance and reports copy from it), then one
+    bulk_create(update_conflicts=True) per table. Trait sections overwrite
+    every trait of the row; principal comments on term reports are kept.
+    Returns {section: rows saved}.
+    """
+    population = school_class.students.filter(is_active=True).count()
+    class_info, created = ClassTermInfo.objects.get_or_create(
+        school_class=school_class,
+        academic_session=academic_session,
+        term=term,
+        defaults={"class_population": population, **sections.get("class_info", {})},
+    )
+    if not created and "class_info" in sections:
+        for field, value in sections["class_info"].items():
+            setattr(class_info, field, value)
+        class_info.class_population = population
+        class_info.save()
+
+    keys = {"school_class": school_class, "academic_session": academic_session, "term": term}
+    tables = (
+        ("attendance", StudentAttendance, lambda values: {
+            **values, "times_school_opened": class_info.times_school_opened,
+        }),
+        ("affective_traits", StudentAffectiveTraits, lambda values: values),
+        ("psychomotor_traits", StudentPsychomotorTraits, lambda values: values),
+        ("reports", StudentTermReport, lambda values: {
+            **values,
+            "class_teacher_name": class_teacher_name,
+            "next_term_begins": class_info.next_term_begins,
+        }),
+    )
+
+    saved = {}
+    for section, model, build in tables:
+        rows = sections.get(section)
+        if not rows:
+            continue
+        objs = [model(student_id=student_id, **keys, **build(values)) for student_id, values in rows.items()]
+        update_fields = list(build(next(iter(rows.values()))))
+        if section == "reports":
+            update_fields.append("updated_at")
+        model.objects.bulk_create(
+            objs,
+            update_conflicts=True,
+            unique_fields=list(ASSESSMENT_KEY_FIELDS),
+            update_fields=update_fields,
+            batch_size=500,
+        )
+        saved[section] = len(objs)
+    return saved
+
+
+# -------------------------
+# Automatic comments
+# -------------------------
+def generate_term_comments(classes, academic_session, term, comment_type="teacher"):
+    """
+    Writes automatic class teacher (or principal) comments on the term
+    reports of every active student with results in the given classes,
+    which must all belong to one school.
+
+    Term averages, failed subject counts and last term's averages come from
+    one aggregate query, comments from the school's compiled rule table
+    (see CompiledGradingScale.comments) and the reports are written with
+    one bulk upsert. Returns the number of reports written.
+    """
+    classes = list(classes)
+    if not classes:
+        return 0
+    scale = get_grading_scale(classes[0].school_id)
+
+    terms = [code for code, _ in TERM_CHOICES]
+    previous_term = terms[terms.index(term) - 1] if term in terms and terms.index(term) > 0 else None
+
+    current = {}
+    previous = {}
+    for row in (
+        StudentResult.objects
+        .filter(
+            school_class__in=classes,
+            academic_session=academic_session,
+            term__in=[term, previous_term] if previous_term else [term],
+            student__is_active=True,
+        )
+        .values("school_class_id", "student_id", "term")
+        .annotate(
+            total_score=Sum("total"),
+            subject_count=Count("id"),
+            failed=Count("id", filter=Q(total__lt=scale.pass_mark)),
         )
-        .select_related("student")
+    ):
+        average = row["total_score"] / row["subject_count"]
+        if row["term"] == term:
+            current[(row["school_class_id"], row["student_id"])] = (average, row["failed"])
+        else:
+            previous[row["student_id"]] = average
+
+    keys = list(current)
+    comments = scale.comments(
+        [current[key][0] for key in keys],
+        [current[key][1] for key in keys],
+        [previous.get(student_id) for _, student_id in keys],
+        comment_type,
+    )
+
+    comment_field = "class_teacher_comment" if comment_type == "teacher" else "principal_comment"
+    StudentTermReport.objects.bulk_create(
+        [
+            StudentTermReport(
+                student_id=student_id,
+                school_class_id=class_id,
+                academic_session=academic_session,
+                term=term,
+                **{comment_field: comment},
+            )
+            for (class_id, student_id), comment in zip(keys, comments)
+        ],
+        update_conflicts=True,
+        unique_fields=list(ASSESSMENT_KEY_FIELDS),
+        update_fields=[comment_field, "updated_at"],
+        batch_size=1000,
     )
+    return len(keys)
+
+
+def apply_principal_comments(classes, academic_session, term, overrides=(), apply_defaults=True,
+                             band_comments=None, overwrite_existing=False):
+    """
+    Writes principal comments for the given classes (all of one school) in
+    one bulk upsert.
+
+    overrides is [{student_id, principal_comment}] for students of the
+    classes; these are always written. With apply_defaults, every other
+    student with a computed term result gets the comment of the grading
+    band of their TermResultSummary.average. band_comments ({grade: text})
+    replaces the scale's principal comment for those bands. Default
+    comments do not replace comments already entered unless
+    overwrite_existing is set.
+
+    Returns (counts, errors) where counts is {written, overrides, defaults}
+    and errors lists {student_id, error} for skipped overrides.
+    """
+    from students.models import Student
+
+    classes = list(classes)
+    counts = {"written": 0, "overrides": 0, "defaults": 0}
+    errors = []
+    if not classes:
+        return counts, errors
+
+    # student_id -> (class_id, comment)
+    comments = {}
+
+    override_ids = {int(row["student_id"]) for row in overrides if str(row.get("student_id")).isdigit()}
+    student_classes = dict(
+        Student.objects.filter(id__in=override_ids, school_class__in=classes).values_list("id", "school_class_id")
+    )
+    for row in overrides:
+        student_id = row.get("student_id")
+        if not str(student_id).isdigit() or int(student_id) not in student_classes:
+            errors.append({"student_id": student_id, "error": "Student not found in this class"})
+            continue
+        comments[int(student_id)] = (student_classes[int(student_id)], row.get("principal_comment") or "")
+    counts["overrides"] = len(comments)
+
+    if apply_defaults:
+        summaries = [
+            row for row in TermResultSummary.objects.filter(
+                school_class__in=classes, academic_session=academic_session, term=term, student__is_active=True
+            ).values_list("student_id", "school_class_id", "average")
+            if row[0] not in comments
+        ]
+        if not overwrite_existing:
+            entered = set(
+                StudentTermReport.objects.filter(
+                    school_class__in=classes, academic_session=academic_session, term=term
+                ).exclude(principal_comment="").values_list("student_id", flat=True)
+            )
+            summaries = [row for row in summaries if row[0] not in entered]
+
+        scale = get_grading_scale(classes[0].school_id)
+        band_comments = band_comments or {}
+        defaults = [
+            band_comments.get(band.grade) or band.principal_comment for band in scale.bands
+        ]
+        band_indexes = scale.band_indexes([average for _, _, average in summaries])
+        for (student_id, class_id, _), index in zip(summaries, band_indexes.tolist()):
+            comments[student_id] = (class_id, defaults[index])
+        counts["defaults"] = len(summaries)
+
+    StudentTermReport.objects.bulk_create(
+        [
+            StudentTermReport(
+                student_id=student_id,
+                school_class_id=class_id,
+                academic_session=academic_session,
+                term=term,
+                principal_comment=comment,
+            )
+            for student_id, (class_id, comment) in comments.items()
+        ],
+        update_conflicts=True,
+        unique_fields=list(ASSESSMENT_KEY_FIELDS),
+        update_fields=["principal_comment", "updated_at"],
+        batch_size=1000,
+    )
+    counts["written"] = len(comments)
+    return counts, errors
+
 
-    student_map = {}
-    for result in results:
-        student_map.setdefault(result.student_id, []).append(result)
+# -------------------------
+# Batch computation (many classes)
+# -------------------------
+def _init_compute_worker():
+    """
+    Process pool initializer: make sure Django is set up and drop any
+    connection inherited from the parent so each worker opens its own.
+    """
+    import django
+    django.setup()
+    connections.close_all()
+
+
+def _compute_class_job(job):
+    """
+    Computes one (class_id, session_id, term) job.
+    Returns (job, error) where error is None on success.
+    """
+    class_id, session_id, term = job
+    try:
+        compute_term_results(
+            SchoolClass.objects.get(id=class_id),
+            AcademicSession.objects.get(id=session_id),
+            term,
+        )
+    except Exception as e:
+        return job, str(e)
+    return job, None
 
-    summaries = []
-    for student_id, records in student_map.items():
-        total_score = sum(r.total for r in records)
-        average = total_score / len(records) if records else 0
 
-        summary, _ = TermResultSummary.objects.update_or_create(
-            student_id=student_id,
+def compute_term_results_batch(jobs, workers=None, on_progress=None):
+    """
+    Runs compute_term_results for many (class_id, session_id, term) jobs.
+
+    Jobs are fanned out to a process pool (one DB connection per worker).
+    SQLite only allows a single writer, so on SQLite the jobs run in-process.
+    on_progress(job, error, done, total) is called in the calling process as
+    each job finishes. Returns the list of (job, error) pairs.
+    """
+    jobs = list(jobs)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if connection.vendor == "sqlite":
+        workers = 1
+    workers = max(1, min(workers, len(jobs)))
+
+    outcomes = []
+
+    def record(outcome):
+        outcomes.append(outcome)
+        if on_progress:
+            on_progress(*outcome, len(outcomes), len(jobs))
+
+    if workers == 1:
+        for job in jobs:
+            record(_compute_class_job(job))
+        return outcomes
+
+    # Forked workers must not share the parent's open socket
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_compute_worker) as pool:
+        futures = [pool.submit(_compute_class_job, job) for job in jobs]
+        for future in as_completed(futures):
+            record(future.result())
+
+    return outcomes
+
+
+def school_term_jobs(term, school=None, session_name=""):
+    """
+    Returns (class_id, session_id, term) jobs for every class of a school,
+    or of every active school, that has results for the term.
+    An empty session_name uses each school's active session.
+    """
+    sessions = AcademicSession.objects.filter(school__is_active=True)
+    if school is not None:
+        sessions = sessions.filter(school=school)
+    if session_name:
+        sessions = sessions.filter(name=session_name)
+    else:
+        sessions = sessions.filter(is_active=True)
+
+    return [
+        (class_id, session_id, term)
+        for class_id, session_id in (
+            StudentResult.objects
+            .filter(academic_session__in=sessions, term=term, school_class__is_active=True)
+            .values_list("school_class_id", "academic_session_id")
+            .distinct()
+            .order_by("school_class_id")
+        )
+    ]
+
+
+# -------------------------
+# Class result matrix (broadsheets, final results, report cards)
+# -------------------------
+RESULT_SCORE_FIELDS = ("ca1", "ca2", "ca3", "ca4", "test1", "test2", "exam", "total", "subject_highest")
+
+
+class ClassResultMatrix:
+    """
+    Every result of a class for one session/term held as student x subject
+    arrays, with per-student totals, averages and tie-aware class positions.
+
+    Rows follow `students` (last name, first name) and columns follow
+    `subjects` (by name); `student_index`/`subject_index` map ids to them.
+    Missing results are marked False in `present`.
+    """
+
+    def __init__(self, students, subjects, results):
+        self.students = list(students)
+        self.subjects = list(subjects)
+        self.student_index = {student.id: i for i, student in enumerate(self.students)}
+        self.subject_index = {subject.id: j for j, subject in enumerate(self.subjects)}
+
+        shape = (len(self.students), len(self.subjects))
+        self.present = np.zeros(shape, dtype=bool)
+        self.scores = {field: np.zeros(shape, dtype=int) for field in RESULT_SCORE_FIELDS}
+        self.subject_positions = np.full(shape, None, dtype=object)
+        self.grades = np.full(shape, "-", dtype=object)
+        self.remarks = np.full(shape, "-", dtype=object)
+
+        for row in results:
+            i = self.student_index.get(row["student_id"])
+            j = self.subject_index.get(row["subject_id"])
+            if i is None or j is None:
+                continue
+            self.present[i, j] = True
+            for field in RESULT_SCORE_FIELDS:
+                self.scores[field][i, j] = row[field]
+            self.subject_positions[i, j] = row["subject_position"]
+            self.grades[i, j] = row["grade"]
+            self.remarks[i, j] = row["remark"]
+
+        self.totals = self.scores["total"].sum(axis=1)
+        self.subject_counts = self.present.sum(axis=1)
+        # Averages are rounded before ranking so the printed value decides ties
+        self.averages = [
+            round(int(total) / int(count), 2) if count else 0
+            for total, count in zip(self.totals, self.subject_counts)
+        ]
+        self.positions = rank_scores(self.averages) if self.students else np.array([], dtype=int)
+
+    def subject_scores(self, i, j):
+        """Score dict for one cell, in the shape the views and PDF generators use."""
+        cell = {field: int(self.scores[field][i, j]) for field in RESULT_SCORE_FIELDS}
+        cell["grade"] = self.grades[i, j]
+        cell["remark"] = self.remarks[i, j]
+        cell["subject_position"] = self.subject_positions[i, j]
+        return cell
+
+    def student_rows(self, include_student_obj=False):
+        """
+        One dict per student, best average first (ties keep name order), with
+        per-subject scores keyed by subject name and the class position.
+        """
+        order = sorted(range(len(self.students)), key=lambda i: self.averages[i], reverse=True)
+        rows = []
+        for i in order:
+            student = self.students[i]
+            row = {
+                "student_id": student.id,
+                "student": str(student),
+                "admission": student.admission_number,
+                "subjects": {
+                    subject.name: self.subject_scores(i, j)
+                    for j, subject in enumerate(self.subjects)
+                },
+                "total": int(self.totals[i]),
+                "average": self.averages[i],
+                "subject_count": int(self.subject_counts[i]),
+                "position": int(self.positions[i]),
+            }
+            if include_student_obj:
+                row["student_obj"] = student
+            rows.append(row)
+        return rows
+
+
+def load_class_result_matrix(school_class, academic_session, term):
+    """
+    Loads a ClassResultMatrix for the class's active students and subjects
+    with a single query for all of the class's results.
+    """
+    students = school_class.students.filter(is_active=True).order_by("last_name", "first_name")
+    subjects = Subject.objects.filter(
+        class_subjects__school_class=school_class
+    ).distinct().order_by("name")
+
+    results = (
+        StudentResult.objects
+        .filter(
             school_class=school_class,
             academic_session=academic_session,
             term=term,
-            defaults={
-                "total_score": total_score,
-                "average": average,
+            student__is_active=True,
+        )
+        .values(
+            "student_id", "subject_id", *RESULT_SCORE_FIELDS,
+            "subject_position", "grade", "remark",
+        )
+    )
+    return ClassResultMatrix(students, subjects, results)
+
+
+# -------------------------
+# Cumulative session results
+# -------------------------
+CUMULATIVE_TERMS = ("First", "Second", "Third")
+
+
+def _cumulative_results(students, academic_session, school_id, rank=False):
+    """
+    Cumulative session data for the given students from one fetch of their
+    session results. Returns {student_id: (results_data, cumulative_stats)}.
+    With rank, the students are ranked against each other on their
+    cumulative average, so they must be a whole class cohort; otherwise
+    every position is '-'.
+    """
+    students = list(students)
+    student_index = {student.id: i for i, student in enumerate(students)}
+
+    rows = list(
+        StudentResult.objects
+        .filter(student_id__in=student_index, academic_session=academic_session)
+        .values_list("student_id", "subject_id", "subject__name", "term", "total")
+    )
+    subject_names = dict(sorted({(row[1], row[2]) for row in rows}, key=lambda item: item[1]))
+    subject_index = {subject_id: j for j, subject_id in enumerate(subject_names)}
+
+    shape = (len(students), len(subject_index), len(CUMULATIVE_TERMS))
+    totals = np.zeros(shape, dtype=int)
+    present = np.zeros(shape, dtype=bool)
+    for student_id, subject_id, _, term, total in rows:
+        if term not in CUMULATIVE_TERMS:
+            continue
+        cell = (student_index[student_id], subject_index[subject_id], CUMULATIVE_TERMS.index(term))
+        totals[cell] = total
+        present[cell] = True
+
+    subject_totals = totals.sum(axis=2)
+    term_counts = present.sum(axis=2)
+    taken = term_counts > 0
+    subject_averages = np.divide(
+        subject_totals, term_counts, out=np.zeros(subject_totals.shape), where=taken
+    )
+    grades = get_grading_scale(school_id).grades(subject_averages)
+
+    subject_counts = taken.sum(axis=1)
+    total_scores = subject_totals.sum(axis=1)
+    averages = np.divide(
+        subject_averages.sum(axis=1), subject_counts,
+        out=np.zeros(len(students)), where=subject_counts > 0
+    )
+
+    # Only students with results are ranked; averages are rounded to what is printed
+    ranked = np.flatnonzero(subject_counts)
+    positions = {}
+    if rank and len(ranked):
+        for i, position in zip(ranked, rank_scores(np.round(averages[ranked], 2))):
+            positions[int(i)] = int(position)
+
+    cumulative = {}
+    for i, student in enumerate(students):
+        results_data = {}
+        for j, name in enumerate(subject_names.values()):
+            if not taken[i, j]:
+                continue
+            term_scores = {
+                term: (int(totals[i, j, k]) if present[i, j, k] else None)
+                for k, term in enumerate(CUMULATIVE_TERMS)
+            }
+            results_data[name] = {
+                'First': term_scores['First'] or '-',
+                'Second': term_scores['Second'] or '-',
+                'Third': term_scores['Third'] or '-',
+                'total': int(subject_totals[i, j]),
+                'avg': float(subject_averages[i, j]),
+                'grade': grades[i, j],
+            }
+        cumulative_stats = {
+            'average': float(averages[i]),
+            'position': positions.get(i, '-'),
+            'total_score': int(total_scores[i]),
+            'subject_count': int(subject_counts[i]),
+        }
+        cumulative[student.id] = (results_data, cumulative_stats)
+    return cumulative
+
+
+def load_class_cumulative_results(school_class, academic_session):
+    """
+    Cumulative session results for every active student of a class with
+    class-wide, tie-aware cumulative positions.
+    Returns {student_id: (results_data, cumulative_stats)}.
+    """
+    students = school_class.students.filter(is_active=True)
+    return _cumulative_results(students, academic_session, school_class.school_id, rank=True)
+
+
+def refresh_session_summaries(school_class, academic_session, student_ids=None):
+    """
+    Brings the class's SessionResultSummary rows up to date.
+
+    With student_ids only those students are re-aggregated from their
+    results; everyone else keeps their stored figures and is only re-ranked.
+    Without it, or when the class has no summaries yet, the whole class is
+    rebuilt and summaries of students who no longer have results in the
+    class are removed. Only rows whose figures or position change are
+    written back.
+    """
+    summaries = SessionResultSummary.objects.filter(
+        school_class=school_class, academic_session=academic_session
+    )
+    stored = {
+        student_id: (total_score, average, subject_count, subjects, position)
+        for student_id, total_score, average, subject_count, subjects, position in summaries.values_list(
+            "student_id", "total_score", "average", "subject_count", "subjects", "position"
+        )
+    }
+
+    # A few students on their own cannot be ranked against the class
+    if not stored:
+        student_ids = None
+
+    students = school_class.students.filter(is_active=True)
+    if student_ids is not None:
+        students = students.filter(id__in=student_ids)
+    fresh = {
+        student_id: (
+            stats["total_score"], stats["average"], stats["subject_count"],
+            {
+                subject: {key: value for key, value in row.items() if key != "grade"}
+                for subject, row in results_data.items()
             },
         )
-        summaries.append(summary)
+        for student_id, (results_data, stats) in _cumulative_results(
+            students, academic_session, school_class.school_id
+        ).items()
+        if stats["subject_count"]
+    }
+
+    if student_ids is None:
+        figures = fresh
+        stale = set(stored) - set(fresh)
+    else:
+        figures = {student_id: row[:4] for student_id, row in stored.items()}
+        figures.update(fresh)
+        stale = {student_id for student_id in student_ids if student_id in stored and student_id not in fresh}
+        for student_id in stale:
+            figures.pop(student_id)
+
+    if stale:
+        summaries.filter(student_id__in=stale).delete()
+    if not figures:
+        return
 
-    # Sort by average (descending)
-    summaries.sort(key=lambda s: s.average, reverse=True)
+    ids = list(figures)
+    positions = rank_scores(np.round([figures[student_id][1] for student_id in ids], 2))
 
-    # Assign positions (handles ties correctly)
-    current_position = 1
-    last_average = None
+    rows = []
+    for student_id, position in zip(ids, positions.tolist()):
+        row = (*figures[student_id], position)
+        if stored.get(student_id) != row:
+            rows.append((student_id, *row))
 
-    for index, summary in enumerate(summaries):
-        if last_average is not None and summary.average < last_average:
-            current_position = index + 1
+    SessionResultSummary.objects.bulk_create(
+        [
+            SessionResultSummary(
+                student_id=student_id,
+                school_class=school_class,
+                academic_session=academic_session,
+                total_score=total_score,
+                average=average,
+                subject_count=subject_count,
+                subjects=subjects,
+                position=position,
+            )
+            for student_id, total_score, average, subject_count, subjects, position in rows
+        ],
+        update_conflicts=True,
+        unique_fields=["student", "school_class", "academic_session"],
+        update_fields=["total_score", "average", "subject_count", "subjects", "position", "updated_at"],
+    )
+
+
+def get_cumulative_result_data(student, academic_session):
+    """
+    Returns (results_data, cumulative_stats) for a student's cumulative session result.
+    results_data: {subject: {First, Second, Third, total, avg, grade}}
+    cumulative_stats: {average, position, total_score, subject_count}
+    The position is the student's cumulative position in their class, or
+    '-' for a student who is inactive or not in a class. When the student
+    has a SessionResultSummary both the rows and the stats come from it,
+    so the read is one lookup and the stats always agree with the rows.
+    """
+    summary = (
+        SessionResultSummary.objects
+        .filter(student=student, academic_session=academic_session)
+        .order_by("-updated_at")
+        .first()
+    )
+    # Summaries written before the subject rows were stored are rebuilt on their next refresh
+    if summary is None or (summary.subject_count and not summary.subjects):
+        if student.school_class_id and student.is_active:
+            return load_class_cumulative_results(student.school_class, academic_session)[student.id]
+        return _cumulative_results([student], academic_session, student.school_id)[student.id]
 
-        summary.position = current_position
-        summary.save(update_fields=["position"])
-        last_average = summary.average
+    scale = get_grading_scale(student.school_id)
+    results_data = {
+        subject: {**row, 'grade': scale.grade(row['avg'])}
+        for subject, row in sorted(summary.subjects.items())
+    }
+    in_class = student.is_active and student.school_class_id
+    cumulative_stats = {
+        'average': summary.average,
+        'position': (summary.position if in_class else None) or '-',
+        'total_score': summary.total_score,
+        'subject_count': summary.subject_count,
+    }
+    return results_data, cumulative_stats
@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+
+from academics.models import ClassSubject, SchoolClass, StudentResult, Subject
+from schools.models import AcademicSession, School
+from students.models import Student
+
+
+def build_class(students, subjects, name="TEST"):
+    """
+    A school with one session and one class of the given students (admission
+    numbers) taking the given subjects (names). Students are bulk created,
+    which skips the signal that provisions a login for each of them.
+    """
+    school = School.objects.create(name=f"{name} School", address="-")
+    session = AcademicSession.objects.create(school=school, name="2025/2026")
+    school_class = SchoolClass.objects.create(school=school, name=name)
+    subject_objs = Subject.objects.bulk_create(Subject(school=school, name=subject) for subject in subjects)
+    ClassSubject.objects.bulk_create(
+        ClassSubject(school_class=school_class, subject=subject) for subject in subject_objs
+    )
+    student_objs = Student.objects.bulk_create(
+        Student(
+            school=school,
+            school_class=school_class,
+            first_name=admission,
+            last_name="Test",
+            admission_number=admission,
+        )
+        for admission in students
+    )
+    return SimpleNamespace(
+        school=school,
+        session=session,
+        school_class=school_class,
+        students={student.admission_number: student for student in student_objs},
+        subjects={subject.name: subject for subject in subject_objs},
+    )
+
+
+def add_results(fixture, term, scores):
+    """
+    Saves {admission: {subject: (test1, test2, exam)}} as the term's results,
+    one StudentResult.save() each.
+    """
+    results = []
+    for admission, by_subject in scores.items():
+        for subject, (test1, test2, exam) in by_subject.items():
+            result = StudentResult(
+                student=fixture.students[admission],
+                school_class=fixture.school_class,
+                subject=fixture.subjects[subject],
+                academic_session=fixture.session,
+                term=term,
+                test1=test1,
+                test2=test2,
+                exam=exam,
+            )
+            result.save()
+            results.append(result)
+    return results
@@ -0,0 +1,116 @@
+from django.test import TestCase
+
+from academics.models import StudentResult
+from academics.services import (
+    compute_term_results, get_cumulative_result_data, load_class_cumulative_results,
+    refresh_session_summaries, refresh_term_results, save_subject_scores
+)
+
+from .fixtures import add_results, build_class
+
+
+def reference_cumulative(school_class, academic_session):
+    """Cumulative averages and positions worked out one result at a time."""
+    averages = {}
+    for student in school_class.students.filter(is_active=True):
+        by_subject = {}
+        for result in StudentResult.objects.filter(student=student, academic_session=academic_session):
+            by_subject.setdefault(result.subject_id, []).append(result.total)
+        if by_subject:
+            subject_averages = [sum(totals) / len(totals) for totals in by_subject.values()]
+            averages[student.id] = round(sum(subject_averages) / len(subject_averages), 2)
+    positions = {
+        student_id: 1 + sum(other > average for other in averages.values())
+        for student_id, average in averages.items()
+    }
+    return averages, positions
+
+
+class CumulativeResultTests(TestCase):
+    def setUp(self):
+        self.fixture = build_class(["S1", "S2", "S3", "S4"], ["Maths", "English"])
+        add_results(self.fixture, "First", {
+            "S1": {"Maths": (10, 10, 40), "English": (10, 10, 30)},
+            "S2": {"Maths": (10, 10, 30), "English": (10, 10, 40)},
+            "S3": {"Maths": (5, 5, 20), "English": (5, 5, 20)},
+            "S4": {"Maths": (20, 20, 60)},
+        })
+        add_results(self.fixture, "Second", {
+            "S1": {"English": (10, 10, 35)},
+            "S2": {"Maths": (10, 10, 35)},
+            "S3": {"Maths": (10, 10, 10)},
+        })
+
+    def test_class_positions_match_reference_with_ties(self):
+        averages, positions = reference_cumulative(self.fixture.school_class, self.fixture.session)
+        cumulative = load_class_cumulative_results(self.fixture.school_class, self.fixture.session)
+
+        for student_id, (_, stats) in cumulative.items():
+            self.assertAlmostEqual(stats["average"], averages[student_id], places=2)
+            self.assertEqual(stats["position"], positions[student_id])
+        s1, s2 = self.fixture.students["S1"].id, self.fixture.students["S2"].id
+        self.assertEqual(cumulative[s1][1]["position"], cumulative[s2][1]["position"])
+
+    def test_summary_stats_match_live_rows(self):
+        refresh_session_summaries(self.fixture.school_class, self.fixture.session)
+        live = load_class_cumulative_results(self.fixture.school_class, self.fixture.session)
+
+        for student in self.fixture.students.values():
+            results_data, stats = get_cumulative_result_data(student, self.fixture.session)
+            self.assertEqual(stats["total_score"], sum(row["total"] for row in results_data.values()))
+            self.assertEqual(stats["position"], live[student.id][1]["position"])
+
+    def test_summary_read_is_one_lookup_with_the_live_rows(self):
+        refresh_session_summaries(self.fixture.school_class, self.fixture.session)
+        live = load_class_cumulative_results(self.fixture.school_class, self.fixture.session)
+        student = self.fixture.students["S1"]
+        get_cumulative_result_data(student, self.fixture.session)
+
+        # The summary row, then the grading scale's revision
+        with self.assertNumQueries(2):
+            results_data, stats = get_cumulative_result_data(student, self.fixture.session)
+        self.assertEqual(results_data, live[student.id][0])
+        self.assertEqual(list(results_data), ["English", "Maths"])
+        self.assertEqual(stats, live[student.id][1])
+
+    def test_edit_in_uncomputed_term_keeps_session_summary_current(self):
+        compute_term_results(self.fixture.school_class, self.fixture.session, "First")
+        student = self.fixture.students["S4"]
+        maths = self.fixture.subjects["Maths"]
+
+        # Third term has never been computed for the class
+        save_subject_scores(
+            self.fixture.school_class, maths, self.fixture.session, "Third",
+            {student.id: {"test1": 20, "test2": 20, "exam": 60}},
+        )
+        refresh_term_results(self.fixture.school_class, self.fixture.session, "Third", [(student.id, maths.id)])
+
+        results_data, stats = get_cumulative_result_data(student, self.fixture.session)
+        self.assertEqual(stats["total_score"], sum(row["total"] for row in results_data.values()))
+        self.assertEqual(stats["total_score"], 200)
+        live = load_class_cumulative_results(self.fixture.school_class, self.fixture.session)
+        self.assertEqual(stats["position"], live[student.id][1]["position"])
+
+    def test_first_edit_builds_summaries_for_whole_class(self):
+        student = self.fixture.students["S3"]
+        maths = self.fixture.subjects["Maths"]
+        refresh_term_results(self.fixture.school_class, self.fixture.session, "First", [(student.id, maths.id)])
+
+        live = load_class_cumulative_results(self.fixture.school_class, self.fixture.session)
+        for other in self.fixture.students.values():
+            self.assertEqual(
+                get_cumulative_result_data(other, self.fixture.session)[1]["position"],
+                live[other.id][1]["position"],
+            )
+
+    def test_inactive_student_is_not_ranked_alone(self):
+        student = self.fixture.students["S3"]
+        student.is_active = False
+        student.save(update_fields=["is_active"])
+
+        _, stats = get_cumulative_result_data(student, self.fixture.session)
+        self.assertEqual(stats["position"], "-")
+        self.assertEqual(stats["subject_count"], 2)
+
+        refresh_session_summaries(self.fixture.school_class, self.fixture.session)
+        self.assertEqual(get_cumulative_result_data(student, self.fixture.session)[1]["position"], "-")
@@ -0,0 +1,72 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from academics.grading import DEFAULT_SCALE, get_grading_scale
+from academics.models import GradingBand, GradingScale
+from schools.models import School
+
+
+class GradingScaleCacheTests(TestCase):
+    def setUp(self):
+        self.school = School.objects.create(name="Grading School", address="-")
+
+    def test_default_scale_without_configuration(self):
+        self.assertIs(get_grading_scale(self.school), DEFAULT_SCALE)
+
+    def test_change_seen_by_process_that_did_not_save_it(self):
+        scale = GradingScale.objects.create(school=self.school)
+        GradingBand.objects.create(scale=scale, grade="P", min_score=50, remark="Pass")
+        GradingBand.objects.create(scale=scale, grade="F", min_score=0, remark="Fail")
+        self.assertEqual(get_grading_scale(self.school).grade(55), "P")
+
+        # Another worker saves the band: only the revision tells this process
+        with mock.patch("academics.grading.invalidate_grading_scales"):
+            GradingBand.objects.filter(scale=scale, grade="P").delete()
+            GradingBand.objects.create(scale=scale, grade="P", min_score=60, remark="Pass")
+
+        self.assertEqual(get_grading_scale(self.school).grade(55), "F")
+
+    def test_stale_scale_instance_saved_back_still_invalidates(self):
+        scale = GradingScale.objects.create(school=self.school, pass_mark=40)
+        stale = GradingScale.objects.get(pk=scale.pk)
+        GradingBand.objects.create(scale=scale, grade="A", min_score=0, remark="All")
+        self.assertEqual(get_grading_scale(self.school).pass_mark, 40)
+
+        with mock.patch("academics.grading.invalidate_grading_scales"):
+            stale.pass_mark = 50
+            stale.save()
+
+        self.assertEqual(get_grading_scale(self.school).pass_mark, 50)
+
+
+class ResultSaveScaleTests(TestCase):
+    def setUp(self):
+        from academics.tests.fixtures import add_results, build_class
+
+        self.fixture = build_class(["S1"], ["Maths"], name="SCALE")
+        add_results(self.fixture, "First", {"S1": {"Maths": (10, 10, 30)}})
+        scale = GradingScale.objects.create(school=self.fixture.school)
+        GradingBand.objects.create(scale=scale, grade="P", min_score=50, remark="Pass")
+        GradingBand.objects.create(scale=scale, grade="F", min_score=0, remark="Fail")
+
+    def test_class_scale_is_one_query(self):
+        from academics.grading import get_class_grading_scale
+
+        get_class_grading_scale(self.fixture.school_class.pk)
+        with self.assertNumQueries(1):
+            scale = get_class_grading_scale(self.fixture.school_class.pk)
+        self.assertEqual(scale.grade(55), "P")
+
+    def test_save_resolves_scale_once(self):
+        from academics import grading
+        from academics.models import StudentResult
+
+        result = StudentResult.objects.get()
+        result.exam = 20
+        with mock.patch.object(
+            grading, "get_class_grading_scale", wraps=grading.get_class_grading_scale
+        ) as resolve:
+            result.save()
+        resolve.assert_called_once_with(self.fixture.school_class.pk)
+        self.assertEqual((result.total, result.grade, result.remark), (40, "F", "Fail"))
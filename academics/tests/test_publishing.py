@@ -0,0 +1,46 @@
+from django.test import TestCase, override_settings
+
+from academics.grading import get_grading_scale
+from academics.models import GradingBand, GradingScale
+from academics.publishing import get_published_snapshot, publish_class_results
+from academics.services import compute_term_results
+from portal.report_cards import report_card_kwargs
+from portal.result_pdf_generator import generate_student_result_pdf
+
+from .fixtures import add_results, build_class
+
+
+class PublishClassResultsTests(TestCase):
+    def setUp(self):
+        self.fixture = build_class(["S1", "S2"], ["Maths"])
+        scale = GradingScale.objects.create(school=self.fixture.school)
+        GradingBand.objects.create(scale=scale, grade="P", min_score=50, remark="Pass", teacher_comment="Passed.")
+        GradingBand.objects.create(scale=scale, grade="F", min_score=0, remark="Fail", teacher_comment="Failed.")
+        add_results(self.fixture, "First", {
+            "S1": {"Maths": (10, 10, 35)},
+            "S2": {"Maths": (5, 5, 20)},
+        })
+        compute_term_results(self.fixture.school_class, self.fixture.session, "First")
+
+    def test_each_publish_is_a_new_version(self):
+        first = publish_class_results(self.fixture.school_class, self.fixture.session, "First")
+        second = publish_class_results(self.fixture.school_class, self.fixture.session, "First")
+        self.assertEqual((first.version, second.version), (1, 2))
+        self.assertEqual(second.student_count, 2)
+
+    @override_settings(PDF_CACHE_MAX_MB=0)
+    def test_published_card_keeps_grading_scale_it_was_published_with(self):
+        publish_class_results(self.fixture.school_class, self.fixture.session, "First")
+        published_key = get_grading_scale(self.fixture.school).key_rows()
+
+        GradingBand.objects.filter(grade="P").update(min_score=60)
+        GradingBand.objects.get(grade="P").save()
+        self.assertEqual(get_grading_scale(self.fixture.school).grade(55), "F")
+
+        student = self.fixture.students["S1"]
+        snapshot = get_published_snapshot(student, self.fixture.session, "First")
+        kwargs = report_card_kwargs(snapshot.data, self.fixture.school, self.fixture.school_class)
+        self.assertEqual(kwargs["grading_scale"].grade(55), "P")
+        self.assertEqual(kwargs["grading_scale"].teacher_comment(55), "Passed.")
+        self.assertEqual(kwargs["grading_scale"].key_rows(), published_key)
+        self.assertTrue(generate_student_result_pdf(**kwargs).getvalue().startswith(b"%PDF"))
@@ -0,0 +1,65 @@
+from django.contrib import admin
+from django.test import TestCase
+from django.urls import reverse
+
+from academics.models import CBTExam, CBTQuestion, SessionResultSummary, StudentResult, TermResultSummary
+from academics.services import compute_term_results
+from accounts.models import User
+
+from .fixtures import add_results, build_class
+
+
+class SingleResultEditTests(TestCase):
+    def setUp(self):
+        self.fixture = build_class(["S1", "S2"], ["Maths", "English"], name="EDIT")
+        self.fixture.session.is_active = True
+        self.fixture.session.save()
+        add_results(self.fixture, "First", {
+            "S1": {"Maths": (10, 10, 30), "English": (10, 10, 30)},
+            "S2": {"Maths": (15, 15, 40), "English": (15, 15, 40)},
+        })
+        compute_term_results(self.fixture.school_class, self.fixture.session, "First")
+
+    def summaries(self, admission):
+        student = self.fixture.students[admission]
+        term = TermResultSummary.objects.get(student=student, term="First")
+        session = SessionResultSummary.objects.get(student=student)
+        return (term.total_score, term.position), (session.total_score, session.position)
+
+    def test_cbt_score_refreshes_summaries(self):
+        student = self.fixture.students["S1"]
+        student.user = User.objects.create_user(
+            username="cbt-student", password="x", role=User.Role.STUDENT, school=self.fixture.school
+        )
+        student.save(update_fields=["user"])
+        maths = self.fixture.subjects["Maths"]
+        CBTExam.objects.create(
+            school=self.fixture.school, school_class=self.fixture.school_class, subject=maths,
+            cbt_type="exam", is_published=True,
+        )
+        question = CBTQuestion.objects.create(
+            school=self.fixture.school, school_class=self.fixture.school_class, subject=maths,
+            text="1 + 1", option_a="2", option_b="3", option_c="4", option_d="5",
+            correct_option="A", is_published=True,
+        )
+        self.assertEqual(self.summaries("S1"), ((100, 2), (100, 2)))
+
+        self.client.force_login(student.user)
+        response = self.client.post(
+            reverse("cbt_start", args=[maths.id]), {f"question_{question.id}": "A"}, secure=True
+        )
+
+        self.assertEqual(response.status_code, 302)
+        result = StudentResult.objects.get(student=student, subject=maths)
+        self.assertEqual((result.exam, result.total, result.subject_position), (60, 80, 1))
+        self.assertEqual(self.summaries("S1"), ((130, 2), (130, 2)))
+        self.assertEqual(self.summaries("S2")[0], (140, 1))
+
+    def test_admin_delete_refreshes_summaries(self):
+        model_admin = admin.site._registry[StudentResult]
+        student = self.fixture.students["S2"]
+        model_admin.delete_queryset(None, StudentResult.objects.filter(student=student))
+
+        self.assertFalse(TermResultSummary.objects.filter(student=student).exists())
+        self.assertFalse(SessionResultSummary.objects.filter(student=student).exists())
+        self.assertEqual(self.summaries("S1"), ((100, 1), (100, 1)))
@@ -0,0 +1,44 @@
+from django.test import TestCase
+
+from academics.models import ScoreGridVersion, StudentResult
+
+from .fixtures import add_results, build_class
+
+
+class StudentResultSaveTests(TestCase):
+    def setUp(self):
+        self.fixture = build_class(["S1"], ["Maths"])
+        self.result, = add_results(self.fixture, "First", {"S1": {"Maths": (10, 10, 30)}})
+
+    def grid_version(self):
+        return ScoreGridVersion.current(
+            self.fixture.school_class.id, self.fixture.subjects["Maths"].id, self.fixture.session.id, "First"
+        )
+
+    def test_score_edit_bumps_grid_and_recomputes_total(self):
+        result = StudentResult.objects.get(pk=self.result.pk)
+        result.exam = 40
+        result.save(update_fields=["exam"])
+
+        result.refresh_from_db()
+        self.assertEqual(result.total, 60)
+        self.assertEqual(result.version, 2)
+        self.assertEqual(self.grid_version(), 2)
+
+    def test_partial_save_of_other_fields_leaves_scores_and_grid_alone(self):
+        StudentResult.objects.filter(pk=self.result.pk).update(total=0, grade="X")
+        result = StudentResult.objects.get(pk=self.result.pk)
+        result.subject_position = 3
+        with self.assertNumQueries(1):
+            result.save(update_fields=["subject_position"])
+
+        result.refresh_from_db()
+        self.assertEqual((result.total, result.grade, result.version), (0, "X", 1))
+        self.assertEqual(self.grid_version(), 1)
+
+    def test_full_save_without_score_change_does_not_bump_grid(self):
+        result = StudentResult.objects.get(pk=self.result.pk)
+        result.subject_highest = 50
+        result.save()
+        self.assertEqual(self.grid_version(), 1)
+        self.assertEqual(StudentResult.objects.get(pk=self.result.pk).version, 1)
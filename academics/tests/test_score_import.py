@@ -0,0 +1,80 @@
+from io import BytesIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+
+from academics.models import StudentResult
+from academics.score_import import ScoreSheetError, iter_sheet_rows, plan_score_import
+
+from .fixtures import add_results, build_class
+
+
+def csv_file(text, name="scores.csv"):
+    return SimpleUploadedFile(name, text.encode())
+
+
+def xlsx_file(rows, name="scores.xlsx"):
+    from openpyxl import Workbook
+
+    workbook = Workbook()
+    for row in rows:
+        workbook.active.append(row)
+    buffer = BytesIO()
+    workbook.save(buffer)
+    return SimpleUploadedFile(name, buffer.getvalue())
+
+
+class ScoreImportTests(TestCase):
+    def setUp(self):
+        self.fixture = build_class(["S1", "S2", "S3"], ["Maths"], name="IMPORT")
+        add_results(self.fixture, "First", {"S1": {"Maths": (10, 10, 30)}})
+
+    def plan(self, uploaded_file):
+        return plan_score_import(
+            uploaded_file, self.fixture.school_class, self.fixture.subjects["Maths"],
+            self.fixture.session, "First",
+        )
+
+    def test_header_aliases_are_mapped(self):
+        plan = self.plan(csv_file("Admission No.,First Test,Second Test,Examination\ns2,5,6,40\n"))
+        s2 = self.fixture.students["S2"].id
+        self.assertEqual(plan["scores"], {s2: {"test1": 5, "test2": 6, "exam": 40}})
+        self.assertEqual(plan["changes"][0]["status"], "new")
+
+    def test_missing_column_rejects_the_sheet(self):
+        with self.assertRaisesMessage(ScoreSheetError, "Missing column(s): exam"):
+            self.plan(csv_file("admission_number,test1,test2\nS1,1,2\n"))
+
+    def test_line_numbers_run_on_across_chunks(self):
+        sheet = csv_file("admission,test1,test2,exam\n" + "".join(f"S{i},1,1,1\n" for i in range(1, 6)))
+        lines = [line for line, _ in iter_sheet_rows(sheet, chunk_size=2)]
+        self.assertEqual(lines, [2, 3, 4, 5, 6])
+
+    def test_xlsx_sheet(self):
+        plan = self.plan(xlsx_file([
+            ("Admission Number", "Test 1", "Test 2", "Exam"),
+            ("S1", 10, 10, 30),
+            ("S3", 12.0, None, 50),
+        ]))
+        s3 = self.fixture.students["S3"].id
+        self.assertEqual(plan["unchanged"], 1)
+        self.assertEqual(plan["scores"][s3], {"test1": 12, "test2": 0, "exam": 50})
+
+    def test_duplicate_and_unknown_rows_are_rejected(self):
+        plan = self.plan(csv_file("admission,test1,test2,exam\nS2,1,1,1\nS2,2,2,2\nX9,1,1,1\nS3,25,1,1\n"))
+        self.assertEqual(
+            [(error["line"], error["error"]) for error in plan["row_errors"]],
+            [
+                (3, "Duplicate of line 2"),
+                (4, "No active student with this admission number in the class"),
+                (5, "Test 1 must be 0-20"),
+            ],
+        )
+        self.assertEqual(list(plan["scores"]), [self.fixture.students["S2"].id])
+
+    def test_blank_cell_keeps_the_stored_score(self):
+        plan = self.plan(csv_file("admission,test1,test2,exam\nS1,,,45\n"))
+        s1 = self.fixture.students["S1"].id
+        self.assertEqual(plan["scores"][s1], {"test1": 10, "test2": 10, "exam": 45})
+        self.assertEqual(plan["changes"][0]["before"], {"test1": 10, "test2": 10, "exam": 30})
+        self.assertEqual(StudentResult.objects.get(student_id=s1).exam, 30)
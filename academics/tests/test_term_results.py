@@ -0,0 +1,131 @@
+from django.test import TestCase
+
+from academics.models import StudentResult, TermResultSummary
+from academics.services import compute_term_results, rank_scores, refresh_term_results
+
+from .fixtures import add_results, build_class
+
+
+def reference_term_results(school_class, academic_session, term):
+    """
+    Subject positions and class summaries worked out one result at a time,
+    as compute_term_results did before it ranked the class in one pass.
+    """
+    results = list(StudentResult.objects.filter(
+        school_class=school_class, academic_session=academic_session, term=term
+    ))
+    subjects = {}
+    for result in results:
+        subjects.setdefault(result.subject_id, []).append(result.total)
+    by_result = {
+        (result.student_id, result.subject_id): (
+            1 + sum(other > result.total for other in subjects[result.subject_id]),
+            max(subjects[result.subject_id]),
+        )
+        for result in results
+    }
+
+    totals = {}
+    for result in results:
+        totals.setdefault(result.student_id, []).append(result.total)
+    averages = {student_id: sum(scores) / len(scores) for student_id, scores in totals.items()}
+    by_student = {
+        student_id: (
+            sum(totals[student_id]),
+            round(average, 4),
+            1 + sum(other > average for other in averages.values()),
+        )
+        for student_id, average in averages.items()
+    }
+    return by_result, by_student
+
+
+def stored_term_results(school_class, academic_session, term):
+    by_result = {
+        (student_id, subject_id): (position, highest)
+        for student_id, subject_id, position, highest in StudentResult.objects.filter(
+            school_class=school_class, academic_session=academic_session, term=term
+        ).values_list("student_id", "subject_id", "subject_position", "subject_highest")
+    }
+    by_student = {
+        student_id: (total_score, round(average, 4), position)
+        for student_id, total_score, average, position in TermResultSummary.objects.filter(
+            school_class=school_class, academic_session=academic_session, term=term
+        ).values_list("student_id", "total_score", "average", "position")
+    }
+    return by_result, by_student
+
+
+class RankScoresTests(TestCase):
+    def test_ties_share_a_position_and_skip_the_next(self):
+        self.assertEqual(list(rank_scores([70, 90, 70, 50])), [2, 1, 2, 4])
+        self.assertEqual(list(rank_scores([55.5, 55.5, 55.5])), [1, 1, 1])
+
+
+class TermResultTests(TestCase):
+    def setUp(self):
+        self.fixture = build_class(["S1", "S2", "S3", "S4"], ["Maths", "English", "Physics"])
+        add_results(self.fixture, "First", {
+            "S1": {"Maths": (10, 10, 40), "English": (10, 10, 30), "Physics": (5, 5, 30)},
+            "S2": {"Maths": (10, 10, 40), "English": (10, 10, 20), "Physics": (10, 10, 30)},
+            "S3": {"Maths": (5, 5, 20), "English": (10, 10, 30)},
+            "S4": {"Maths": (20, 20, 60), "English": (0, 0, 10), "Physics": (10, 10, 30)},
+        })
+        self.grid = (self.fixture.school_class, self.fixture.session, "First")
+
+    def test_compute_matches_reference_with_ties(self):
+        compute_term_results(*self.grid)
+
+        expected = reference_term_results(*self.grid)
+        self.assertEqual(stored_term_results(*self.grid), expected)
+        students = self.fixture.students
+        positions = {adm: expected[1][students[adm].id][2] for adm in students}
+        self.assertEqual(positions, {"S1": 2, "S2": 2, "S3": 4, "S4": 1})
+        maths = self.fixture.subjects["Maths"].id
+        self.assertEqual(expected[0][(students["S1"].id, maths)], (2, 100))
+        self.assertEqual(expected[0][(students["S2"].id, maths)], (2, 100))
+
+    def test_incremental_refresh_matches_full_recompute(self):
+        compute_term_results(*self.grid)
+        students, subjects = self.fixture.students, self.fixture.subjects
+
+        result = StudentResult.objects.get(student=students["S2"], subject=subjects["Maths"], term="First")
+        result.exam = 60
+        result.save()
+        result = StudentResult.objects.get(student=students["S1"], subject=subjects["English"], term="First")
+        result.exam = 10
+        result.save()
+        add_results(self.fixture, "First", {"S3": {"Physics": (20, 20, 60)}})
+        refresh_term_results(*self.grid, [
+            (students["S2"].id, subjects["Maths"].id),
+            (students["S1"].id, subjects["English"].id),
+            (students["S3"].id, subjects["Physics"].id),
+        ])
+
+        refreshed = stored_term_results(*self.grid)
+        self.assertEqual(refreshed, reference_term_results(*self.grid))
+        compute_term_results(*self.grid)
+        self.assertEqual(refreshed, stored_term_results(*self.grid))
+
+
+class SchoolAdminComputeActionTests(TestCase):
+    def test_action_points_to_the_command_instead_of_computing(self):
+        from unittest import mock
+
+        from django.contrib import admin
+        from schools.models import School
+
+        fixture = build_class(["S1"], ["Maths"], name="ADMINACTION")
+        fixture.session.is_active = True
+        fixture.session.save()
+        add_results(fixture, "Second", {"S1": {"Maths": (10, 10, 30)}})
+
+        model_admin = admin.site._registry[School]
+        with mock.patch.object(model_admin, "message_user") as message_user:
+            model_admin.compute_term_results(None, School.objects.filter(pk=fixture.school.pk))
+
+        self.assertFalse(TermResultSummary.objects.exists())
+        self.assertIn(
+            f"compute_school_results --school {fixture.school.id} --term Second",
+            message_user.call_args.args[1],
+        )
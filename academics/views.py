@@ -123,6 +123,7 @@ def cbt_start(request, subject_id):
 
 		# Auto-score entry for test/exam CBTs
 		from .models import CBTExam, StudentResult
+		from .services import save_result
 		exam = CBTExam.objects.filter(school_class=school_class, subject=subject, is_published=True).order_by('-created_at').first()
 		if exam and exam.cbt_type in ['first_test', 'second_test', 'exam']:
 			# Get current academic session and term
@@ -149,11 +150,8 @@ def cbt_start(request, subject_id):
 			elif exam.cbt_type == 'exam':
 				score_val = int(round((correct / total) * 60)) if total > 0 else 0
 				result.exam = score_val
-			# Recalculate total and grade
-			result.total = (result.test1 or 0) + (result.test2 or 0) + (result.exam or 0)
-			result.grade = result.calculate_grade()
-			result.remark = result.calculate_remark()
-			result.save()
+			# save() recomputes the total, grade and remark
+			save_result(result)
 
 		return redirect('cbt_result', session_id=session.id)
 	responses = {r.question_id: r.selected_option for r in session.responses.all()}
@@ -164,6 +164,22 @@ LOGIN_URL = "login"
 LOGIN_REDIRECT_URL = "/portal/"
 LOGOUT_REDIRECT_URL = "/login/"
 
+# How long a stored response is replayed for a repeated Idempotency-Key header
+IDEMPOTENCY_KEY_TTL_HOURS = int(os.getenv('IDEMPOTENCY_KEY_TTL_HOURS', '24'))
+
+# Processes the export worker and CLI use to render report card ZIPs (default: CPU count)
+REPORT_CARD_WORKERS = int(os.getenv('REPORT_CARD_WORKERS', '0')) or None
+
+# Background exports: finished ZIPs are kept in the database this long,
+# and a running export whose worker goes quiet this long is queued again
+EXPORT_RETENTION_HOURS = int(os.getenv('EXPORT_RETENTION_HOURS', '24'))
+EXPORT_JOB_STALE_MINUTES = int(os.getenv('EXPORT_JOB_STALE_MINUTES', '10'))
+
+# Generated PDFs are cached on disk by a hash of their inputs; the least
+# recently used are dropped past PDF_CACHE_MAX_MB (0 turns the cache off)
+PDF_CACHE_DIR = os.getenv('PDF_CACHE_DIR', str(BASE_DIR / 'cache' / 'pdf'))
+PDF_CACHE_MAX_MB = int(os.getenv('PDF_CACHE_MAX_MB', '256'))
+
 # DeepSeek AI Assistant Integration
 DEEPSEEK_API_KEY = os.getenv('DEEPSEEK_API_KEY', '')
 DEEPSEEK_BASE_URL = 'https://api.deepseek.com'
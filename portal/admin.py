@@ -1,3 +1,16 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import ExportJob, ExportWorker
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "kind", "school", "requested_by", "status", "done", "total", "created_at", "finished_at")
+    list_filter = ("status", "kind")
+    readonly_fields = ("created_at", "started_at", "heartbeat_at", "finished_at")
+
+
+@admin.register(ExportWorker)
+class ExportWorkerAdmin(admin.ModelAdmin):
+    list_display = ("name", "seen_at")
+    readonly_fields = ("name", "seen_at")
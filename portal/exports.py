@@ -0,0 +1,276 @@
+"""
+Background PDF exports.
+
+Class and school ZIP exports are queued as ExportJob rows by the web
+process and built out of band by the export_worker management command.
+The worker claims the oldest queued job, streams its ZIP into the
+database in CHUNK_SIZE pieces (ExportChunk), so the worker can run as its
+own service without sharing a disk with the web one, and records progress
+after every PDF so the page can poll it. A job whose worker stops bumping its heartbeat is queued again (up
+to MAX_ATTEMPTS times). Workers also stamp an ExportWorker row while they
+are up; when none has been seen for EXPORT_JOB_STALE_MINUTES, jobs left
+queued that long are failed rather than waiting forever. Both checks run
+from the worker and from the status endpoint, so a dead worker shows up
+on the page. Finished jobs and their ZIPs are deleted after
+EXPORT_RETENTION_HOURS.
+"""
+import logging
+import os
+import socket
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.urls import reverse
+from django.utils import timezone
+
+from academics.models import SchoolClass, StudentResult
+from schools.models import AcademicSession
+from students.models import Student
+from .models import ExportChunk, ExportJob, ExportWorker
+from .report_cards import class_report_card_jobs, iter_class_cumulative_pdfs, iter_report_cards
+from .zip_stream import stream_zip
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 3
+# Bytes of ZIP per ExportChunk row
+CHUNK_SIZE = 1024 * 1024
+UNFINISHED = (ExportJob.Status.QUEUED, ExportJob.Status.RUNNING)
+
+
+def _retention():
+    return timedelta(hours=getattr(settings, "EXPORT_RETENTION_HOURS", 24))
+
+
+def _stale_after():
+    return timedelta(minutes=getattr(settings, "EXPORT_JOB_STALE_MINUTES", 10))
+
+
+def _safe(name):
+    return str(name).replace(" ", "_").replace("/", "-")
+
+
+# --- What each kind of export contains ---
+# A builder returns (zip_filename, total, members) where members yields
+# (filename, pdf_bytes) and total is the number of members expected.
+
+def _class_report_cards(job):
+    school_class = SchoolClass.objects.get(id=job.params["class_id"], school=job.school)
+    session = AcademicSession.objects.get(id=job.params["session_id"], school=job.school)
+    term = job.params["term"]
+    jobs = class_report_card_jobs(school_class, session, term)
+    filename = f"{_safe(job.school.name)}_{school_class.name}_{term}Term_Results_{_safe(session.name)}.zip"
+    return filename, len(jobs), iter_report_cards(jobs)
+
+
+def _class_cumulative(job):
+    school_class = SchoolClass.objects.get(id=job.params["class_id"], school=job.school)
+    session = AcademicSession.objects.get(id=job.params["session_id"], school=job.school)
+    total = school_class.students.filter(is_active=True).count()
+    filename = f"{school_class.name}_{_safe(session.name)}_CumulativeResults.zip"
+    return filename, total, iter_class_cumulative_pdfs(school_class, session)
+
+
+def _school_report_cards(job):
+    session = AcademicSession.objects.get(id=job.params["session_id"], school=job.school)
+    term = job.params["term"]
+    class_ids = StudentResult.objects.filter(
+        school_class__school=job.school, academic_session=session, term=term
+    ).values_list("school_class_id", flat=True).distinct()
+    classes = list(SchoolClass.objects.filter(id__in=class_ids).order_by("name"))
+    total = Student.objects.filter(school_class__in=classes, is_active=True).count()
+
+    def members():
+        # One class at a time, each in its own folder of the ZIP
+        for school_class in classes:
+            jobs = class_report_card_jobs(school_class, session, term)
+            for name, pdf in iter_report_cards(jobs):
+                yield f"{_safe(school_class.name)}/{name}", pdf
+
+    filename = f"{_safe(job.school.name)}_{term}Term_Results_{_safe(session.name)}.zip"
+    return filename, total, members()
+
+
+BUILDERS = {
+    ExportJob.Kind.CLASS_REPORT_CARDS: _class_report_cards,
+    ExportJob.Kind.CLASS_CUMULATIVE: _class_cumulative,
+    ExportJob.Kind.SCHOOL_REPORT_CARDS: _school_report_cards,
+}
+
+
+# --- Queue ---
+
+def enqueue_export(user, school, kind, params):
+    """
+    Queues an export and returns its job. An identical export the user
+    already has queued or running is returned instead of queuing another.
+    """
+    existing = ExportJob.objects.filter(
+        requested_by=user, school=school, kind=kind, params=params, status__in=UNFINISHED
+    ).first()
+    if existing:
+        return existing
+    return ExportJob.objects.create(requested_by=user, school=school, kind=kind, params=params)
+
+
+def requeue_stale_jobs(now=None):
+    """
+    Running jobs whose worker has stopped bumping the heartbeat go back
+    on the queue, or fail once they have used up MAX_ATTEMPTS.
+    """
+    now = now or timezone.now()
+    stale = ExportJob.objects.filter(status=ExportJob.Status.RUNNING, heartbeat_at__lt=now - _stale_after())
+    failed = stale.filter(attempts__gte=MAX_ATTEMPTS).update(
+        status=ExportJob.Status.FAILED, error="The export worker stopped while building this export.", finished_at=now
+    )
+    requeued = stale.update(status=ExportJob.Status.QUEUED, done=0)
+    return requeued + failed
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def worker_seen(name, now=None):
+    """Stamps the named worker as alive."""
+    ExportWorker.objects.update_or_create(name=name, defaults={"seen_at": now or timezone.now()})
+
+
+def fail_unserved_jobs(now=None):
+    """
+    Fails jobs queued for longer than EXPORT_JOB_STALE_MINUTES when no
+    worker has been seen in that time either. Returns how many.
+    """
+    now = now or timezone.now()
+    cutoff = now - _stale_after()
+    # A worker busy with a long export keeps its job's heartbeat instead
+    if (
+        ExportWorker.objects.filter(seen_at__gte=cutoff).exists()
+        or ExportJob.objects.filter(status=ExportJob.Status.RUNNING, heartbeat_at__gte=cutoff).exists()
+    ):
+        return 0
+    return ExportJob.objects.filter(status=ExportJob.Status.QUEUED, created_at__lt=cutoff).update(
+        status=ExportJob.Status.FAILED,
+        error="No export worker is running. Please try again later or contact the administrator.",
+        finished_at=now,
+    )
+
+
+def check_export_jobs(now=None):
+    """Requeues jobs of dead workers and fails jobs no worker is left to build."""
+    now = now or timezone.now()
+    requeue_stale_jobs(now)
+    fail_unserved_jobs(now)
+
+
+def claim_next_job():
+    """
+    Marks the oldest queued job as running and returns it, or None when the
+    queue is empty. The status check in the UPDATE makes a claim atomic, so
+    several workers can share the queue.
+    """
+    requeue_stale_jobs()
+    queued = ExportJob.objects.filter(status=ExportJob.Status.QUEUED).order_by("created_at")
+    for job_id in queued.values_list("id", flat=True)[:20]:
+        now = timezone.now()
+        claimed = ExportJob.objects.filter(id=job_id, status=ExportJob.Status.QUEUED).update(
+            status=ExportJob.Status.RUNNING, started_at=now, heartbeat_at=now, attempts=F("attempts") + 1
+        )
+        if claimed:
+            return ExportJob.objects.select_related("school").get(id=job_id)
+    return None
+
+
+def _with_progress(job, members):
+    done = 0
+    for member in members:
+        yield member
+        done += 1
+        ExportJob.objects.filter(id=job.id).update(done=done, heartbeat_at=timezone.now())
+    job.done = done
+
+
+def _store_chunks(job, stream):
+    """Writes the stream's bytes as the job's ExportChunk rows. Returns the total size."""
+    buffer = bytearray()
+    index = size = 0
+    for piece in stream:
+        buffer += piece
+        size += len(piece)
+        while len(buffer) >= CHUNK_SIZE:
+            ExportChunk.objects.create(job=job, index=index, data=bytes(buffer[:CHUNK_SIZE]))
+            del buffer[:CHUNK_SIZE]
+            index += 1
+    if buffer or not index:
+        ExportChunk.objects.create(job=job, index=index, data=bytes(buffer))
+    return size
+
+
+def run_export_job(job):
+    """Builds the job's ZIP into the database and marks it done, or failed with the error."""
+    # Left over from an attempt whose worker died
+    job.chunks.all().delete()
+    try:
+        filename, total, members = BUILDERS[job.kind](job)
+        job.filename, job.total = filename, total
+        job.save(update_fields=["filename", "total"])
+        job.size = _store_chunks(job, stream_zip(_with_progress(job, members)))
+    except Exception as e:
+        logger.exception("Export job %s failed", job.id)
+        job.chunks.all().delete()
+        job.status = ExportJob.Status.FAILED
+        job.error = str(e) or e.__class__.__name__
+        job.finished_at = timezone.now()
+        job.save(update_fields=["status", "error", "finished_at"])
+        return job
+
+    job.status = ExportJob.Status.DONE
+    job.error = ""
+    job.finished_at = timezone.now()
+    job.save(update_fields=["size", "status", "error", "done", "finished_at"])
+    return job
+
+
+def iter_export_zip(job):
+    """The finished job's ZIP, chunk by chunk, holding one chunk in memory at a time."""
+    for chunk_id in job.chunks.order_by("index").values_list("id", flat=True):
+        data = ExportChunk.objects.filter(id=chunk_id).values_list("data", flat=True).first()
+        if data is None:
+            raise ExportChunk.DoesNotExist  # expired mid-download
+        yield bytes(data)
+
+
+def cleanup_exports(now=None):
+    """Deletes finished jobs older than EXPORT_RETENTION_HOURS with their ZIPs. Returns how many."""
+    now = now or timezone.now()
+    expired = ExportJob.objects.filter(
+        status__in=(ExportJob.Status.DONE, ExportJob.Status.FAILED), finished_at__lt=now - _retention()
+    )
+    # Chunks go with their job (on_delete=CASCADE)
+    _, deleted = expired.delete()
+    count = deleted.get(ExportJob._meta.label, 0)
+    # Workers that went away without saying so
+    ExportWorker.objects.filter(seen_at__lt=now - _retention()).delete()
+    return count
+
+
+def job_payload(job):
+    """JSON view of a job for the status endpoint."""
+    payload = {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "done": job.done,
+        "total": job.total,
+        "progress": round(100 * job.done / job.total) if job.total else 0,
+        "filename": job.filename,
+        "error": job.error,
+        "created_at": job.created_at.isoformat(),
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        "status_url": reverse("portal:export_status", args=[job.id]),
+        "download_url": None,
+    }
+    if job.status == ExportJob.Status.DONE:
+        payload["download_url"] = reverse("portal:download_export", args=[job.id])
+    return payload
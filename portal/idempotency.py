@@ -0,0 +1,118 @@
+"""
+Idempotency-Key support for JSON write endpoints.
+
+A client that may retry a POST sends an Idempotency-Key header (any
+unique string, e.g. a UUID made when the user pressed Save). The first
+request with a key reserves it in the database, runs the view and stores
+the response; a repeat with the same key, by the same user, returns the
+stored response without running the view again. Keys live for
+IDEMPOTENCY_KEY_TTL_HOURS. Being in the database, they hold across
+gunicorn workers. Requests without the header are not affected.
+"""
+import hashlib
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse, JsonResponse
+from django.utils import timezone
+
+from .models import IdempotencyKey
+
+HEADER = "Idempotency-Key"
+# A reservation this old whose request never finished (worker killed) may be taken over
+STALE_RESERVATION = timedelta(minutes=5)
+
+
+def _ttl():
+    return timedelta(hours=getattr(settings, "IDEMPOTENCY_KEY_TTL_HOURS", 24))
+
+
+def _request_hash(request):
+    digest = hashlib.sha256()
+    digest.update(request.method.encode())
+    digest.update(request.get_full_path().encode())
+    digest.update(request.body)
+    return digest.hexdigest()
+
+
+def _reserve(user, key, request_hash):
+    """
+    Reserves the key for this request. Returns (record, None) when the
+    view should run, or (None, response) when it should not.
+    """
+    now = timezone.now()
+    try:
+        with transaction.atomic():
+            return IdempotencyKey.objects.create(user=user, key=key, request_hash=request_hash), None
+    except IntegrityError:
+        pass
+
+    with transaction.atomic():
+        record = IdempotencyKey.objects.select_for_update().filter(user=user, key=key).first()
+        if record is None:
+            # Deleted since our insert failed; let the client retry
+            return None, JsonResponse({'error': 'Request with this Idempotency-Key is being retried, try again'}, status=409)
+
+        expired = record.created_at < now - _ttl()
+        abandoned = record.status_code is None and record.created_at < now - STALE_RESERVATION
+        if expired or abandoned:
+            record.request_hash = request_hash
+            record.status_code = None
+            record.content_type = ""
+            record.body = b""
+            record.created_at = now
+            record.save()
+            return record, None
+
+    if record.request_hash != request_hash:
+        return None, JsonResponse({'error': 'Idempotency-Key was already used for a different request'}, status=422)
+    if record.status_code is None:
+        return None, JsonResponse({'error': 'A request with this Idempotency-Key is still being processed'}, status=409)
+
+    response = HttpResponse(bytes(record.body), status=record.status_code, content_type=record.content_type)
+    response["Idempotent-Replayed"] = "true"
+    return None, response
+
+
+def idempotent(view):
+    """
+    Makes a JSON write view replay its stored response for a repeated
+    Idempotency-Key. Goes below @login_required. Only complete JSON
+    responses below 500 are stored; otherwise the key is released so the
+    client can retry.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        key = request.headers.get(HEADER, "").strip()
+        if not key or not request.user.is_authenticated:
+            return view(request, *args, **kwargs)
+        if len(key) > 255:
+            return JsonResponse({'error': 'Idempotency-Key is too long'}, status=400)
+
+        record, replay = _reserve(request.user, key, _request_hash(request))
+        if replay is not None:
+            return replay
+
+        try:
+            response = view(request, *args, **kwargs)
+        except Exception:
+            record.delete()
+            raise
+
+        content_type = response.get("Content-Type", "")
+        if response.status_code >= 500 or response.streaming or not content_type.startswith("application/json"):
+            record.delete()
+            return response
+
+        record.status_code = response.status_code
+        record.content_type = content_type
+        record.body = response.content
+        record.save(update_fields=["status_code", "content_type", "body"])
+
+        # Drop this user's expired keys while we are here
+        IdempotencyKey.objects.filter(user=request.user, created_at__lt=timezone.now() - _ttl()).delete()
+        return response
+
+    return wrapper
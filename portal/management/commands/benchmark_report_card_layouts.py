@@ -0,0 +1,126 @@
+import copy
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import override_settings
+
+from academics.benchmarking import build_synthetic_class
+from academics.services import compute_term_results
+from portal.report_card_canvas import render_report_card
+from portal.report_cards import class_report_card_jobs
+from portal.result_pdf_generator import generate_student_result_pdf, report_card_content
+from schools.models import School
+
+
+class Command(BaseCommand):
+    help = (
+        "Render every report card of a synthetic class with the flowing and the "
+        "fixed layout, time both with the PDF cache off, and compare the pages "
+        "as images. Fails when any pixel differs by more than --tolerance grey "
+        "levels. The class is created inside a transaction that is rolled back "
+        "before rendering starts. Needs pypdfium2 (requirements-dev.txt) for the "
+        "page comparison."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size", type=int, default=30, help="Students in the class")
+        # 13 or more subjects run onto a second page
+        parser.add_argument("--subjects", type=int, default=14)
+        parser.add_argument("--rounds", type=int, default=3, help="Timed passes per layout; the fastest is reported")
+        parser.add_argument("--scale", type=float, default=2.0, help="Rasterisation scale (1 = 72 dpi)")
+        # Anti-aliasing alone moves edge pixels by one grey level
+        parser.add_argument("--tolerance", type=int, default=1, help="Largest allowed grey level difference")
+        parser.add_argument("--skip-compare", action="store_true", help="Only time the two layouts")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        pdfium = None
+        if not options["skip_compare"]:
+            try:
+                import pypdfium2 as pdfium
+            except ImportError:
+                raise CommandError(
+                    "Comparing pages needs pypdfium2 (pip install -r requirements-dev.txt); "
+                    "pass --skip-compare to only time them"
+                )
+
+        with transaction.atomic():
+            school_class, session = build_synthetic_class(
+                options["size"], options["subjects"], random.Random(options["seed"])
+            )
+            compute_term_results(school_class, session, "First")
+            jobs = class_report_card_jobs(school_class, session, "First")
+            transaction.set_rollback(True)
+
+        flowing = self._with_layout(jobs, School.ReportCardLayout.FLOWING)
+        fixed = self._with_layout(jobs, School.ReportCardLayout.FIXED)
+        fallbacks = sum(
+            render_report_card(kwargs["school"], report_card_content(**kwargs)) is None
+            for kwargs in fixed
+        )
+        self.stdout.write(
+            f"{len(jobs)} report cards, {options['subjects']} subjects, "
+            f"{fallbacks} fell back to the flowing layout"
+        )
+
+        with override_settings(PDF_CACHE_MAX_MB=0):
+            flowing_time = self._time(flowing, options["rounds"])
+            fixed_time = self._time(fixed, options["rounds"])
+            self.stdout.write(f"{'layout':>8} {'ms/card':>8} {'cards/s':>8}")
+            for label, elapsed in (("flowing", flowing_time), ("fixed", fixed_time)):
+                self.stdout.write(f"{label:>8} {elapsed / len(jobs) * 1000:>8.2f} {len(jobs) / elapsed:>8.1f}")
+            self.stdout.write(f"speedup {flowing_time / fixed_time:.2f}x")
+
+            if pdfium is None:
+                return
+            worst = 0
+            failures = []
+            for (filename, _), a, b in zip(jobs, flowing, fixed):
+                pages_a = self._pages(pdfium, generate_student_result_pdf(**a).getvalue(), options["scale"])
+                pages_b = self._pages(pdfium, generate_student_result_pdf(**b).getvalue(), options["scale"])
+                if len(pages_a) != len(pages_b):
+                    failures.append(f"{filename}: {len(pages_a)} pages flowing, {len(pages_b)} fixed")
+                    continue
+                for number, (page_a, page_b) in enumerate(zip(pages_a, pages_b), 1):
+                    difference = self._difference(page_a, page_b)
+                    worst = max(worst, difference)
+                    if difference > options["tolerance"]:
+                        failures.append(f"{filename} page {number}: pixels differ by up to {difference} grey levels")
+
+        self.stdout.write(f"largest pixel difference {worst} grey levels")
+        if failures:
+            for failure in failures:
+                self.stderr.write(failure)
+            raise CommandError(f"{len(failures)} page(s) differ between the layouts")
+
+    def _with_layout(self, jobs, layout):
+        school = copy.copy(jobs[0][1]["school"])
+        school.report_card_layout = layout
+        return [dict(kwargs, school=school) for _, kwargs in jobs]
+
+    def _time(self, cards, rounds):
+        best = None
+        for _ in range(max(1, rounds)):
+            started = time.perf_counter()
+            for kwargs in cards:
+                generate_student_result_pdf(**kwargs)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def _pages(self, pdfium, data, scale):
+        document = pdfium.PdfDocument(data)
+        try:
+            return [document[i].render(scale=scale).to_pil().convert("L") for i in range(len(document))]
+        finally:
+            document.close()
+
+    def _difference(self, a, b):
+        from PIL import ImageChops
+
+        if a.size != b.size:
+            return 255
+        low, high = ImageChops.difference(a, b).getextrema()
+        return high
@@ -0,0 +1,91 @@
+import os
+import random
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+
+from academics.benchmarking import build_synthetic_class
+from academics.services import compute_term_results
+from portal.report_cards import class_report_card_jobs, iter_report_cards
+from portal.zip_stream import stream_zip
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark report card rendering for a synthetic class with 1, 2, 4, ... "
+        "worker processes up to the CPU count, streamed into a ZIP as the class "
+        "download does, then a cold and a warm pass through the PDF cache. The "
+        "class is created inside a transaction that is rolled back before "
+        "rendering starts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size", type=int, default=60, help="Students in the class")
+        parser.add_argument("--subjects", type=int, default=14)
+        parser.add_argument("--workers", default="", help="Comma separated worker counts (default: 1, 2, 4, ... CPU count)")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        if options["workers"]:
+            worker_counts = [int(w) for w in options["workers"].split(",") if w.strip()]
+        else:
+            cpus = os.cpu_count() or 1
+            worker_counts = []
+            count = 1
+            while count < cpus:
+                worker_counts.append(count)
+                count *= 2
+            worker_counts.append(cpus)
+
+        with transaction.atomic():
+            school_class, session = build_synthetic_class(
+                options["size"], options["subjects"], random.Random(options["seed"])
+            )
+            compute_term_results(school_class, session, "First")
+            started = time.perf_counter()
+            jobs = class_report_card_jobs(school_class, session, "First")
+            prepare = time.perf_counter() - started
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"Prepared {len(jobs)} report cards in {prepare:.3f}s")
+        self.stdout.write(f"{'workers':>11} {'first':>8} {'seconds':>8} {'cards/s':>8} {'speedup':>8} {'zip MB':>8}")
+        baseline = None
+
+        def report(label, workers):
+            nonlocal baseline
+            first_byte, elapsed, count, size = self._stream(jobs, workers)
+            baseline = baseline or elapsed
+            self.stdout.write(
+                f"{label:>11} {first_byte:>8.3f} {elapsed:>8.3f} {count / elapsed:>8.1f} "
+                f"{baseline / elapsed:>7.2f}x {size / 1e6:>8.2f}"
+            )
+
+        with override_settings(PDF_CACHE_MAX_MB=0):
+            for workers in worker_counts:
+                report(str(workers), workers)
+
+        with tempfile.TemporaryDirectory() as cache_dir, override_settings(PDF_CACHE_DIR=cache_dir, PDF_CACHE_MAX_MB=1024):
+            report("1 cold", 1)
+            report("1 warm", 1)
+
+    def _stream(self, jobs, workers):
+        names = []
+
+        def cards():
+            for name, pdf in iter_report_cards(jobs, workers):
+                names.append(name)
+                yield name, pdf
+
+        started = time.perf_counter()
+        first_byte = None
+        size = 0
+        for chunk in stream_zip(cards()):
+            if first_byte is None:
+                first_byte = time.perf_counter() - started
+            size += len(chunk)
+        elapsed = time.perf_counter() - started
+        assert names == [name for name, _ in jobs]
+        return first_byte, elapsed, len(names), size
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from portal.exports import cleanup_exports
+
+
+class Command(BaseCommand):
+    help = "Delete finished exports (and their files) older than EXPORT_RETENTION_HOURS."
+
+    def handle(self, *args, **options):
+        removed = cleanup_exports()
+        self.stdout.write(f"Removed {removed} expired exports")
@@ -0,0 +1,74 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from portal.exports import claim_next_job, cleanup_exports, run_export_job, worker_name, worker_seen
+from portal.models import ExportWorker
+
+# Seconds between stamps of this worker's ExportWorker row while idle
+HEARTBEAT_SECONDS = 30
+
+
+class Command(BaseCommand):
+    help = (
+        "Build queued PDF exports (ExportJob) out of band. Runs until stopped, "
+        "polling the queue, and deletes expired exports every so often. "
+        "Several workers can share the queue."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Exit once the queue is empty")
+        parser.add_argument("--poll", type=float, default=2.0, help="Seconds between queue checks when idle")
+        parser.add_argument(
+            "--cleanup-every", type=float, default=60.0, help="Minutes between expired export clean-ups"
+        )
+
+    def handle(self, *args, **options):
+        self.stopping = False
+
+        def stop(signum, frame):
+            # Finish the export in hand, then exit
+            self.stopping = True
+            self.stdout.write("Stopping after the current export...")
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        name = worker_name()
+        try:
+            self._run(name, options)
+        finally:
+            close_old_connections()
+            ExportWorker.objects.filter(name=name).delete()
+
+    def _run(self, name, options):
+        last_cleanup = None
+        last_seen = None
+        while not self.stopping:
+            close_old_connections()
+            if last_seen is None or time.monotonic() - last_seen >= HEARTBEAT_SECONDS:
+                worker_seen(name)
+                last_seen = time.monotonic()
+            if last_cleanup is None or time.monotonic() - last_cleanup >= options["cleanup_every"] * 60:
+                removed = cleanup_exports()
+                if removed:
+                    self.stdout.write(f"Removed {removed} expired exports")
+                last_cleanup = time.monotonic()
+
+            job = claim_next_job()
+            if job is None:
+                if options["once"]:
+                    break
+                time.sleep(options["poll"])
+                continue
+
+            self.stdout.write(f"{job}: started")
+            started = time.monotonic()
+            job = run_export_job(job)
+            elapsed = time.monotonic() - started
+            if job.status == job.Status.DONE:
+                self.stdout.write(self.style.SUCCESS(f"{job}: {job.done} files in {elapsed:.1f}s"))
+            else:
+                self.stderr.write(f"{job}: {job.error}")
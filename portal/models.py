@@ -1,3 +1,108 @@
+from django.conf import settings
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
-# Create your models here.
+from schools.models import School
+
+
+class IdempotencyKey(models.Model):
+    """
+    Stored response of a write request sent with an Idempotency-Key header,
+    so a retry of the same request gets the same response without redoing
+    the write. status_code is null while the first request is still running.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="idempotency_keys"
+    )
+    key = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    content_type = models.CharField(max_length=100, blank=True)
+    body = models.BinaryField(blank=True, default=b"")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ("user", "key")
+
+    def __str__(self):
+        return f"{self.user} - {self.key}"
+
+
+class ExportJob(models.Model):
+    """
+    A PDF export (class or school ZIP) queued by a user and built by the
+    export_worker command instead of inside a web request. The finished
+    ZIP is kept in the database (ExportChunk) until EXPORT_RETENTION_HOURS
+    have passed, so the worker need not share a disk with the web service.
+    """
+
+    class Kind(models.TextChoices):
+        CLASS_REPORT_CARDS = "class_report_cards", "Class report cards"
+        CLASS_CUMULATIVE = "class_cumulative", "Class cumulative results"
+        SCHOOL_REPORT_CARDS = "school_report_cards", "School report cards"
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        RUNNING = "running", "Running"
+        DONE = "done", "Done"
+        FAILED = "failed", "Failed"
+
+    school = models.ForeignKey("schools.School", on_delete=models.CASCADE, related_name="export_jobs")
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="export_jobs"
+    )
+    kind = models.CharField(max_length=30, choices=Kind.choices)
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.QUEUED)
+
+    total = models.PositiveIntegerField(default=0)
+    done = models.PositiveIntegerField(default=0)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True)
+    filename = models.CharField(max_length=255, blank=True)
+    size = models.PositiveBigIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # Bumped by the worker as it goes; a running job that stops being bumped was orphaned
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["status", "created_at"])]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} #{self.pk} ({self.status})"
+
+
+class ExportChunk(models.Model):
+    """One piece of a finished export's ZIP, in order of index."""
+    job = models.ForeignKey(ExportJob, on_delete=models.CASCADE, related_name="chunks")
+    index = models.PositiveIntegerField()
+    data = models.BinaryField()
+
+    class Meta:
+        unique_together = ("job", "index")
+
+    def __str__(self):
+        return f"{self.job_id} #{self.index}"
+
+
+class ExportWorker(models.Model):
+    """
+    A running export_worker process, stamped every so often while it is up,
+    so the web side can tell queued exports that no worker will pick up.
+    """
+    name = models.CharField(max_length=255, unique=True)
+    seen_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name} (seen {self.seen_at:%Y-%m-%d %H:%M:%S})"
+
+
+@receiver([post_save, post_delete], sender=School)
+def invalidate_school_pdf_images(sender, instance, **kwargs):
+    from .pdf_assets import invalidate_school_images
+    invalidate_school_images(instance.pk)
@@ -0,0 +1,123 @@
+"""
+Process-level caches for the PDF generators.
+
+Paragraph styles are built once per process by paragraph_style() and
+shared by every document, as Paragraphs only read them. School images
+(logo, principal signature, stamp) are decoded once per process and
+scaled down to the size they are printed at; school_image() hands out
+flowables that share the decoded pixels, so a class of 60 report cards
+decodes each image once. Images are keyed by file path, which changes
+whenever a new file is uploaded, and a school's images are dropped when
+the School is saved or deleted.
+"""
+import logging
+from functools import lru_cache
+
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.lib.utils import ImageReader
+from reportlab.platypus.flowables import Flowable
+
+logger = logging.getLogger(__name__)
+
+# Images are scaled down to this resolution at their printed size
+IMAGE_DPI = 300
+
+_sample_styles = None
+# (school pk, field, width, height) -> (path, ImageReader or None when unreadable)
+_images = {}
+
+
+def sample_styles():
+    """ReportLab's sample style sheet, built once per process."""
+    global _sample_styles
+    if _sample_styles is None:
+        _sample_styles = getSampleStyleSheet()
+    return _sample_styles
+
+
+@lru_cache(maxsize=None)
+def _paragraph_style(name, parent, attrs):
+    return ParagraphStyle(name, parent=parent, **dict(attrs))
+
+
+def paragraph_style(name, parent=None, **attrs):
+    """A ParagraphStyle shared by every call with the same arguments."""
+    return _paragraph_style(name, parent, tuple(sorted(attrs.items())))
+
+
+class SchoolImage(Flowable):
+    """
+    Draws an already decoded ImageReader in a width x height box, filling
+    it or, when proportional, fitting inside it with the aspect ratio kept.
+    """
+
+    def __init__(self, reader, width, height, proportional=False):
+        Flowable.__init__(self)
+        self.reader = reader
+        if proportional:
+            image_width, image_height = reader.getSize()
+            factor = min(width / image_width, height / image_height)
+            width, height = image_width * factor, image_height * factor
+        self.drawWidth = width
+        self.drawHeight = height
+
+    def wrap(self, availWidth, availHeight):
+        return self.drawWidth, self.drawHeight
+
+    def draw(self):
+        self.canv.drawImage(self.reader, 0, 0, self.drawWidth, self.drawHeight, mask="auto")
+
+
+def _decode(path, width, height):
+    from PIL import Image as PILImage
+
+    image = PILImage.open(path)
+    image.load()
+    if image.mode not in ("RGB", "RGBA", "L"):
+        has_alpha = image.mode in ("LA", "PA") or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+    # Downscale only: a phone photo of a stamp does not need 4000 pixels
+    image.thumbnail((max(1, round(width / inch * IMAGE_DPI)), max(1, round(height / inch * IMAGE_DPI))))
+    reader = ImageReader(image)
+    reader.getRGBData()
+    return reader
+
+
+def _reader(school, field, width, height):
+    image_file = getattr(school, field, None)
+    path = getattr(image_file, "path", None) if image_file else None
+    if not path:
+        return None
+
+    key = (school.pk, field, width, height)
+    cached = _images.get(key)
+    if cached is not None and cached[0] == path:
+        return cached[1]
+
+    try:
+        reader = _decode(path, width, height)
+    except Exception as e:
+        # Remembered, so a class export does not retry a missing file per student
+        logger.warning("Could not load %s for school %s: %s", field, school.pk, e)
+        reader = None
+    _images[key] = (path, reader)
+    return reader
+
+
+def school_image(school, field, width, height, proportional=False, placeholder=None):
+    """
+    Flowable for the school's image field (logo, principal_signature or
+    stamp) in a width x height box; placeholder when the school has no
+    such image or it cannot be read.
+    """
+    reader = _reader(school, field, width, height)
+    if reader is None:
+        return placeholder
+    return SchoolImage(reader, width, height, proportional)
+
+
+def invalidate_school_images(school_id=None):
+    """Drops the decoded images of one school, or of every school."""
+    for key in [key for key in _images if school_id is None or key[0] == school_id]:
+        del _images[key]
@@ -0,0 +1,233 @@
+"""
+Content-addressed cache of generated PDFs.
+
+cached_pdf() wraps a PDF generator so that a call whose inputs have all
+been seen before returns the stored file instead of rendering again. The
+key is a SHA-256 of everything the generator reads: its arguments (model
+instances by their field values plus the few related values the
+generators print, plain data as is), the modification stamp of every
+school asset file (logo, signature, stamp) and the source of the
+generator and of any module it renders with, so a deploy that changes
+the layout starts a fresh cache.
+
+Entries are files under PDF_CACHE_DIR, capped at PDF_CACHE_MAX_MB and
+evicted least recently used first (a hit bumps the file's mtime).
+Setting PDF_CACHE_MAX_MB to 0 turns the cache off. Cache trouble is
+logged and never stops a PDF from being generated.
+"""
+import hashlib
+import importlib.util
+import inspect
+import json
+import logging
+import os
+import tempfile
+from datetime import date, datetime
+from decimal import Decimal
+from functools import wraps
+from io import BytesIO
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.db.models import Model
+from django.db.models.fields.files import FieldFile
+
+from academics.grading import CompiledGradingScale
+
+logger = logging.getLogger(__name__)
+
+# Trim to this share of the cap, so every write does not trigger a trim
+LOW_WATERMARK = 0.9
+
+# Values the generators print through a model's relations or properties,
+# which the model's own fields do not carry
+_MODEL_EXTRAS = {
+    "academics.SchoolClass": lambda obj: str(obj.form_teacher) if obj.form_teacher_id else None,
+    "students.Student": lambda obj: [obj.school_class.name if obj.school_class_id else None, obj.age],
+}
+
+_estimated_size = None
+
+
+def _max_bytes():
+    return int(getattr(settings, "PDF_CACHE_MAX_MB", 0)) * 1024 * 1024
+
+
+def _cache_dir():
+    return str(getattr(settings, "PDF_CACHE_DIR", ""))
+
+
+def _file_stamp(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return [path, None]
+    return [path, stat.st_size, stat.st_mtime_ns]
+
+
+def _canonical(value):
+    """value as plain JSON data that changes whenever what a PDF shows of it changes."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (Decimal, date, datetime)):
+        return str(value)
+    if isinstance(value, dict):
+        return [[str(key), _canonical(item)] for key, item in sorted(value.items(), key=lambda kv: str(kv[0]))]
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, FieldFile):
+        return _file_stamp(value.path) if value else None
+    if isinstance(value, SimpleNamespace):
+        items = vars(value)
+        if set(items) == {"path"}:
+            # An asset file handed over as a plain path (portal.report_cards.plain_school)
+            return _file_stamp(value.path)
+        return _canonical(items)
+    if isinstance(value, Model):
+        label = value._meta.label
+        fields = {field.attname: getattr(value, field.attname) for field in value._meta.concrete_fields}
+        extra = _MODEL_EXTRAS.get(label)
+        return [label, _canonical(fields), _canonical(extra(value)) if extra else None]
+    if isinstance(value, CompiledGradingScale):
+        return ["scale", _canonical(value.bands), value.pass_mark]
+    return [type(value).__name__, str(value)]
+
+
+def _source_hash(fn, modules=()):
+    digest = hashlib.sha256()
+    paths = [inspect.getsourcefile(fn)] + [importlib.util.find_spec(name).origin for name in modules]
+    for path in paths:
+        with open(path, "rb") as source:
+            digest.update(source.read())
+    try:
+        from reportlab import Version
+        digest.update(Version.encode())
+    except ImportError:
+        pass
+    return digest.hexdigest()
+
+
+def _path(key):
+    return os.path.join(_cache_dir(), key[:2], f"{key}.pdf")
+
+
+def _read(key):
+    path = _path(key)
+    try:
+        with open(path, "rb") as cached:
+            data = cached.read()
+        os.utime(path)
+    except FileNotFoundError:
+        return None
+    return data
+
+
+def _cache_entries():
+    for root, _, files in os.walk(_cache_dir()):
+        for name in files:
+            if not name.endswith(".pdf"):
+                continue  # a write still in progress
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            yield stat.st_mtime, stat.st_size, path
+
+
+def trim_pdf_cache(max_bytes=None):
+    """
+    Deletes least recently used entries until the cache is under the low
+    watermark of its cap. Returns the size left in bytes.
+    """
+    global _estimated_size
+    max_bytes = _max_bytes() if max_bytes is None else max_bytes
+    entries = sorted(_cache_entries())
+    size = sum(entry_size for _, entry_size, _ in entries)
+    if size > max_bytes:
+        target = max_bytes * LOW_WATERMARK
+        for _, entry_size, path in entries:
+            if size <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+    _estimated_size = size
+    return size
+
+
+def _write(key, data):
+    global _estimated_size
+    path = _path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    handle, partial = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+    try:
+        with os.fdopen(handle, "wb") as out:
+            out.write(data)
+        os.replace(partial, path)
+    except BaseException:
+        os.remove(partial)
+        raise
+
+    # The size is tracked per process and corrected by a full scan whenever
+    # it says the cap has been passed
+    if _estimated_size is None:
+        trim_pdf_cache()
+    else:
+        _estimated_size += len(data)
+        if _estimated_size > _max_bytes():
+            trim_pdf_cache()
+
+
+def cached_pdf(implicit=None, modules=()):
+    """
+    Decorator for a PDF generator returning a BytesIO. Calls with the same
+    inputs return a BytesIO of the cached file. implicit(arguments), when
+    given, returns whatever else the generator reads for these arguments
+    (e.g. a school's grading scale when none is passed), to be keyed too.
+    modules names other modules whose source decides the output. The
+    wrapper's key(*args, **kwargs) returns a call's cache key.
+    """
+    def decorate(fn):
+        return _cached(fn, implicit, modules)
+    return decorate
+
+
+def _cached(fn, implicit, modules):
+    signature = inspect.signature(fn)
+    version = f"{fn.__module__}.{fn.__qualname__}:{_source_hash(fn, modules)}"
+
+    def key(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        inputs = [bound.arguments, implicit(bound.arguments) if implicit else None]
+        payload = json.dumps([version, _canonical(inputs)], separators=(",", ":"))
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        if _max_bytes() <= 0:
+            return fn(*args, **kwargs)
+
+        try:
+            key = wrapper.key(*args, **kwargs)
+            data = _read(key)
+        except Exception:
+            logger.exception("PDF cache lookup failed for %s", fn.__name__)
+            return fn(*args, **kwargs)
+        if data is not None:
+            return BytesIO(data)
+
+        pdf_buffer = fn(*args, **kwargs)
+        try:
+            _write(key, pdf_buffer.getvalue())
+        except Exception:
+            logger.exception("PDF cache write failed for %s", fn.__name__)
+        return pdf_buffer
+
+    wrapper.uncached = fn
+    # Changes whenever the PDF for these arguments would, so it can serve as an ETag
+    wrapper.key = key
+    return wrapper
@@ -0,0 +1,733 @@
+"""
+Fixed layout renderer for student report cards.
+
+generate_student_result_pdf() lays its page out with Platypus: nested
+Tables and Paragraphs that are measured, wrapped and split for every
+card. The page is always the same A4 sheet, so this module draws it
+straight onto the canvas instead, at positions worked out once from that
+layout (its margins, paddings, column widths and row heights). Only what
+varies per card is measured: how many subject and grading key rows
+there are, and where the few free text paragraphs wrap.
+
+Text, rules and fills are written as PDF operators and handed to the
+canvas in one piece (Canvas.addLiteral), which skips ReportLab's per-call
+number formatting and text encoding; images and any text outside plain
+ASCII still go through the canvas API.
+
+Sections flow down the page as the story's flowables would, so a card
+with many subjects breaks onto a second page where Platypus breaks it:
+tables between rows, paragraphs between lines, anything else moved whole.
+
+render_report_card() returns None for a card it cannot draw exactly as
+the flowing layout would (a section taller than a page, a word wider
+than its column, a line that only fits by squeezing its spaces, or text
+holding Paragraph markup), and the caller renders that card with
+Platypus.
+"""
+import copy
+import re
+from collections import deque
+from functools import lru_cache
+from io import BytesIO
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.rl_accel import fp_str
+from reportlab.lib.units import inch
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.rl_config import _FUZZ, spaceShrinkage
+
+from .pdf_assets import school_image
+from .result_pdf_generator import RESULTS_COL_WIDTHS, RESULTS_HEADER, draw_watermark
+
+REGULAR = 'Helvetica'
+BOLD = 'Helvetica-Bold'
+BOLD_OBLIQUE = 'Helvetica-BoldOblique'
+
+NAVY = colors.HexColor('#000080')
+MAROON = colors.HexColor('#800000')
+TEXT = colors.HexColor('#333333')
+BLACK = colors.HexColor('#000000')
+STRIPE = colors.HexColor('#f5f5f5')
+
+# The flowing layout's frame: page margins plus Frame's 6pt padding
+FRAME_LEFT = 0.4*inch + 6
+FRAME_WIDTH = A4[0] - 0.8*inch - 12
+FRAME_TOP = A4[1] - 0.3*inch - 6
+FRAME_BOTTOM = 0.3*inch + 6
+
+# Table cell defaults
+PADDING = 6
+V_PADDING = 3
+LEADING = 12
+
+# Paragraph markup (tags and entities) that Platypus would interpret
+_MARKUP = re.compile(r'<|&(#\d+|#x[0-9a-fA-F]+|\w+);')
+# Text that can go into a content stream as is
+_PLAIN_TEXT = re.compile(r'[ -~]*')
+
+
+class DoesNotFit(Exception):
+    """The card cannot be drawn exactly as the flowing layout draws it."""
+
+
+@lru_cache(maxsize=4096)
+def _width(text, font, size):
+    return stringWidth(text, font, size)
+
+
+# Formatted as ReportLab formats them, so text lands on the same pixels;
+# positions repeat from card to card, so their formatting is cached too
+@lru_cache(maxsize=8192)
+def _num(value):
+    return fp_str(value)
+
+
+@lru_cache(maxsize=64)
+def _rgb(rgb):
+    return ' '.join(_num(part) for part in rgb)
+
+
+def _colour(color):
+    return _rgb(color.rgb())
+
+
+def _words(runs):
+    """Splits [(font, text)] runs into words, each a list of (font, text) pieces."""
+    words = []
+    joined = False  # the next piece continues the last word
+    for font, text in runs:
+        if _MARKUP.search(text):
+            raise DoesNotFit
+        parts = text.split()
+        if not parts:
+            joined = joined and not text
+            continue
+        if text[0].isspace():
+            joined = False
+        for i, part in enumerate(parts):
+            if i == 0 and joined and words:
+                words[-1].append((font, part))
+            else:
+                words.append([(font, part)])
+        joined = not text[-1].isspace()
+    return words
+
+
+def _lines(runs, width, size):
+    """
+    Breaks runs into lines no wider than width as Paragraph.breakLines
+    does, as [(line_width, [(font, text)])].
+    """
+    lines = []
+    pieces, line_width, spaces = [], 0, 0
+    space = _width(' ', REGULAR, size)
+    for word in _words(runs):
+        word_width = sum(_width(text, font, size) for font, text in word)
+        if word_width > width:
+            raise DoesNotFit  # Platypus would split the word
+        if not pieces:
+            pieces, line_width = list(word), word_width
+            continue
+        new_width = line_width + space + word_width
+        if new_width > width:
+            # Platypus squeezes spaces by up to spaceShrinkage to fit a word
+            if new_width <= width + (spaces + 1) * space * spaceShrinkage + _FUZZ:
+                raise DoesNotFit
+            lines.append((line_width, pieces))
+            pieces, line_width, spaces = list(word), word_width, 0
+            continue
+        font, text = pieces[-1]
+        if word[0][0] == font:
+            pieces[-1] = (font, f'{text} {word[0][1]}')
+            pieces.extend(word[1:])
+        else:
+            pieces[-1] = (font, f'{text} ')
+            pieces.extend(word)
+        line_width, spaces = new_width, spaces + 1
+    if pieces:
+        lines.append((line_width, pieces))
+    return lines
+
+
+class _Page:
+    """
+    PDF operators for one page, buffered and passed to the canvas in one
+    piece. Runs of text share one text object and set the font only when
+    it changes.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.ops = []
+        self.fonts = {}
+        self.fill = colors.black
+        self.text_font = None  # (resource, size) inside an open text object
+
+    def end_text(self):
+        if self.text_font:
+            self.ops.append('ET')
+            self.text_font = None
+
+    def flush(self):
+        self.end_text()
+        if self.ops:
+            self.canvas.addLiteral('\n'.join(self.ops))
+            self.ops = []
+
+    def set_fill(self, color):
+        self.fill = color
+        self.ops.append(f'{_colour(color)} rg')
+
+    def rect(self, x, y, width, height):
+        self.end_text()
+        self.ops.append(f'{_num(x)} {_num(y)} {_num(width)} {_num(height)} re f')
+
+    def lines(self, segments, weight, color):
+        self.end_text()
+        ops = [f'q 1 J 1 j {_num(weight)} w {_colour(color)} RG']
+        for x0, y0, x1, y1 in segments:
+            ops.append(f'{_num(x0)} {_num(y0)} m {_num(x1)} {_num(y1)} l S')
+        ops.append('Q')
+        self.ops.extend(ops)
+
+    def text(self, x, y, text, font, size):
+        if not text:
+            return
+        if not _PLAIN_TEXT.fullmatch(text):
+            # Let ReportLab encode it (and substitute fonts for missing glyphs)
+            self.flush()
+            self.canvas.saveState()
+            self.canvas.setFillColor(self.fill)
+            self.canvas.setFont(font, size)
+            self.canvas.drawString(x, y, text)
+            self.canvas.restoreState()
+            return
+        resource = self.fonts.get(font)
+        if resource is None:
+            resource = self.fonts[font] = self.canvas._doc.getInternalFontName(font)
+        if self.text_font != (resource, size):
+            if not self.text_font:
+                self.ops.append('BT')
+            self.ops.append(f'{resource} {_num(size)} Tf')
+            self.text_font = (resource, size)
+        text = text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+        self.ops.append(f'1 0 0 1 {_num(x)} {_num(y)} Tm ({text}) Tj')
+
+    def centred(self, x, y, text, font, size):
+        self.text(x - _width(text, font, size) / 2, y, text, font, size)
+
+    def image(self, flowable, x, y):
+        self.flush()
+        flowable.drawOn(self.canvas, x, y)
+
+
+class Para:
+    """A wrapped paragraph: lines of (font, text) pieces in one size and colour."""
+
+    def __init__(self, runs, width, size, color, leading=LEADING, align='LEFT'):
+        self.lines = _lines(runs, width, size)
+        self.width = width
+        self.size = size
+        self.color = color
+        self.leading = leading
+        self.align = align
+        self.height = len(self.lines) * leading
+
+    def part(self, start, end):
+        """The paragraph cut down to lines start to end - 1, as Paragraph.split leaves it."""
+        part = copy.copy(self)
+        part.lines = self.lines[start:end]
+        part.height = len(part.lines) * self.leading
+        return part
+
+    def draw(self, page, x, top):
+        """Draws the paragraph with its top left corner at (x, top)."""
+        if not self.lines:
+            return
+        page.set_fill(self.color)
+        y = top - self.size
+        for line_width, pieces in self.lines:
+            if self.align == 'CENTER':
+                left = x + (self.width - line_width) / 2
+            elif self.align == 'RIGHT':
+                left = x + self.width - line_width
+            else:
+                left = x
+            for font, text in pieces:
+                page.text(left, y, text, font, self.size)
+                left += _width(text, font, self.size)
+            y -= self.leading
+
+
+def _plain(text):
+    return [(REGULAR, str(text))]
+
+
+def _labelled(label, value):
+    return [(BOLD, label), (REGULAR, f' {value}')]
+
+
+def _edges(start, sizes):
+    edges = [start]
+    for size in sizes:
+        edges.append(edges[-1] + size)
+    return edges
+
+
+def _centered(table_width):
+    return FRAME_LEFT + (FRAME_WIDTH - table_width) / 2
+
+
+def _fill_row(page, xs, ys, row, color):
+    """Fills a table row; ys are row edges from the top down."""
+    page.set_fill(color)
+    page.rect(xs[0], ys[row + 1], xs[-1] - xs[0], ys[row] - ys[row + 1])
+
+
+def _stripes(page, xs, ys, first, colours):
+    for row in range(first, len(ys) - 1):
+        _fill_row(page, xs, ys, row, colours[(row - first) % len(colours)])
+
+
+def _grid(page, xs, ys, weight=0.5, color=colors.grey):
+    segments = [(xs[0], y, xs[-1], y) for y in ys] + [(x, ys[0], x, ys[-1]) for x in xs]
+    page.lines(segments, weight, color)
+
+
+def _cell_text(page, value, x0, x1, bottom, height, align, valign, font, padding=V_PADDING, size=7):
+    """A plain string table cell, as Table._drawCell draws one."""
+    values = str(value).split('\n')
+    if valign == 'MIDDLE':
+        y = bottom + (height + len(values) * LEADING) / 2 - size
+    else:  # BOTTOM
+        y = bottom + padding + len(values) * LEADING - size
+    for text in values:
+        if align == 'CENTER':
+            page.centred((x0 + x1) / 2, y, text, font, size)
+        else:
+            page.text(x0 + PADDING, y, text, font, size)
+        y -= LEADING
+
+
+def _text_rows(rows, padding):
+    return [max(str(value).count('\n') + 1 for value in row) * LEADING + 2 * padding for row in rows]
+
+
+class _Block:
+    """
+    One flowable of the story: its height, the space Platypus keeps
+    before and after it, and how to draw it with its top at a given y.
+    Blocks that Platypus would break across pages override split().
+    """
+    postponed = False
+
+    def __init__(self, height, draw=None, space_before=0, space_after=0):
+        self.height = height
+        self._draw = draw
+        self.space_before = space_before
+        self.space_after = space_after
+
+    def draw(self, top):
+        if self._draw:
+            self._draw(top)
+
+    def split(self, height):
+        """The parts to put in height and after it, as Flowable.split returns them."""
+        return []
+
+
+class _ParaBlock(_Block):
+    """A frame wide paragraph, split between lines as Paragraph.split does."""
+
+    def __init__(self, page, para, space_before=0, space_after=0):
+        super().__init__(para.height, space_before=space_before, space_after=space_after)
+        self.page = page
+        self.para = para
+
+    def draw(self, top):
+        self.para.draw(self.page, FRAME_LEFT, top)
+
+    def split(self, height):
+        count = len(self.para.lines)
+        fits = int(height / self.para.leading)
+        # No orphans: a single line is not left at the foot of a page
+        if not count or height < _FUZZ or fits <= 1:
+            return []
+        if count <= fits:
+            return [self]
+        return [
+            _ParaBlock(self.page, self.para.part(0, fits), self.space_before, self.space_after),
+            _ParaBlock(self.page, self.para.part(fits, count), self.space_before, self.space_after),
+        ]
+
+
+class _RowsBlock(_Block):
+    """
+    A table split between rows as Table.split does; draw_rows(top, first,
+    last) draws rows first to last - 1 as a table of their own.
+    """
+
+    def __init__(self, heights, draw_rows, first=0, last=None):
+        self.heights = heights
+        self.draw_rows = draw_rows
+        self.first = first
+        self.last = len(heights) if last is None else last
+        super().__init__(sum(heights[self.first:self.last]))
+
+    def draw(self, top):
+        self.draw_rows(top, self.first, self.last)
+
+    def split(self, height):
+        used = fits = 0
+        for row_height in self.heights[self.first:self.last]:
+            if used + row_height > height:
+                break
+            used += row_height
+            fits += 1
+        if not fits:
+            return []
+        if fits == self.last - self.first:
+            return [self]
+        middle = self.first + fits
+        return [
+            _RowsBlock(self.heights, self.draw_rows, self.first, middle),
+            _RowsBlock(self.heights, self.draw_rows, middle, self.last),
+        ]
+
+
+def _spacer(height):
+    return _Block(height)
+
+
+class _Layout:
+    """
+    Builds the report card sections as blocks and flows them down the
+    frame like Platypus: each block goes where it fits, is split when it
+    does not, and otherwise moves to a new page.
+    """
+
+    def __init__(self, page, school, content):
+        self.page = page
+        self.school = school
+        self.content = content
+
+    def paragraph(self, para, space_before=0, space_after=0):
+        return _ParaBlock(self.page, para, space_before, space_after)
+
+    def header(self):
+        content = self.content
+        widths = [1*inch, 5*inch, 1*inch]
+        xs = _edges(_centered(sum(widths)), widths)
+
+        logo = school_image(self.school, 'logo', 0.8*inch, 0.8*inch)
+        logo_placeholder = None if logo else Para([(BOLD, '🏫')], widths[0] - 2*PADDING, 14, NAVY, 22, 'CENTER')
+        logo_height = logo.drawHeight if logo else logo_placeholder.height
+
+        inner = widths[1] - 2*PADDING
+        name = Para([(BOLD, content.school_name)], inner, 14, NAVY, 22, 'CENTER')
+        address = Para(_plain(content.school_address), inner, 8, TEXT, LEADING, 'CENTER')
+        motto = Para([(BOLD_OBLIQUE, content.motto)], inner, 9, MAROON, LEADING, 'CENTER')
+        info_height = name.height + 2 + address.height + 1 + motto.height
+
+        photo = Para(_plain('👤'), widths[2] - 2*PADDING, 24, colors.black, LEADING, 'CENTER')
+
+        height = max(logo_height, info_height, photo.height) + 2*V_PADDING
+
+        def draw(top):
+            bottom = top - height
+            if logo:
+                self.page.image(logo, xs[0] + PADDING, bottom + (height - logo_height) / 2)
+            else:
+                logo_placeholder.draw(self.page, xs[0] + PADDING, bottom + (height + logo_height) / 2)
+            top = bottom + (height + info_height) / 2
+            name.draw(self.page, xs[1] + PADDING, top)
+            top -= name.height + 2
+            address.draw(self.page, xs[1] + PADDING, top)
+            top -= address.height + 1
+            motto.draw(self.page, xs[1] + PADDING, top)
+            photo.draw(self.page, xs[2] + PADDING, bottom + (height + photo.height) / 2)
+
+        return [_Block(height, draw)]
+
+    def title(self):
+        # Heading2's spaceBefore and spaceAfter
+        title = Para([(BOLD, self.content.title)], FRAME_WIDTH, 11, BLACK, 18, 'CENTER')
+        return [self.paragraph(title, space_before=12, space_after=6)]
+
+    def student_info(self):
+        content = self.content
+        width = 3.5*inch
+        xs = _edges(_centered(2 * width), [width, width])
+        inner = width - 2*PADDING
+        cells = [
+            [_labelled('NAME:', content.student_name), _labelled('GENDER:', content.gender)],
+            [_labelled('CLASS:', content.class_name), _labelled('AGE:', content.age)],
+            [_labelled('ADMISSION NUMBER:', content.admission),
+             _labelled('ATTENDANCE:', f'{content.attendance}   ') + _labelled('Class Position:', content.position)],
+            [_labelled('SESSION:', content.session_name), _labelled('CLASS POPULATION:', content.class_population)],
+        ]
+        rows = [[Para(runs, inner, 9, TEXT) for runs in row] for row in cells]
+        heights = [max(para.height for para in paras) + 4 for paras in rows]
+
+        def draw_rows(top, first, last):
+            for paras, height in zip(rows[first:last], heights[first:last]):
+                bottom = top - height
+                for x, para in zip(xs, paras):
+                    para.draw(self.page, x + PADDING, bottom + (height + para.height) / 2)
+                top = bottom
+
+        return [_RowsBlock(heights, draw_rows)]
+
+    def rule(self):
+        # HRFlowable: spaceBefore 1, one point high, spaceAfter 1
+        def draw(top):
+            self.page.lines([(FRAME_LEFT, top - 1, FRAME_LEFT + FRAME_WIDTH, top - 1)], 1, MAROON)
+
+        return [_Block(1, draw, space_before=1, space_after=1)]
+
+    def results(self):
+        page = self.page
+        rows = [RESULTS_HEADER] + self.content.results
+        heights = _text_rows(rows[:1], 4) + _text_rows(rows[1:], 2)
+        xs = _edges(_centered(sum(RESULTS_COL_WIDTHS)), RESULTS_COL_WIDTHS)
+
+        def draw_rows(top, first, last):
+            # Each part of a split table starts its stripes afresh
+            ys = _edges(top, [-h for h in heights[first:last]])
+            data = 1 if first == 0 else 0
+            if data:
+                _fill_row(page, xs, ys, 0, NAVY)
+            _stripes(page, xs, ys, data, [colors.white, STRIPE])
+            if len(ys) - 1 > data:
+                page.set_fill(colors.HexColor('#ffffcc'))
+                page.rect(xs[4], ys[-1], xs[5] - xs[4], ys[data] - ys[-1])
+
+            for index in range(first, last):
+                if index < 2:
+                    page.set_fill(colors.whitesmoke if index == 0 else colors.black)
+                elif index == first:
+                    page.set_fill(colors.black)
+                bottom = ys[index - first + 1]
+                for col, value in enumerate(rows[index]):
+                    if index == 0:
+                        _cell_text(page, value, xs[col], xs[col + 1], bottom, heights[0], 'CENTER', 'MIDDLE', BOLD)
+                    else:
+                        _cell_text(page, value, xs[col], xs[col + 1], bottom, heights[index],
+                                   'LEFT' if col == 0 else 'CENTER', 'MIDDLE', BOLD if col == 4 else REGULAR)
+            _grid(page, xs, ys)
+
+        return [_RowsBlock(heights, draw_rows)]
+
+    def summary(self):
+        content = self.content
+        widths = [1.2*inch, 0.9*inch, 1.3*inch, 1.5*inch, 1.3*inch, 0.8*inch]
+        xs = _edges(_centered(sum(widths)), widths)
+        cells = [
+            [(BOLD, 'TERM AVERAGE')],
+            _plain(f'Subjects: {content.subject_count}'),
+            _labelled('CUMULATIVE:', f'{content.cumulative_total:.2f}'),
+            _labelled('MAXIMUM OBTAINABLE:', content.max_obtainable),
+            _labelled('AVERAGE SCORE:', f'{content.average_score:.2f}'),
+            [(BOLD, str(content.average_grade))],
+        ]
+        paras = [Para(runs, width - 2*PADDING, 8, TEXT) for runs, width in zip(cells, widths)]
+        height = max(para.height for para in paras) + 8
+
+        def draw(top):
+            ys = [top, top - height]
+            _fill_row(self.page, xs, ys, 0, colors.HexColor('#e8e8e8'))
+            for x, para in zip(xs, paras):
+                para.draw(self.page, x + PADDING, ys[1] + (height + para.height) / 2)
+            _grid(self.page, xs, ys)
+
+        return [_Block(height, draw)]
+
+    def _key_table(self, x, top, rows, widths, header_color, stripe):
+        """One of the affective, psychomotor and grading key tables."""
+        page = self.page
+        heights = _text_rows(rows, 2)
+        xs = _edges(x, widths)
+        ys = _edges(top, [-h for h in heights])
+        _fill_row(page, xs, ys, 0, header_color)
+        _stripes(page, xs, ys, 1, [colors.white, stripe])
+        for index, row in enumerate(rows):
+            if index < 2:
+                page.set_fill(colors.whitesmoke if index == 0 else colors.black)
+            for col, value in enumerate(row):
+                _cell_text(page, value, xs[col], xs[col + 1], ys[index + 1], heights[index],
+                           'CENTER' if col == 1 else 'LEFT', 'BOTTOM', BOLD if index == 0 else REGULAR, padding=2)
+        _grid(page, xs, ys)
+
+    def traits(self):
+        content = self.content
+        tables = [
+            ([('AFFECTIVE TRAITS', 'RATING')] + content.affective_items, [1.5*inch, 0.5*inch], NAVY, STRIPE),
+            ([('PSYCHOMOTOR TRAITS', 'RATING')] + content.psychomotor_items, [1.5*inch, 0.5*inch], NAVY, STRIPE),
+            ([('KEY TO GRADING',)] + [(row,) for row in content.grading_key], [2*inch], MAROON,
+             colors.HexColor('#fff5f5')),
+        ]
+        column = 2.2*inch
+        xs = _edges(_centered(3 * column), [column] * 3)
+        height = max(sum(_text_rows(rows, 2)) for rows, _, _, _ in tables) + 2*V_PADDING
+
+        def draw(top):
+            for x, (rows, widths, header_color, stripe) in zip(xs, tables):
+                self._key_table(x + (column - sum(widths)) / 2, top - V_PADDING, rows, widths, header_color, stripe)
+
+        return [_Block(height, draw)]
+
+    def next_term(self):
+        content = self.content
+        width = 3.5*inch
+        xs = _edges(_centered(2 * width), [width, width])
+        paras = [
+            Para(_labelled('Next Begins:', content.next_term_date), width - 2*PADDING, 9, TEXT),
+            Para([(BOLD, str(content.promotion_status))], width - 2*PADDING, 10, colors.black, align='CENTER'),
+        ]
+        height = max(para.height for para in paras) + 12
+        promoted = content.promotion_status == 'PROMOTED'
+
+        def draw(top):
+            ys = [top, top - height]
+            self.page.set_fill(colors.HexColor('#ccffcc') if promoted else colors.HexColor('#ffcccc'))
+            self.page.rect(xs[1], ys[1], width, height)
+            for x, para in zip(xs, paras):
+                para.draw(self.page, x + PADDING, ys[1] + (height + para.height) / 2)
+            _grid(self.page, xs, ys)
+
+        return [_Block(height, draw)]
+
+    def comments(self):
+        content = self.content
+        comment = lambda runs: self.paragraph(Para(runs, FRAME_WIDTH, 9, TEXT))
+
+        widths = [3*inch, 1.5*inch, 1.5*inch]
+        xs = _edges(_centered(sum(widths)), widths)
+        teacher = Para(_labelled('Class Teacher:', content.teacher_name), widths[0] - 2*PADDING, 9, TEXT)
+        height = max(teacher.height, LEADING) + 2*V_PADDING
+
+        def draw_teacher(top):
+            bottom = top - height
+            teacher.draw(self.page, xs[0] + PADDING, bottom + V_PADDING + teacher.height)
+            self.page.lines([(xs[2], bottom, xs[3], bottom)], 1, colors.black)
+
+        return [
+            comment(_labelled("CLASS TEACHER'S COMMENT:", content.teacher_comment)),
+            _spacer(0.05*inch) if content.teacher_comment else comment(_plain('Keep it up.')),
+            _spacer(0.05*inch),
+            _Block(height, draw_teacher),
+            _spacer(0.15*inch),
+            comment(_labelled("PRINCIPAL'S COMMENT:", content.principal_comment)),
+            _spacer(0.05*inch),
+        ]
+
+    def signatures(self):
+        page = self.page
+        widths = [2.2*inch, 2.3*inch, 2.5*inch]
+        xs = _edges(_centered(sum(widths)), widths)
+        signature = school_image(self.school, 'principal_signature', 1.5*inch, 0.5*inch, proportional=True)
+        stamp = school_image(self.school, 'stamp', 0.8*inch, 0.8*inch, proportional=True)
+        stamp_label = None if stamp else Para(_plain('Stamp'), widths[2] - 2*PADDING, 8, colors.black, align='RIGHT')
+
+        # The middle column's 10pt top padding sets the height of otherwise short rows
+        spacer = LEADING + 10 + V_PADDING
+        first = max(
+            signature.drawHeight + 2*V_PADDING if signature else 2*V_PADDING,
+            spacer,
+            stamp.drawHeight + 2*V_PADDING if stamp else stamp_label.height + 2*V_PADDING,
+        )
+        labels = [Para([(BOLD, "Principal's Signature")], widths[0] - 2*PADDING, 9, TEXT),
+                  Para([(BOLD, 'Official Stamp')], widths[2] - 2*PADDING, 9, TEXT)]
+        second = max(max(label.height for label in labels) + 2*V_PADDING, spacer)
+
+        def draw_rows(top, first_row, last_row):
+            if first_row == 0:
+                bottom = top - first
+                if signature:
+                    page.image(signature, xs[0] + PADDING, bottom + V_PADDING)
+                if stamp:
+                    page.image(stamp, xs[3] - PADDING - stamp.drawWidth, bottom + V_PADDING)
+                else:
+                    stamp_label.draw(page, xs[2] + PADDING, bottom + V_PADDING + stamp_label.height)
+                page.lines([(xs[0], bottom, xs[1], bottom)], 1, colors.black)
+                top = bottom
+            if last_row == 2:
+                bottom = top - second
+                labels[0].draw(page, xs[0] + PADDING, bottom + V_PADDING + labels[0].height)
+                labels[1].draw(page, xs[2] + PADDING, bottom + V_PADDING + labels[1].height)
+                if first_row == 1:
+                    # Table.split repeats a line below the last row kept as a line above the rest
+                    page.lines([(xs[0], top, xs[1], top)], 1, colors.black)
+
+        return [_RowsBlock([first, second], draw_rows)]
+
+    def story(self):
+        return [
+            *self.header(), _spacer(0.1*inch),
+            *self.title(), _spacer(0.1*inch),
+            *self.student_info(), _spacer(0.1*inch),
+            *self.rule(), _spacer(0.05*inch),
+            *self.results(), _spacer(0.1*inch),
+            *self.summary(), _spacer(0.15*inch),
+            *self.traits(), _spacer(0.15*inch),
+            *self.next_term(), _spacer(0.15*inch),
+            *self.comments(),
+            *self.signatures(),
+        ]
+
+    def new_page(self):
+        self.page.flush()
+        self.page.canvas.showPage()
+        draw_watermark(self.page.canvas, None)
+
+    def draw(self):
+        """
+        Flows the story as Frame.add and handle_flowable do: space before a
+        block is dropped at the top of a page and overlaps the space after
+        the block above it.
+        """
+        blocks = deque(self.story())
+        y, at_top, space_after = FRAME_TOP, True, 0
+        while blocks:
+            block = blocks.popleft()
+            space = 0 if at_top else max(block.space_before - space_after, 0)
+            available = y - FRAME_BOTTOM - space
+            if available <= 0 or y - space - block.height < FRAME_BOTTOM - _FUZZ:
+                parts = block.split(available) if available > 0 else []
+                if not parts:
+                    if block.postponed or at_top:
+                        raise DoesNotFit  # taller than a whole page
+                    block.postponed = True
+                    blocks.appendleft(block)
+                    self.new_page()
+                    y, at_top, space_after = FRAME_TOP, True, 0
+                    continue
+                block = parts[0]
+                if y - space - block.height < FRAME_BOTTOM - _FUZZ:
+                    raise DoesNotFit
+                blocks.extendleft(reversed(parts[1:]))
+            block.draw(y - space)
+            new_y = y - space - block.height - block.space_after
+            at_top = at_top and new_y == y
+            y, space_after = new_y, block.space_after
+        self.page.flush()
+
+
+def render_report_card(school, content):
+    """
+    The report card for report_card_content() as a PDF in a BytesIO, or
+    None when it has to go through the flowing layout.
+    """
+    pdf_buffer = BytesIO()
+    canvas = Canvas(pdf_buffer, pagesize=A4)
+    draw_watermark(canvas, None)
+    try:
+        _Layout(_Page(canvas), school, content).draw()
+    except DoesNotFit:
+        return None
+    canvas.showPage()
+    canvas.save()
+    pdf_buffer.seek(0)
+    return pdf_buffer
@@ -0,0 +1,234 @@
+"""
+Rendering many student report cards at once.
+
+Everything a report card shows is gathered in the calling process with
+one query per table (academics.publishing.build_class_snapshots) and
+turned into plain, picklable data; the export worker and management
+commands then build the PDFs in a process pool, so a big class uses every
+core. Pool workers never touch the database. Web requests render with
+workers=1: forking inside a gunicorn worker, and closing its database
+connections, is not safe mid-request.
+"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import connections
+
+from academics.grading import CompiledGradingScale, get_grading_scale
+from academics.publishing import build_class_snapshots
+from .result_pdf_generator import generate_student_result_pdf
+
+
+def _file(field):
+    return SimpleNamespace(path=field.path) if field else None
+
+
+def plain_school(school):
+    """The School fields a report card uses, without the ORM object."""
+    return SimpleNamespace(
+        pk=school.pk,
+        name=school.name,
+        address=school.address,
+        motto=school.motto,
+        logo=_file(school.logo),
+        principal_signature=_file(school.principal_signature),
+        stamp=_file(school.stamp),
+        report_card_layout=school.report_card_layout,
+    )
+
+
+def published_school(data, school):
+    """
+    plain_school() as it was when the snapshot was published. Snapshots
+    from before the school was stored fall back to the live School row.
+    """
+    published = data.get('school')
+    if published is None:
+        return plain_school(school)
+
+    def asset(name):
+        return SimpleNamespace(path=default_storage.path(name)) if name else None
+
+    return SimpleNamespace(
+        pk=school.pk,
+        name=published['name'],
+        address=published['address'],
+        motto=published['motto'],
+        logo=asset(published['logo']),
+        principal_signature=asset(published['principal_signature']),
+        stamp=asset(published['stamp']),
+        report_card_layout=published['report_card_layout'],
+    )
+
+
+def published_class(data, school_class):
+    """plain_class() as it was when the snapshot was published."""
+    published = data['school_class']
+    if 'form_teacher' not in published:
+        return plain_class(school_class)
+    return SimpleNamespace(name=published['name'], form_teacher=published['form_teacher'])
+
+
+def plain_class(school_class):
+    """The SchoolClass fields a report card uses, without the ORM object."""
+    return SimpleNamespace(
+        name=school_class.name,
+        form_teacher=str(school_class.form_teacher) if school_class.form_teacher_id else None,
+    )
+
+
+def report_card_kwargs(data, school, school_class, grading_scale=None):
+    """
+    generate_student_result_pdf() arguments for a report card document as
+    built by build_class_snapshots() (or read back from a published
+    snapshot, where dates are ISO strings). Without a grading_scale the
+    scale stored in the document is used, so a published card is graded as
+    it was when published.
+    """
+    def namespace(row):
+        return SimpleNamespace(**row) if row else None
+
+    term_report = namespace(data['term_report'])
+    if term_report and isinstance(term_report.next_term_begins, str):
+        term_report.next_term_begins = date.fromisoformat(term_report.next_term_begins)
+
+    if grading_scale is None and data.get('grading_scale'):
+        grading_scale = CompiledGradingScale.from_data(data['grading_scale'])
+
+    student_data = dict(data['result'])
+    student_data['student_obj'] = namespace(data['student'])
+
+    return {
+        'school': school,
+        'school_class': school_class,
+        'academic_session': SimpleNamespace(**data['academic_session']),
+        'term': data['term'],
+        'student_data': student_data,
+        'subjects': [SimpleNamespace(name=name) for name in data['subjects']],
+        'attendance_data': namespace(data['attendance']),
+        'affective_traits': namespace(data['affective_traits']),
+        'psychomotor_traits': namespace(data['psychomotor_traits']),
+        'term_report': term_report,
+        'class_info': namespace(data['class_info']),
+        'all_term_results': data['all_term_results'],
+        'grading_scale': grading_scale,
+    }
+
+
+def report_card_filename(data):
+    student_name = data['result']['student'].replace(' ', '_')
+    admission_num = data['result']['admission'].replace(' ', '_').replace('/', '-')
+    return f"{student_name}_{admission_num}.pdf"
+
+
+def _render_report_card(job):
+    filename, kwargs = job
+    return filename, generate_student_result_pdf(**kwargs).getvalue()
+
+
+def _init_render_worker():
+    import django
+    django.setup()
+
+
+def render_workers():
+    return getattr(settings, 'REPORT_CARD_WORKERS', None) or os.cpu_count() or 1
+
+
+def iter_report_cards(jobs, workers=None):
+    """
+    Renders (filename, kwargs) jobs and yields (filename, pdf_bytes) in
+    job order as each one is ready, fanning out to a process pool when
+    there is more than one worker and more than one job. Only a few
+    report cards per worker are in flight at a time, so memory stays flat
+    however many jobs there are.
+    """
+    jobs = list(jobs)
+    workers = max(1, min(workers or render_workers(), len(jobs)))
+    if workers == 1:
+        for job in jobs:
+            yield _render_report_card(job)
+        return
+
+    # Forked workers must not share the parent's open socket
+    connections.close_all()
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_render_worker)
+    try:
+        pending = deque()
+        jobs = iter(jobs)
+        for job in jobs:
+            pending.append(pool.submit(_render_report_card, job))
+            if len(pending) >= workers * 2:
+                break
+        while pending:
+            result = pending.popleft().result()
+            job = next(jobs, None)
+            if job is not None:
+                pending.append(pool.submit(_render_report_card, job))
+            yield result
+    finally:
+        # Also reached when the client goes away mid-download
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def render_report_cards(jobs, workers=None):
+    """Renders (filename, kwargs) jobs and returns [(filename, pdf_bytes)] in job order."""
+    return list(iter_report_cards(jobs, workers))
+
+
+def class_report_card_jobs(school_class, academic_session, term):
+    """
+    Plain-data render jobs for every active student of the class, in
+    admission number order.
+    """
+    snapshots = build_class_snapshots(school_class, academic_session, term)
+    school = plain_school(school_class.school)
+    klass = plain_class(school_class)
+    scale = get_grading_scale(school_class.school_id)
+
+    documents = sorted(snapshots.values(), key=lambda data: data['student']['admission_number'])
+    return [
+        (report_card_filename(data), report_card_kwargs(data, school, klass, scale))
+        for data in documents
+    ]
+
+
+def iter_class_report_cards(school_class, academic_session, term, workers=None):
+    """
+    Every report card of the class as (filename, pdf_bytes) in admission
+    number order, rendered as they are consumed. The class data is loaded
+    before the first card is asked for.
+    """
+    return iter_report_cards(class_report_card_jobs(school_class, academic_session, term), workers)
+
+
+def iter_class_cumulative_pdfs(school_class, academic_session):
+    """
+    Every active student's cumulative session result as (filename,
+    pdf_bytes) in name order, rendered one at a time as they are consumed.
+    The class's results are loaded before the first PDF is asked for.
+    """
+    from academics.services import load_class_cumulative_results
+    from .result_pdf_generator import generate_cumulative_result_pdf
+
+    students = list(
+        school_class.students.filter(is_active=True).select_related('school_class').order_by('last_name', 'first_name')
+    )
+    # Whole class in one fetch so cumulative positions are class-wide
+    cumulative = load_class_cumulative_results(school_class, academic_session)
+
+    def render():
+        for student in students:
+            results_data, cumulative_stats = cumulative[student.id]
+            pdf_buffer = generate_cumulative_result_pdf(
+                school_class.school, student, academic_session, results_data, cumulative_stats
+            )
+            student_name = f"{student.last_name}_{student.first_name}".replace(' ', '_')
+            yield f"{student_name}_{academic_session.name}_Cumulative.pdf", pdf_buffer.getvalue()
+
+    return render()
@@ -9,15 +9,19 @@ Matches the sample secondary school result format with:
 - Promotion status and next term date
 """
 from reportlab.lib.pagesizes import A4, letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch, mm
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image, PageBreak
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from reportlab.platypus.flowables import HRFlowable
 from datetime import datetime
 from io import BytesIO
-import os
+from types import SimpleNamespace
+
+from academics.grading import get_grading_scale
+from schools.models import School
+from .pdf_assets import paragraph_style, sample_styles, school_image
+from .pdf_cache import cached_pdf
 
 
 def get_ordinal_suffix(n):
@@ -48,6 +52,218 @@ def draw_watermark(canvas, doc):
     canvas.restoreState()
 
 
+# Student report card results table, shared by both renderers
+RESULTS_HEADER = (
+    'SUBJECT', 'TEST 1', 'TEST 2', 'EXAM', 'TOTAL',
+    'Letter\nGrade', 'Position', 'Subject\nHigh',
+    '1st\nTerm', '2nd\nTerm', '3rd\nTerm', 'Remark'
+)
+RESULTS_COL_WIDTHS = [1.3*inch, 0.4*inch, 0.4*inch, 0.4*inch, 0.4*inch,
+                      0.4*inch, 0.4*inch, 0.5*inch, 0.4*inch, 0.4*inch, 0.4*inch, 0.6*inch]
+
+
+def _student_result_implicit(arguments):
+    """What generate_student_result_pdf reads beyond its arguments, for the PDF cache."""
+    implicit = {}
+    if arguments['grading_scale'] is None:
+        implicit['grading_scale'] = get_grading_scale(arguments['school'])
+    if arguments['class_info'] is None:
+        implicit['class_population'] = arguments['school_class'].students.filter(is_active=True).count()
+    return implicit
+
+
+def report_card_content(
+    school,
+    school_class,
+    academic_session,
+    term,
+    student_data,
+    subjects,
+    attendance_data=None,
+    affective_traits=None,
+    psychomotor_traits=None,
+    term_report=None,
+    class_info=None,
+    all_term_results=None,
+    grading_scale=None
+):
+    """
+    Everything a student's report card prints, as plain text, worked out
+    once for whichever renderer lays it out. Takes the arguments of
+    generate_student_result_pdf().
+    """
+    content = SimpleNamespace()
+
+    # ========== HEADER SECTION ==========
+    motto_text = school.motto if school.motto else "MOTTO: EXCELLENCE IN EDUCATION"
+    if not motto_text.upper().startswith("MOTTO:"):
+        motto_text = f"MOTTO: {motto_text}"
+
+    content.school_name = school.name.upper()
+    content.school_address = school.address if school.address else ""
+    content.motto = motto_text.upper()
+
+    term_display = f"{term.upper()} TERM" if term else "TERM"
+    content.title = f"REPORT SHEET FOR {term_display}, {academic_session.name} ACADEMIC SESSION"
+
+    # ========== STUDENT INFO SECTION ==========
+    student = student_data.get('student_obj') or student_data
+    content.student_name = student_data.get('student', str(student) if hasattr(student, '__str__') else 'N/A')
+
+    # Get attendance info
+    times_present = attendance_data.times_present if attendance_data else 0
+    times_opened = attendance_data.times_school_opened if attendance_data else (class_info.times_school_opened if class_info else 0)
+    content.attendance = f"{times_present} out of {times_opened}" if times_opened else "N/A"
+
+    # Get class position
+    class_position = student_data.get('position', '-')
+    content.position = format_position(class_position) if class_position else '-'
+
+    # Get class population
+    content.class_population = class_info.class_population if class_info else school_class.students.filter(is_active=True).count()
+
+    # Fetch Gender and Age using new model fields
+    gender = getattr(student, 'get_gender_display', lambda: 'N/A')() if hasattr(student, 'get_gender_display') else 'N/A'
+    if gender == 'N/A' and hasattr(student, 'gender'):
+        gender = 'Male' if student.gender == 'M' else 'Female'
+    content.gender = gender
+
+    age = getattr(student, 'age', 'N/A')
+    if age is None: age = 'N/A'
+    content.age = age
+
+    content.class_name = school_class.name
+    content.admission = student_data.get('admission', getattr(student, 'admission_number', 'N/A'))
+    content.session_name = academic_session.name
+
+    # ========== RESULTS TABLE ==========
+    content.results = []
+    cumulative_total = 0
+    max_obtainable = 0
+    subject_count = 0
+
+    for subject in subjects:
+        subject_scores = student_data.get('subjects', {}).get(subject.name, {})
+
+        test1 = subject_scores.get('test1', 0)
+        test2 = subject_scores.get('test2', 0)
+        exam = subject_scores.get('exam', 0)
+        total = subject_scores.get('total', test1 + test2 + exam)
+        grade = subject_scores.get('grade', '-')
+        position = format_position(subject_scores.get('subject_position')) if subject_scores.get('subject_position') else '-'
+        subject_high = subject_scores.get('subject_highest', '-')
+        remark = subject_scores.get('remark', '-')
+
+        # Get previous term scores
+        first_term = '-'
+        second_term = '-'
+        third_term = '-'
+
+        if all_term_results:
+            first_term = all_term_results.get('First', {}).get(subject.name, {}).get('total', '-')
+            second_term = all_term_results.get('Second', {}).get(subject.name, {}).get('total', '-')
+            third_term = all_term_results.get('Third', {}).get(subject.name, {}).get('total', '-')
+
+        # Set current term
+        if term == 'First':
+            first_term = total
+        elif term == 'Second':
+            second_term = total
+        elif term == 'Third':
+            third_term = total
+
+        content.results.append([
+            subject.name,
+            str(test1), str(test2), str(exam), str(total),
+            grade, position, str(subject_high) if subject_high else '-',
+            str(first_term), str(second_term), str(third_term), remark
+        ])
+
+        cumulative_total += total
+        max_obtainable += 100
+        subject_count += 1
+
+    # Calculate averages
+    average_score = round(cumulative_total / subject_count, 2) if subject_count > 0 else 0
+
+    # ========== SUMMARY ROW ==========
+    # Calculate grade from average
+    grading_scale = grading_scale or get_grading_scale(school)
+    content.subject_count = subject_count
+    content.cumulative_total = cumulative_total
+    content.max_obtainable = max_obtainable
+    content.average_score = average_score
+    content.average_grade = grading_scale.grade(average_score)
+
+    # ========== TRAITS AND KEY ==========
+    if affective_traits:
+        content.affective_items = [
+            ('1. Punctuality', affective_traits.punctuality),
+            ('2. Mental Alertness', affective_traits.mental_alertness),
+            ('3. Respect', affective_traits.respect),
+            ('4. Neatness', affective_traits.neatness),
+            ('5. Honesty', affective_traits.honesty),
+            ('6. Politeness', affective_traits.politeness),
+            ('7. Relationship with peers', affective_traits.relationship_with_peers),
+            ('8. Willingness to learn', affective_traits.willingness_to_learn),
+            ('9. Spirit of Teamwork', affective_traits.spirit_of_teamwork),
+        ]
+    else:
+        content.affective_items = [
+            ('1. Punctuality', 'C'),
+            ('2. Mental Alertness', 'C'),
+            ('3. Respect', 'C'),
+            ('4. Neatness', 'C'),
+            ('5. Honesty', 'C'),
+            ('6. Politeness', 'C'),
+            ('7. Relationship with peers', 'C'),
+            ('8. Willingness to learn', 'C'),
+            ('9. Spirit of Teamwork', 'C'),
+        ]
+
+    if psychomotor_traits:
+        content.psychomotor_items = [
+            ('1. Games & Sports', psychomotor_traits.games_and_sports),
+            ('2. Verbal Skills', psychomotor_traits.verbal_skills),
+            ('3. Artistic Creativity', psychomotor_traits.artistic_creativity),
+            ('4. Musical Skills', psychomotor_traits.musical_skills),
+            ('5. Dance Skills', psychomotor_traits.dance_skills),
+        ]
+    else:
+        content.psychomotor_items = [
+            ('1. Games & Sports', 'C'),
+            ('2. Verbal Skills', 'C'),
+            ('3. Artistic Creativity', 'C'),
+            ('4. Musical Skills', 'C'),
+            ('5. Dance Skills', 'C'),
+        ]
+
+    content.grading_key = grading_scale.key_rows()
+
+    # ========== NEXT Term Info ==========
+    content.next_term_date = term_report.next_term_begins.strftime('%d/%m/%Y') if term_report and term_report.next_term_begins else 'TBD'
+    content.promotion_status = term_report.promotion_status if term_report else 'PENDING'
+
+    # ========== COMMENTS SECTION ==========
+    # Auto comments come from the school's grading scale
+    if term_report and term_report.class_teacher_comment:
+        content.teacher_comment = term_report.class_teacher_comment
+    else:
+        content.teacher_comment = grading_scale.teacher_comment(average_score)
+
+    content.teacher_name = term_report.class_teacher_name if term_report else (
+        str(school_class.form_teacher) if school_class.form_teacher else "Class Teacher"
+    )
+
+    if term_report and term_report.principal_comment:
+        content.principal_comment = term_report.principal_comment
+    else:
+        content.principal_comment = grading_scale.principal_comment(average_score)
+
+    return content
+
+
+@cached_pdf(implicit=_student_result_implicit, modules=['portal.report_card_canvas'])
 def generate_student_result_pdf(
     school,
     school_class,
@@ -60,10 +276,15 @@ def generate_student_result_pdf(
     psychomotor_traits=None,
     term_report=None,
     class_info=None,
-    all_term_results=None
+    all_term_results=None,
+    grading_scale=None
 ):
     """
     Generate a comprehensive PDF result report for a single student.
+
+    Schools set to the fixed report card layout get the canvas renderer
+    (portal.report_card_canvas), which falls back to this flowing layout
+    for a card it cannot draw exactly as this layout would.
     
     Args:
         school: School instance
@@ -78,10 +299,22 @@ def generate_student_result_pdf(
         term_report: StudentTermReport instance
         class_info: ClassTermInfo instance
         all_term_results: Dictionary of results from previous terms for this session
+        grading_scale: Compiled grading scale (looked up from the school when omitted)
     
     Returns:
         BytesIO object containing PDF
     """
+    content = report_card_content(
+        school, school_class, academic_session, term, student_data, subjects,
+        attendance_data, affective_traits, psychomotor_traits, term_report,
+        class_info, all_term_results, grading_scale
+    )
+
+    if getattr(school, 'report_card_layout', None) == School.ReportCardLayout.FIXED:
+        from .report_card_canvas import render_report_card
+        pdf_buffer = render_report_card(school, content)
+        if pdf_buffer is not None:
+            return pdf_buffer
     
     # Create PDF in memory
     pdf_buffer = BytesIO()
@@ -95,9 +328,9 @@ def generate_student_result_pdf(
     )
     
     # Define styles
-    styles = getSampleStyleSheet()
+    styles = sample_styles()
     
-    school_name_style = ParagraphStyle(
+    school_name_style = paragraph_style(
         'SchoolName',
         parent=styles['Heading1'],
         fontSize=14,
@@ -107,7 +340,7 @@ def generate_student_result_pdf(
         fontName='Helvetica-Bold'
     )
     
-    school_address_style = ParagraphStyle(
+    school_address_style = paragraph_style(
         'SchoolAddress',
         parent=styles['Normal'],
         fontSize=8,
@@ -116,7 +349,7 @@ def generate_student_result_pdf(
         alignment=TA_CENTER
     )
     
-    motto_style = ParagraphStyle(
+    motto_style = paragraph_style(
         'Motto',
         parent=styles['Normal'],
         fontSize=9,
@@ -126,7 +359,7 @@ def generate_student_result_pdf(
         fontName='Helvetica-BoldOblique'
     )
     
-    report_title_style = ParagraphStyle(
+    report_title_style = paragraph_style(
         'ReportTitle',
         parent=styles['Heading2'],
         fontSize=11,
@@ -136,7 +369,7 @@ def generate_student_result_pdf(
         fontName='Helvetica-Bold'
     )
     
-    section_header_style = ParagraphStyle(
+    section_header_style = paragraph_style(
         'SectionHeader',
         parent=styles['Normal'],
         fontSize=9,
@@ -146,7 +379,7 @@ def generate_student_result_pdf(
         fontName='Helvetica-Bold'
     )
     
-    info_style = ParagraphStyle(
+    info_style = paragraph_style(
         'Info',
         parent=styles['Normal'],
         fontSize=9,
@@ -162,28 +395,17 @@ def generate_student_result_pdf(
     header_data = []
     
     # School logo placeholder (if available)
-    school_logo = None
-    if school.logo and os.path.exists(school.logo.path):
-        try:
-            school_logo = Image(school.logo.path, width=0.8*inch, height=0.8*inch)
-        except:
-            school_logo = Paragraph("🏫", school_name_style)
-    else:
-        school_logo = Paragraph("🏫", school_name_style)
+    school_logo = school_image(school, 'logo', 0.8*inch, 0.8*inch, placeholder=Paragraph("🏫", school_name_style))
     
     # School info
-    motto_text = school.motto if school.motto else "MOTTO: EXCELLENCE IN EDUCATION"
-    if not motto_text.upper().startswith("MOTTO:"):
-        motto_text = f"MOTTO: {motto_text}"
-        
     school_info = [
-        Paragraph(f"<b>{school.name.upper()}</b>", school_name_style),
-        Paragraph(school.address if school.address else "", school_address_style),
-        Paragraph(f"<b>{motto_text.upper()}</b>", motto_style),
+        Paragraph(f"<b>{content.school_name}</b>", school_name_style),
+        Paragraph(content.school_address, school_address_style),
+        Paragraph(f"<b>{content.motto}</b>", motto_style),
     ]
     
     # Student photo placeholder
-    student_photo = Paragraph("👤", ParagraphStyle('Photo', fontSize=24, alignment=TA_CENTER))
+    student_photo = Paragraph("👤", paragraph_style('Photo', fontSize=24, alignment=TA_CENTER))
     
     header_table_data = [[school_logo, school_info, student_photo]]
     header_table = Table(header_table_data, colWidths=[1*inch, 5*inch, 1*inch])
@@ -197,54 +419,27 @@ def generate_student_result_pdf(
     story.append(Spacer(1, 0.1*inch))
     
     # Report title
-    term_display = f"{term.upper()} TERM" if term else "TERM"
-    story.append(Paragraph(
-        f"<b>REPORT SHEET FOR {term_display}, {academic_session.name} ACADEMIC SESSION</b>",
-        report_title_style
-    ))
+    story.append(Paragraph(f"<b>{content.title}</b>", report_title_style))
     story.append(Spacer(1, 0.1*inch))
     
     # ========== STUDENT INFO SECTION ==========
-    student = student_data.get('student_obj') or student_data
-    student_name = student_data.get('student', str(student) if hasattr(student, '__str__') else 'N/A')
-    
-    # Get attendance info
-    times_present = attendance_data.times_present if attendance_data else 0
-    times_opened = attendance_data.times_school_opened if attendance_data else (class_info.times_school_opened if class_info else 0)
-    attendance_str = f"{times_present} out of {times_opened}" if times_opened else "N/A"
-    
-    # Get class position
-    class_position = student_data.get('position', '-')
-    position_str = format_position(class_position) if class_position else '-'
-    
-    # Get class population
-    class_population = class_info.class_population if class_info else school_class.students.filter(is_active=True).count()
-    
     # Student info in two columns
-    # Fetch Gender and Age using new model fields
-    gender = getattr(student, 'get_gender_display', lambda: 'N/A')() if hasattr(student, 'get_gender_display') else 'N/A'
-    if gender == 'N/A' and hasattr(student, 'gender'):
-        gender = 'Male' if student.gender == 'M' else 'Female'
-    
-    age = getattr(student, 'age', 'N/A')
-    if age is None: age = 'N/A'
-        
     info_data = [
         [
-            Paragraph(f"<b>NAME:</b> {student_name}", info_style),
-            Paragraph(f"<b>GENDER:</b> {gender}", info_style),
+            Paragraph(f"<b>NAME:</b> {content.student_name}", info_style),
+            Paragraph(f"<b>GENDER:</b> {content.gender}", info_style),
         ],
         [
-            Paragraph(f"<b>CLASS:</b> {school_class.name}", info_style),
-            Paragraph(f"<b>AGE:</b> {age}", info_style),
+            Paragraph(f"<b>CLASS:</b> {content.class_name}", info_style),
+            Paragraph(f"<b>AGE:</b> {content.age}", info_style),
         ],
         [
-            Paragraph(f"<b>ADMISSION NUMBER:</b> {student_data.get('admission', getattr(student, 'admission_number', 'N/A'))}", info_style),
-            Paragraph(f"<b>ATTENDANCE:</b> {attendance_str}   <b>Class Position:</b> {position_str}", info_style),
+            Paragraph(f"<b>ADMISSION NUMBER:</b> {content.admission}", info_style),
+            Paragraph(f"<b>ATTENDANCE:</b> {content.attendance}   <b>Class Position:</b> {content.position}", info_style),
         ],
         [
-            Paragraph(f"<b>SESSION:</b> {academic_session.name}", info_style),
-            Paragraph(f"<b>CLASS POPULATION:</b> {class_population}", info_style),
+            Paragraph(f"<b>SESSION:</b> {content.session_name}", info_style),
+            Paragraph(f"<b>CLASS POPULATION:</b> {content.class_population}", info_style),
         ],
     ]
     
@@ -263,71 +458,9 @@ def generate_student_result_pdf(
     
     # ========== MAIN CONTENT - RESULTS TABLE AND TRAITS SIDE BY SIDE ==========
     # Create the results table
-    results_table_data = []
-    
-    # Header row
-    header_row = [
-        'SUBJECT', 'TEST 1', 'TEST 2', 'EXAM', 'TOTAL',
-        'Letter\nGrade', 'Position', 'Subject\nHigh',
-        '1st\nTerm', '2nd\nTerm', '3rd\nTerm', 'Remark'
-    ]
-    results_table_data.append(header_row)
+    results_table_data = [list(RESULTS_HEADER)] + content.results
     
-    # Subject rows
-    cumulative_total = 0
-    max_obtainable = 0
-    subject_count = 0
-    
-    for subject in subjects:
-        subject_scores = student_data.get('subjects', {}).get(subject.name, {})
-        
-        test1 = subject_scores.get('test1', 0)
-        test2 = subject_scores.get('test2', 0)
-        exam = subject_scores.get('exam', 0)
-        total = subject_scores.get('total', test1 + test2 + exam)
-        grade = subject_scores.get('grade', '-')
-        position = format_position(subject_scores.get('subject_position')) if subject_scores.get('subject_position') else '-'
-        subject_high = subject_scores.get('subject_highest', '-')
-        remark = subject_scores.get('remark', '-')
-        
-        # Get previous term scores
-        first_term = '-'
-        second_term = '-'
-        third_term = '-'
-        
-        if all_term_results:
-            first_term = all_term_results.get('First', {}).get(subject.name, {}).get('total', '-')
-            second_term = all_term_results.get('Second', {}).get(subject.name, {}).get('total', '-')
-            third_term = all_term_results.get('Third', {}).get(subject.name, {}).get('total', '-')
-        
-        # Set current term
-        if term == 'First':
-            first_term = total
-        elif term == 'Second':
-            second_term = total
-        elif term == 'Third':
-            third_term = total
-        
-        row = [
-            subject.name,
-            str(test1), str(test2), str(exam), str(total),
-            grade, position, str(subject_high) if subject_high else '-',
-            str(first_term), str(second_term), str(third_term), remark
-        ]
-        results_table_data.append(row)
-        
-        cumulative_total += total
-        max_obtainable += 100
-        subject_count += 1
-    
-    # Calculate averages
-    average_score = round(cumulative_total / subject_count, 2) if subject_count > 0 else 0
-    
-    # Create results table
-    col_widths = [1.3*inch, 0.4*inch, 0.4*inch, 0.4*inch, 0.4*inch,
-                  0.4*inch, 0.4*inch, 0.5*inch, 0.4*inch, 0.4*inch, 0.4*inch, 0.6*inch]
-    
-    results_table = Table(results_table_data, colWidths=col_widths)
+    results_table = Table(results_table_data, colWidths=RESULTS_COL_WIDTHS)
     
     results_table.setStyle(TableStyle([
         # Header styling
@@ -358,34 +491,20 @@ def generate_student_result_pdf(
     story.append(Spacer(1, 0.1*inch))
     
     # ========== SUMMARY ROW ==========
-    summary_style = ParagraphStyle(
+    summary_style = paragraph_style(
         'Summary',
         parent=styles['Normal'],
         fontSize=8,
         textColor=colors.HexColor('#333333')
     )
     
-    # Calculate grade from average
-    if average_score >= 80:
-        avg_grade = "A"
-    elif average_score >= 70:
-        avg_grade = "B"
-    elif average_score >= 60:
-        avg_grade = "C"
-    elif average_score >= 50:
-        avg_grade = "D"
-    elif average_score >= 40:
-        avg_grade = "E"
-    else:
-        avg_grade = "F"
-    
     summary_data = [[
         Paragraph(f"<b>TERM AVERAGE</b>", summary_style),
-        Paragraph(f"Subjects: {subject_count}", summary_style),
-        Paragraph(f"<b>CUMULATIVE:</b> {cumulative_total:.2f}", summary_style),
-        Paragraph(f"<b>MAXIMUM OBTAINABLE:</b> {max_obtainable}", summary_style),
-        Paragraph(f"<b>AVERAGE SCORE:</b> {average_score:.2f}", summary_style),
-        Paragraph(f"<b>{avg_grade}</b>", summary_style),
+        Paragraph(f"Subjects: {content.subject_count}", summary_style),
+        Paragraph(f"<b>CUMULATIVE:</b> {content.cumulative_total:.2f}", summary_style),
+        Paragraph(f"<b>MAXIMUM OBTAINABLE:</b> {content.max_obtainable}", summary_style),
+        Paragraph(f"<b>AVERAGE SCORE:</b> {content.average_score:.2f}", summary_style),
+        Paragraph(f"<b>{content.average_grade}</b>", summary_style),
     ]]
     
     summary_table = Table(summary_data, colWidths=[1.2*inch, 0.9*inch, 1.3*inch, 1.5*inch, 1.3*inch, 0.8*inch])
@@ -405,34 +524,7 @@ def generate_student_result_pdf(
     
     # Affective Traits
     affective_header = [['AFFECTIVE TRAITS', 'RATING']]
-    affective_data = []
-    
-    if affective_traits:
-        affective_items = [
-            ('1. Punctuality', affective_traits.punctuality),
-            ('2. Mental Alertness', affective_traits.mental_alertness),
-            ('3. Respect', affective_traits.respect),
-            ('4. Neatness', affective_traits.neatness),
-            ('5. Honesty', affective_traits.honesty),
-            ('6. Politeness', affective_traits.politeness),
-            ('7. Relationship with peers', affective_traits.relationship_with_peers),
-            ('8. Willingness to learn', affective_traits.willingness_to_learn),
-            ('9. Spirit of Teamwork', affective_traits.spirit_of_teamwork),
-        ]
-    else:
-        affective_items = [
-            ('1. Punctuality', 'C'),
-            ('2. Mental Alertness', 'C'),
-            ('3. Respect', 'C'),
-            ('4. Neatness', 'C'),
-            ('5. Honesty', 'C'),
-            ('6. Politeness', 'C'),
-            ('7. Relationship with peers', 'C'),
-            ('8. Willingness to learn', 'C'),
-            ('9. Spirit of Teamwork', 'C'),
-        ]
-    
-    affective_data = affective_header + [[item[0], item[1]] for item in affective_items]
+    affective_data = affective_header + [[item[0], item[1]] for item in content.affective_items]
     affective_table = Table(affective_data, colWidths=[1.5*inch, 0.5*inch])
     affective_table.setStyle(TableStyle([
         ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#000080')),
@@ -450,24 +542,7 @@ def generate_student_result_pdf(
     # Psychomotor Traits
     psychomotor_header = [['PSYCHOMOTOR TRAITS', 'RATING']]
     
-    if psychomotor_traits:
-        psychomotor_items = [
-            ('1. Games & Sports', psychomotor_traits.games_and_sports),
-            ('2. Verbal Skills', psychomotor_traits.verbal_skills),
-            ('3. Artistic Creativity', psychomotor_traits.artistic_creativity),
-            ('4. Musical Skills', psychomotor_traits.musical_skills),
-            ('5. Dance Skills', psychomotor_traits.dance_skills),
-        ]
-    else:
-        psychomotor_items = [
-            ('1. Games & Sports', 'C'),
-            ('2. Verbal Skills', 'C'),
-            ('3. Artistic Creativity', 'C'),
-            ('4. Musical Skills', 'C'),
-            ('5. Dance Skills', 'C'),
-        ]
-    
-    psychomotor_data = psychomotor_header + [[item[0], item[1]] for item in psychomotor_items]
+    psychomotor_data = psychomotor_header + [[item[0], item[1]] for item in content.psychomotor_items]
     psychomotor_table = Table(psychomotor_data, colWidths=[1.5*inch, 0.5*inch])
     psychomotor_table.setStyle(TableStyle([
         ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#000080')),
@@ -483,15 +558,7 @@ def generate_student_result_pdf(
     ]))
     
     # Key to Grading
-    grading_key_data = [
-        ['KEY TO GRADING'],
-        ['A (Excellent) = 80 - 100%'],
-        ['B (Very Good) = 70 - 79%'],
-        ['C (Good) = 60 - 69%'],
-        ['D (Pass) = 50 - 59%'],
-        ['E (Fair) = 40 - 49%'],
-        ['F (Fail) = 0 - 39%'],
-    ]
+    grading_key_data = [['KEY TO GRADING']] + [[row] for row in content.grading_key]
     
     grading_table = Table(grading_key_data, colWidths=[2*inch])
     grading_table.setStyle(TableStyle([
@@ -517,12 +584,9 @@ def generate_student_result_pdf(
     story.append(Spacer(1, 0.15*inch))
     
     # ========== NEXT Term Info ==========
-    next_term_date = term_report.next_term_begins.strftime('%d/%m/%Y') if term_report and term_report.next_term_begins else 'TBD'
-    promotion_status = term_report.promotion_status if term_report else 'PENDING'
-    
     next_term_data = [[
-        Paragraph(f"<b>Next Begins:</b> {next_term_date}", info_style),
-        Paragraph(f"<b>{promotion_status}</b>", ParagraphStyle('Promo', fontSize=10, fontName='Helvetica-Bold', alignment=TA_CENTER)),
+        Paragraph(f"<b>Next Begins:</b> {content.next_term_date}", info_style),
+        Paragraph(f"<b>{content.promotion_status}</b>", paragraph_style('Promo', fontSize=10, fontName='Helvetica-Bold', alignment=TA_CENTER)),
     ]]
     
     next_term_table = Table(next_term_data, colWidths=[3.5*inch, 3.5*inch])
@@ -530,7 +594,7 @@ def generate_student_result_pdf(
         ('ALIGN', (0, 0), (0, 0), 'LEFT'),
         ('ALIGN', (1, 0), (1, 0), 'CENTER'),
         ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('BACKGROUND', (1, 0), (1, 0), colors.HexColor('#ccffcc') if promotion_status == 'PROMOTED' else colors.HexColor('#ffcccc')),
+        ('BACKGROUND', (1, 0), (1, 0), colors.HexColor('#ccffcc') if content.promotion_status == 'PROMOTED' else colors.HexColor('#ffcccc')),
         ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
         ('TOPPADDING', (0, 0), (-1, -1), 6),
         ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
@@ -539,7 +603,7 @@ def generate_student_result_pdf(
     story.append(Spacer(1, 0.15*inch))
     
     # ========== COMMENTS SECTION ==========
-    comment_style = ParagraphStyle(
+    comment_style = paragraph_style(
         'Comment',
         parent=styles['Normal'],
         fontSize=9,
@@ -547,41 +611,13 @@ def generate_student_result_pdf(
         leading=12
     )
     
-    # Helper for auto comments based on average
-    def get_auto_comment(avg):
-        if avg >= 80: return "An excellent result. Keep it up."
-        if avg >= 70: return "A very good result. Keep it up."
-        if avg >= 60: return "A good result. You can do better."
-        if avg >= 50: return "A credit pass. Work harder next time."
-        if avg >= 40: return "A fair result. You need to sit up."
-        return "A poor result. Please study harder."
-
-    def get_principal_comment(avg):
-        if avg >= 80: return "Excellent performance."
-        if avg >= 70: return "Very Good performance."
-        if avg >= 60: return "Good performance."
-        if avg >= 50: return "Fair performance."
-        if avg >= 40: return "Poor performance."
-        return "Fail. Needs to repeat."
-
-    
-    # Class Teacher Comment
-    if term_report and term_report.class_teacher_comment:
-        teacher_comment = term_report.class_teacher_comment
-    else:
-        teacher_comment = get_auto_comment(average_score)
-
-    teacher_name = term_report.class_teacher_name if term_report else (
-        str(school_class.form_teacher) if school_class.form_teacher else "Class Teacher"
-    )
-    
-    story.append(Paragraph(f"<b>CLASS TEACHER'S COMMENT:</b> {teacher_comment}", comment_style))
-    story.append(Paragraph(f"Keep it up.", comment_style) if not teacher_comment else Spacer(1, 0.05*inch))
+    story.append(Paragraph(f"<b>CLASS TEACHER'S COMMENT:</b> {content.teacher_comment}", comment_style))
+    story.append(Paragraph(f"Keep it up.", comment_style) if not content.teacher_comment else Spacer(1, 0.05*inch))
     story.append(Spacer(1, 0.05*inch))
     
     # Prepare Teacher section (Comment only, no signature)
     teacher_sig_data = [[
-        Paragraph(f"<b>Class Teacher:</b> {teacher_name}", info_style),
+        Paragraph(f"<b>Class Teacher:</b> {content.teacher_name}", info_style),
         "",
         "",
     ]]
@@ -594,34 +630,18 @@ def generate_student_result_pdf(
     story.append(teacher_sig_table)
     story.append(Spacer(1, 0.15*inch))
     
-    # Principal Comment
-    if term_report and term_report.principal_comment:
-        principal_comment = term_report.principal_comment
-    else:
-        principal_comment = get_principal_comment(average_score)
-    
-    story.append(Paragraph(f"<b>PRINCIPAL'S COMMENT:</b> {principal_comment}", comment_style))
+    story.append(Paragraph(f"<b>PRINCIPAL'S COMMENT:</b> {content.principal_comment}", comment_style))
     story.append(Spacer(1, 0.05*inch))
     
-    # Prepare Principal Signature and Stamp
-    principal_sig_image = Paragraph("", info_style)
-    school_stamp_image = Paragraph("Stamp", ParagraphStyle('Stamp', fontSize=8, alignment=TA_RIGHT))
-    
-    if school.principal_signature:
-        try:
-            # Try to load principal signature
-            principal_sig_image = Image(school.principal_signature.path, width=1.5*inch, height=0.5*inch, preserveAspectRatio=True)
-        except Exception:
-            # Fallback to empty if file missing or corrupt
-            principal_sig_image = Paragraph("", info_style)
-        
-    if school.stamp:
-        try:
-            # Try to load school stamp
-            school_stamp_image = Image(school.stamp.path, width=0.8*inch, height=0.8*inch, preserveAspectRatio=True)
-        except Exception:
-            # Fallback to default label if file missing
-            school_stamp_image = Paragraph("Stamp", ParagraphStyle('Stamp', fontSize=8, alignment=TA_RIGHT))
+    # Prepare Principal Signature and Stamp (empty / "Stamp" label when missing or unreadable)
+    principal_sig_image = school_image(
+        school, 'principal_signature', 1.5*inch, 0.5*inch, proportional=True,
+        placeholder=Paragraph("", info_style)
+    )
+    school_stamp_image = school_image(
+        school, 'stamp', 0.8*inch, 0.8*inch, proportional=True,
+        placeholder=Paragraph("Stamp", paragraph_style('Stamp', fontSize=8, alignment=TA_RIGHT))
+    )
     
     principal_sig_data = [
         [
@@ -652,6 +672,7 @@ def generate_student_result_pdf(
     return pdf_buffer
 
 
+@cached_pdf()
 def generate_class_broadsheet_pdf(
     school,
     school_class,
@@ -686,9 +707,9 @@ def generate_class_broadsheet_pdf(
         rightMargin=0.3*inch
     )
     
-    styles = getSampleStyleSheet()
+    styles = sample_styles()
     
-    title_style = ParagraphStyle(
+    title_style = paragraph_style(
         'Title',
         parent=styles['Heading1'],
         fontSize=14,
@@ -703,7 +724,7 @@ def generate_class_broadsheet_pdf(
     story.append(Paragraph(f"<b>{school.name.upper()}</b>", title_style))
     story.append(Paragraph(
         f"RESULT BROADSHEET - {school_class.name} - {term.upper()} TERM, {academic_session.name}",
-        ParagraphStyle('Subtitle', fontSize=11, alignment=TA_CENTER, spaceAfter=10)
+        paragraph_style('Subtitle', fontSize=11, alignment=TA_CENTER, spaceAfter=10)
     ))
     story.append(Spacer(1, 0.2*inch))
     
@@ -766,27 +787,22 @@ def generate_class_broadsheet_pdf(
     # Footer with Signatures
     story.append(Spacer(1, 0.5*inch))
     
-    # Try to load images (robustly)
-    principal_sig_image = Paragraph("", styles['Normal'])
-    if school.principal_signature:
-        try:
-            principal_sig_image = Image(school.principal_signature.path, width=1.5*inch, height=0.5*inch, preserveAspectRatio=True)
-        except Exception:
-            pass
-            
-    school_stamp_image = Paragraph("Stamp", ParagraphStyle('Stamp', fontSize=8, alignment=TA_CENTER))
-    if school.stamp:
-        try:
-            school_stamp_image = Image(school.stamp.path, width=0.8*inch, height=0.8*inch, preserveAspectRatio=True)
-        except Exception:
-            pass
+    # School images, with placeholders when missing or unreadable
+    principal_sig_image = school_image(
+        school, 'principal_signature', 1.5*inch, 0.5*inch, proportional=True,
+        placeholder=Paragraph("", styles['Normal'])
+    )
+    school_stamp_image = school_image(
+        school, 'stamp', 0.8*inch, 0.8*inch, proportional=True,
+        placeholder=Paragraph("Stamp", paragraph_style('Stamp', fontSize=8, alignment=TA_CENTER))
+    )
 
     sig_data = [
         [principal_sig_image, "", school_stamp_image],
         [
-            Paragraph("<b>Principal's Signature</b>", ParagraphStyle('SigLabel', fontSize=9, alignment=TA_LEFT)),
+            Paragraph("<b>Principal's Signature</b>", paragraph_style('SigLabel', fontSize=9, alignment=TA_LEFT)),
             "",
-            Paragraph("<b>Official Stamp</b>", ParagraphStyle('SigLabel', fontSize=9, alignment=TA_RIGHT))
+            Paragraph("<b>Official Stamp</b>", paragraph_style('SigLabel', fontSize=9, alignment=TA_RIGHT))
         ]
     ]
     
@@ -804,7 +820,7 @@ def generate_class_broadsheet_pdf(
     story.append(Spacer(1, 0.2*inch))
     story.append(Paragraph(
         f"<i>Generated: {datetime.now().strftime('%d %B %Y, %H:%M')}</i>",
-        ParagraphStyle('Footer', fontSize=8, textColor=colors.grey, alignment=TA_CENTER)
+        paragraph_style('Footer', fontSize=8, textColor=colors.grey, alignment=TA_CENTER)
     ))
     
     doc.build(story, onFirstPage=draw_watermark, onLaterPages=draw_watermark)
@@ -813,6 +829,7 @@ def generate_class_broadsheet_pdf(
     return pdf_buffer
 
 
+@cached_pdf(implicit=lambda arguments: get_grading_scale(arguments['school']))
 def generate_cumulative_result_pdf(
     school,
     student,
@@ -835,29 +852,23 @@ def generate_cumulative_result_pdf(
     )
     
     # Define styles
-    styles = getSampleStyleSheet()
-    header_style = ParagraphStyle(
+    styles = sample_styles()
+    header_style = paragraph_style(
         'Header', parent=styles['Heading1'], fontSize=14, alignment=TA_CENTER, textColor=colors.HexColor('#000080')
     )
-    sub_header_style = ParagraphStyle(
+    sub_header_style = paragraph_style(
         'SubHeader', parent=styles['Normal'], fontSize=10, alignment=TA_CENTER
     )
     
     story = []
     
     # --- Header ---
-    logo_img = Paragraph("🏫", header_style)
-    if school.logo and os.path.exists(school.logo.path):
-        try:
-             logo_img = Image(school.logo.path, width=0.8*inch, height=0.8*inch)
-        except Exception as e:
-            print(f"Error loading logo for PDF: {e}")
-            logo_img = Paragraph("🏫", header_style)
+    logo_img = school_image(school, 'logo', 0.8*inch, 0.8*inch, placeholder=Paragraph("🏫", header_style))
 
     school_name = Paragraph(f"<b>{school.name.upper()}</b>", header_style)
     address = Paragraph(school.address or "", sub_header_style)
     title = Paragraph(f"<b>CUMULATIVE SESSION RESULT - {academic_session.name}</b>", 
-                      ParagraphStyle('Title', parent=styles['Heading2'], alignment=TA_CENTER, spaceBefore=6))
+                      paragraph_style('Title', parent=styles['Heading2'], alignment=TA_CENTER, spaceBefore=6))
     
     # Layout Header Table
     header_table = Table([[logo_img, [school_name, address]]], colWidths=[1*inch, 5*inch])
@@ -871,7 +882,7 @@ def generate_cumulative_result_pdf(
     story.append(Spacer(1, 0.2*inch))
     
     # --- Student Info ---
-    info_style = ParagraphStyle('Info', parent=styles['Normal'], fontSize=10)
+    info_style = paragraph_style('Info', parent=styles['Normal'], fontSize=10)
     student_info = [
         [Paragraph(f"<b>Name:</b> {student.last_name} {student.first_name}", info_style),
          Paragraph(f"<b>Class:</b> {student.school_class.name}", info_style)],
@@ -891,7 +902,7 @@ def generate_cumulative_result_pdf(
     
     for subject, scores in results_data.items():
         row = [
-            Paragraph(subject, ParagraphStyle('Cell', fontSize=9)),
+            Paragraph(subject, paragraph_style('Cell', fontSize=9)),
             str(scores.get('First', '-')),
             str(scores.get('Second', '-')),
             str(scores.get('Third', '-')),
@@ -1017,21 +1028,15 @@ def generate_cumulative_result_pdf(
     
     # --- Principal Comment ---
     avg = cumulative_stats.get('average', 0)
-    if avg >= 90: comment = "A truly exceptional performance! You have shown outstanding academic ability across all terms. Keep maintain this top-tier standard."
-    elif avg >= 80: comment = "Excellent result. You have a strong grasp of your subjects. Continue to work hard to reach the very peak."
-    elif avg >= 70: comment = "A very good session performance. You are consistently high-performing. Aim for excellence in the next session."
-    elif avg >= 60: comment = "Good performance. You have potential to do much better if you stay focused on your studies."
-    elif avg >= 50: comment = "A fair performance. You have passed, but more effort is required to improve your grades."
-    elif avg >= 40: comment = "Pass. You are just meeting the requirements. I strongly advise you to dedicate more time to your books."
-    else: comment = "Poor performance. This result is below standard. You must study much harder and seek help where necessary."
-    
-    story.append(Paragraph(f"<b>PRINCIPAL'S COMMENT:</b> {comment}", ParagraphStyle('Comment', fontSize=10)))
+    comment = get_grading_scale(school).principal_comment(avg)
+    
+    story.append(Paragraph(f"<b>PRINCIPAL'S COMMENT:</b> {comment}", paragraph_style('Comment', fontSize=10)))
     story.append(Spacer(1, 0.3*inch))
     
     # Signatures
     sig_data = [
-        [Paragraph("", info_style), Paragraph("_______________________", ParagraphStyle('SigLine', alignment=TA_RIGHT))],
-        [Paragraph("", info_style), Paragraph("Principal's Signature", ParagraphStyle('SigLabel', alignment=TA_RIGHT, fontSize=8))]
+        [Paragraph("", info_style), Paragraph("_______________________", paragraph_style('SigLine', alignment=TA_RIGHT))],
+        [Paragraph("", info_style), Paragraph("Principal's Signature", paragraph_style('SigLabel', alignment=TA_RIGHT, fontSize=8))]
     ]
     sig_table = Table(sig_data, colWidths=[4*inch, 3*inch])
     story.append(sig_table)
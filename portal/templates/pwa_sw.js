@@ -1,7 +1,20 @@
 {% load static %}
-const CACHE_NAME = 'smrps-pwa-v3';
+const CACHE_NAME = 'smrps-pwa-v4';
+const SHELL_CACHE = 'smrps-shell-v4';
+const DATA_CACHE = 'smrps-data-v4';
 const OFFLINE_URL = '/offline/';
 
+// Pages kept for offline use once visited (teacher class dashboards)
+const SHELL_PAGES = /^\/portal\/teacher\/\d+\/$/;
+// Score grid payloads kept for offline use, keyed by full URL
+const GRID_DATA = /^\/portal\/teacher\/\d+\/enter-scores\/$/;
+
+const DB_NAME = 'smrps-offline';
+const DB_VERSION = 1;
+const QUEUE_STORE = 'score-queue';
+const OUTCOME_STORE = 'sync-outcomes';
+const SYNC_TAG = 'score-sync';
+
 // Install event - cache the offline page
 self.addEventListener('install', (event) => {
     event.waitUntil(
@@ -17,10 +30,11 @@ self.addEventListener('install', (event) => {
 
 // Activate event - clean up old caches
 self.addEventListener('activate', (event) => {
+    const keep = [CACHE_NAME, SHELL_CACHE, DATA_CACHE];
     event.waitUntil(
         caches.keys().then((keyList) => {
             return Promise.all(keyList.map((key) => {
-                if (key !== CACHE_NAME) {
+                if (!keep.includes(key)) {
                     return caches.delete(key);
                 }
             }));
@@ -28,20 +42,258 @@ self.addEventListener('activate', (event) => {
     );
 });
 
-// Fetch event - network first, fallback to offline page
+// Network first; on success keep a copy in the given cache
+function networkFirst(request, cacheName, fallback) {
+    return fetch(request)
+        .then((response) => {
+            // Redirects are skipped so a login page never gets cached as the dashboard
+            if ((response.ok && !response.redirected) || response.type === 'opaque') {
+                const copy = response.clone();
+                caches.open(cacheName).then((cache) => cache.put(request, copy));
+            }
+            return response;
+        })
+        .catch(() => caches.match(request).then((cached) => cached || fallback()));
+}
+
+// Cached grid payloads are marked so the page can tell the user they are offline
+function markOffline(response) {
+    if (!response) {
+        return new Response(JSON.stringify({ success: false, error: 'You are offline and this score sheet has not been opened before.' }), {
+            status: 503,
+            headers: { 'Content-Type': 'application/json' }
+        });
+    }
+    const headers = new Headers(response.headers);
+    headers.set('X-Served-From-Cache', '1');
+    return response.blob().then((body) => new Response(body, { status: response.status, headers }));
+}
+
+// Fetch event - network first, fallback to cache / offline page
 self.addEventListener('fetch', (event) => {
-    if (event.request.mode === 'navigate') {
+    const request = event.request;
+    if (request.method !== 'GET') {
+        return;
+    }
+    const url = new URL(request.url);
+    const sameOrigin = url.origin === self.location.origin;
+
+    if (request.mode === 'navigate') {
+        if (sameOrigin && SHELL_PAGES.test(url.pathname)) {
+            event.respondWith(networkFirst(request, SHELL_CACHE, () => caches.match(OFFLINE_URL)));
+        } else {
+            event.respondWith(
+                fetch(request)
+                    .catch(() => {
+                        return caches.match(OFFLINE_URL);
+                    })
+            );
+        }
+    } else if (sameOrigin && GRID_DATA.test(url.pathname)) {
         event.respondWith(
-            fetch(event.request)
-                .catch(() => {
-                    return caches.match(OFFLINE_URL);
+            fetch(request)
+                .then((response) => {
+                    if (response.ok && !response.redirected) {
+                        const copy = response.clone();
+                        caches.open(DATA_CACHE).then((cache) => cache.put(request, copy));
+                    }
+                    return response;
                 })
+                .catch(() => caches.match(request).then(markOffline))
         );
+    } else if (!sameOrigin || url.pathname.startsWith('{% get_static_prefix %}')) {
+        // Static files and CDN assets make up the app shell
+        event.respondWith(networkFirst(request, SHELL_CACHE, () => Response.error()));
     } else {
-        // For non-navigation requests (assets), try network first, then cache
+        // For other requests, try network first, then cache
         event.respondWith(
-            fetch(event.request)
-                .catch(() => caches.match(event.request))
+            fetch(request)
+                .catch(() => caches.match(request))
+        );
+    }
+});
+
+// --- Offline score queue (IndexedDB) ---
+
+function openDb() {
+    return new Promise((resolve, reject) => {
+        const open = indexedDB.open(DB_NAME, DB_VERSION);
+        open.onupgradeneeded = () => {
+            const db = open.result;
+            if (!db.objectStoreNames.contains(QUEUE_STORE)) {
+                db.createObjectStore(QUEUE_STORE, { keyPath: 'id', autoIncrement: true });
+            }
+            if (!db.objectStoreNames.contains(OUTCOME_STORE)) {
+                db.createObjectStore(OUTCOME_STORE, { keyPath: 'id', autoIncrement: true });
+            }
+        };
+        open.onsuccess = () => resolve(open.result);
+        open.onerror = () => reject(open.error);
+    });
+}
+
+// Runs fn(store) in a transaction and resolves with its result once committed
+function withStore(name, mode, fn) {
+    return openDb().then((db) => new Promise((resolve, reject) => {
+        const tx = db.transaction(name, mode);
+        let result;
+        Promise.resolve(fn(tx.objectStore(name))).then((value) => { result = value; });
+        tx.oncomplete = () => { db.close(); resolve(result); };
+        tx.onerror = () => { db.close(); reject(tx.error); };
+    }));
+}
+
+function getAll(name) {
+    return withStore(name, 'readonly', (store) => new Promise((resolve) => {
+        const req = store.getAll();
+        req.onsuccess = () => resolve(req.result);
+    }));
+}
+
+function gridKey(grid) {
+    return [grid.class_id, grid.subject_id, grid.session_id, grid.term].join(':');
+}
+
+function queueEdits(grid, changes, csrf) {
+    const key = gridKey(grid);
+    const queuedAt = Date.now();
+    return withStore(QUEUE_STORE, 'readwrite', (store) => {
+        changes.forEach((change) => store.add({ key, grid, change, csrf, queued_at: queuedAt }));
+    });
+}
+
+function recordOutcome(outcome) {
+    return withStore(OUTCOME_STORE, 'readwrite', (store) => { store.add(outcome); });
+}
+
+function notifyClients(message) {
+    return self.clients.matchAll({ includeUncontrolled: true, type: 'window' })
+        .then((clients) => clients.forEach((client) => client.postMessage(message)));
+}
+
+// Sends one grid's queued edits. Resolves true when the batch was settled
+// (applied, conflicted or rejected) and false when it should be retried.
+function sendGrid(records, csrf) {
+    const grid = records[0].grid;
+    // Later edits of a row replace earlier ones but keep the version they started from
+    const byStudent = new Map();
+    records.forEach((record) => {
+        const previous = byStudent.get(record.change.student_id);
+        byStudent.set(record.change.student_id, previous
+            ? { ...previous, ...record.change, base_version: previous.base_version }
+            : { ...record.change });
+    });
+    const changes = Array.from(byStudent.values());
+    const since = Math.max(0, ...changes.map((change) => change.base_version || 0));
+
+    return fetch(`/portal/teacher/${grid.class_id}/scores/sync/`, {
+        method: 'POST',
+        credentials: 'same-origin',
+        headers: {
+            'Content-Type': 'application/json',
+            'X-CSRFToken': csrf || records[records.length - 1].csrf
+        },
+        body: JSON.stringify({
+            subject_id: grid.subject_id,
+            session_id: grid.session_id,
+            term: grid.term,
+            since: since,
+            changes: changes
+        })
+    }).then((response) => {
+        const type = response.headers.get('Content-Type') || '';
+        if (!type.includes('application/json')) {
+            // Login page or CSRF failure: keep the edits until the teacher signs in again
+            return recordOutcome({ key: gridKey(grid), grid, auth_required: true, pending: changes.length, at: Date.now() })
+                .then(() => false);
+        }
+        return response.json().then((data) => {
+            const outcome = data.success
+                ? { applied: data.applied.length, conflicts: data.conflicts, errors: data.errors, version: data.version }
+                : { applied: 0, conflicts: [], errors: [{ error: data.error || `Server returned ${response.status}` }] };
+            if (!data.success && response.status >= 500) {
+                return false;
+            }
+            return withStore(QUEUE_STORE, 'readwrite', (store) => {
+                records.forEach((record) => store.delete(record.id));
+            })
+                .then(() => recordOutcome({ key: gridKey(grid), grid, ...outcome, at: Date.now() }))
+                .then(() => true);
+        });
+    });
+}
+
+let flushing = null;
+
+// Sends every queued edit, one request per grid. Rejects when something is
+// left in the queue so a background sync gets retried by the browser.
+function flushQueue(csrf) {
+    if (flushing) {
+        return flushing;
+    }
+    flushing = getAll(QUEUE_STORE)
+        .then((records) => {
+            const groups = new Map();
+            records.forEach((record) => {
+                if (!groups.has(record.key)) groups.set(record.key, []);
+                groups.get(record.key).push(record);
+            });
+            let pending = false;
+            let chain = Promise.resolve();
+            groups.forEach((group) => {
+                chain = chain
+                    .then(() => sendGrid(group, csrf))
+                    .then((settled) => { if (!settled) pending = true; });
+            });
+            return chain.then(() => pending);
+        })
+        .then((pending) => notifyClients({ type: 'score-sync-finished' }).then(() => {
+            if (pending) throw new Error('Queued scores could not all be sent');
+        }))
+        .finally(() => { flushing = null; });
+    return flushing;
+}
+
+function scheduleFlush() {
+    if (self.registration.sync) {
+        return self.registration.sync.register(SYNC_TAG).catch(() => flushQueue().catch(() => {}));
+    }
+    return flushQueue().catch(() => {});
+}
+
+self.addEventListener('sync', (event) => {
+    if (event.tag === SYNC_TAG) {
+        event.waitUntil(flushQueue());
+    }
+});
+
+// Messages from pages: queue edits, flush, read pending edits and outcomes
+self.addEventListener('message', (event) => {
+    const data = event.data || {};
+    const reply = (message) => event.ports[0] && event.ports[0].postMessage(message);
+
+    if (data.type === 'queue-scores') {
+        event.waitUntil(
+            queueEdits(data.grid, data.changes, data.csrf)
+                .then(() => { reply({ queued: data.changes.length }); return scheduleFlush(); })
+                .catch((error) => reply({ error: error.message }))
+        );
+    } else if (data.type === 'flush-scores') {
+        event.waitUntil(flushQueue(data.csrf).catch(() => {}).then(() => reply({})));
+    } else if (data.type === 'pending-scores') {
+        event.waitUntil(
+            getAll(QUEUE_STORE).then((records) => reply({
+                changes: records.filter((record) => record.key === gridKey(data.grid)).map((record) => record.change),
+                total: records.length
+            }))
+        );
+    } else if (data.type === 'take-outcomes') {
+        // Outcomes are delivered once, then forgotten
+        event.waitUntil(
+            withStore(OUTCOME_STORE, 'readwrite', (store) => new Promise((resolve) => {
+                const req = store.getAll();
+                req.onsuccess = () => { store.clear(); resolve(req.result); };
+            })).then((outcomes) => reply({ outcomes }))
         );
     }
 });
@@ -0,0 +1,92 @@
+import io
+import zipfile
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from academics.tests.fixtures import add_results, build_class
+from accounts.models import User
+from portal.exports import check_export_jobs, cleanup_exports, run_export_job, worker_seen
+from portal.models import ExportChunk, ExportJob
+from schools.models import School
+
+
+class ExportQueueHealthTests(TestCase):
+    def setUp(self):
+        self.school = School.objects.create(name="Export School", address="-")
+        self.user = User.objects.create_user(
+            username="admin", password="x", role=User.Role.SCHOOL_ADMIN, school=self.school
+        )
+        self.job = ExportJob.objects.create(
+            requested_by=self.user, school=self.school, kind=ExportJob.Kind.CLASS_CUMULATIVE, params={}
+        )
+        ExportJob.objects.filter(pk=self.job.pk).update(created_at=timezone.now() - timedelta(minutes=30))
+
+    def status(self):
+        return ExportJob.objects.get(pk=self.job.pk).status
+
+    def test_queued_job_fails_when_no_worker_is_alive(self):
+        check_export_jobs()
+        self.assertEqual(self.status(), ExportJob.Status.FAILED)
+
+    def test_queued_job_waits_while_a_worker_is_alive(self):
+        worker_seen("host:1")
+        check_export_jobs()
+        self.assertEqual(self.status(), ExportJob.Status.QUEUED)
+
+    def test_worker_busy_with_a_long_export_counts_as_alive(self):
+        ExportJob.objects.create(
+            requested_by=self.user, school=self.school, kind=ExportJob.Kind.CLASS_CUMULATIVE, params={},
+            status=ExportJob.Status.RUNNING, heartbeat_at=timezone.now(),
+        )
+        worker_seen("host:1", now=timezone.now() - timedelta(hours=1))
+        check_export_jobs()
+        self.assertEqual(self.status(), ExportJob.Status.QUEUED)
+
+    def test_running_job_of_dead_worker_is_requeued(self):
+        worker_seen("host:1")
+        ExportJob.objects.filter(pk=self.job.pk).update(
+            status=ExportJob.Status.RUNNING, attempts=1, heartbeat_at=timezone.now() - timedelta(hours=1)
+        )
+        check_export_jobs()
+        self.assertEqual(self.status(), ExportJob.Status.QUEUED)
+
+    def test_status_endpoint_reports_unserved_job(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("portal:export_status", args=[self.job.pk]), secure=True)
+        self.assertEqual(response.json()["job"]["status"], ExportJob.Status.FAILED)
+        self.assertIn("No export worker", response.json()["job"]["error"])
+
+
+@override_settings(PDF_CACHE_MAX_MB=0)
+class ExportStorageTests(TestCase):
+    def setUp(self):
+        self.fixture = build_class(["S1", "S2"], ["Maths"])
+        add_results(self.fixture, "First", {"S1": {"Maths": (10, 10, 40)}, "S2": {"Maths": (5, 5, 20)}})
+        self.user = User.objects.create_user(
+            username="admin", password="x", role=User.Role.SCHOOL_ADMIN, school=self.fixture.school
+        )
+        self.job = ExportJob.objects.create(
+            requested_by=self.user, school=self.fixture.school, kind=ExportJob.Kind.CLASS_CUMULATIVE,
+            params={"class_id": self.fixture.school_class.id, "session_id": self.fixture.session.id},
+        )
+
+    def test_zip_is_stored_in_chunks_and_downloaded_whole(self):
+        with mock.patch("portal.exports.CHUNK_SIZE", 1024):
+            job = run_export_job(self.job)
+        self.assertEqual(job.status, ExportJob.Status.DONE, job.error)
+        self.assertGreater(job.chunks.count(), 1)
+
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("portal:download_export", args=[job.pk]), secure=True)
+        data = b"".join(response.streaming_content)
+        self.assertEqual(len(data), job.size)
+        self.assertEqual(len(zipfile.ZipFile(io.BytesIO(data)).namelist()), 2)
+
+    def test_expired_export_is_deleted_with_its_chunks(self):
+        run_export_job(self.job)
+        self.assertEqual(cleanup_exports(now=timezone.now() + timedelta(days=30)), 1)
+        self.assertFalse(ExportChunk.objects.exists())
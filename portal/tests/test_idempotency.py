@@ -0,0 +1,53 @@
+import json
+
+from django.test import TestCase
+from django.urls import reverse
+
+from academics.models import StudentResult
+from academics.tests.fixtures import build_class
+from accounts.models import User
+from portal.models import IdempotencyKey
+
+
+class IdempotentReplayTests(TestCase):
+    def setUp(self):
+        self.fixture = build_class(["S1"], ["Maths"])
+        self.user = User.objects.create_user(
+            username="admin", password="x", role=User.Role.SCHOOL_ADMIN, school=self.fixture.school
+        )
+        self.client.force_login(self.user)
+        self.student = self.fixture.students["S1"]
+
+    def sync(self, exam, key):
+        return self.client.post(
+            reverse("portal:teacher_sync_subject_scores", args=[self.fixture.school_class.id]),
+            json.dumps({
+                "subject_id": self.fixture.subjects["Maths"].id,
+                "session_id": self.fixture.session.id,
+                "term": "First",
+                "changes": [{"student_id": self.student.id, "base_version": 0, "exam": exam}],
+            }),
+            content_type="application/json",
+            secure=True,
+            headers={"Idempotency-Key": key},
+        )
+
+    def test_repeated_key_replays_stored_response_without_saving_again(self):
+        first = self.sync(40, "save-1")
+        version = StudentResult.objects.get(student=self.student).version
+
+        replay = self.sync(40, "save-1")
+
+        self.assertEqual(replay.status_code, first.status_code)
+        self.assertEqual(replay.content, first.content)
+        self.assertEqual(replay["Idempotent-Replayed"], "true")
+        self.assertEqual(StudentResult.objects.get(student=self.student).version, version)
+        self.assertEqual(IdempotencyKey.objects.filter(user=self.user).count(), 1)
+
+    def test_key_reused_for_a_different_request_is_refused(self):
+        self.sync(40, "save-1")
+
+        response = self.sync(50, "save-1")
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(StudentResult.objects.get(student=self.student).exam, 40)
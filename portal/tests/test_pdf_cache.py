@@ -0,0 +1,42 @@
+import tempfile
+from io import BytesIO
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase, override_settings
+
+from academics.grading import DEFAULT_SCALE, CompiledGradingScale
+from portal.pdf_cache import cached_pdf
+
+renders = []
+
+
+@cached_pdf()
+def render(school, rows, grading_scale=None):
+    renders.append(rows)
+    return BytesIO(f"{school.name}:{rows}".encode())
+
+
+class PdfCacheKeyTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(PDF_CACHE_DIR=directory.name, PDF_CACHE_MAX_MB=8)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        renders.clear()
+        self.school = SimpleNamespace(name="Cache School", logo=None)
+        self.scale = DEFAULT_SCALE
+
+    def test_same_inputs_are_served_from_the_cache(self):
+        first = render(self.school, [["Maths", 80]], self.scale).getvalue()
+        second = render(self.school, [["Maths", 80]], self.scale).getvalue()
+        self.assertEqual(first, second)
+        self.assertEqual(len(renders), 1)
+
+    def test_any_changed_input_renders_again(self):
+        render(self.school, [["Maths", 80]], self.scale)
+        render(self.school, [["Maths", 81]], self.scale)
+        render(SimpleNamespace(name="Other School", logo=None), [["Maths", 80]], self.scale)
+        stricter = CompiledGradingScale.from_data(dict(self.scale.to_data(), pass_mark=self.scale.pass_mark + 10))
+        render(self.school, [["Maths", 80]], stricter)
+        self.assertEqual(len(renders), 4)
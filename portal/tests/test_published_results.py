@@ -0,0 +1,62 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from academics.publishing import publish_class_results
+from academics.services import compute_term_results
+from academics.tests.fixtures import add_results, build_class
+from accounts.models import User
+from schools.models import School
+
+
+@override_settings(PDF_CACHE_MAX_MB=0)
+@mock.patch("reportlab.rl_config.invariant", 1)
+class PublishedResultPdfTests(TestCase):
+    def setUp(self):
+        self.fixture = build_class(["S1", "S2"], ["Maths"], name="PUBLISHED")
+        add_results(self.fixture, "First", {
+            "S1": {"Maths": (10, 10, 35)},
+            "S2": {"Maths": (5, 5, 20)},
+        })
+        compute_term_results(self.fixture.school_class, self.fixture.session, "First")
+        publish_class_results(self.fixture.school_class, self.fixture.session, "First")
+
+        student = self.fixture.students["S1"]
+        student.user = User.objects.create_user(
+            username="published-student", password="x", role=User.Role.STUDENT, school=self.fixture.school
+        )
+        student.save(update_fields=["user"])
+        self.client.force_login(student.user)
+        self.url = reverse("portal:download_published_result_pdf", args=[self.fixture.session.id, "First"])
+
+    def download(self, **headers):
+        response = self.client.get(self.url, secure=True, headers=headers)
+        body = b"".join(response.streaming_content) if response.status_code == 200 else b""
+        return response, body
+
+    def test_school_edits_after_publishing_do_not_change_the_card(self):
+        response, published = self.download()
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+
+        school = self.fixture.school
+        school.name = "Renamed School"
+        school.motto = "New motto"
+        school.report_card_layout = School.ReportCardLayout.FIXED
+        school.save()
+
+        response, body = self.download()
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(body, published)
+        self.assertEqual(self.download(If_None_Match=etag)[0].status_code, 304)
+
+    def test_republishing_changes_the_etag(self):
+        etag = self.download()[0]["ETag"]
+        self.fixture.school.name = "Renamed School"
+        self.fixture.school.save()
+        publish_class_results(self.fixture.school_class, self.fixture.session, "First")
+
+        response, _ = self.download(If_None_Match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
@@ -0,0 +1,73 @@
+import copy
+import random
+import re
+from unittest import skipUnless
+
+from django.test import TestCase, override_settings
+
+from academics.benchmarking import build_synthetic_class
+from academics.services import compute_term_results
+from portal.report_card_canvas import render_report_card
+from portal.report_cards import class_report_card_jobs
+from portal.result_pdf_generator import generate_student_result_pdf, report_card_content
+from schools.models import School
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+PAGE = re.compile(rb'/Type /Page\b(?!s)')
+
+# Largest grey level difference allowed between the two layouts' pixels
+TOLERANCE = 1
+
+
+@override_settings(PDF_CACHE_MAX_MB=0)
+class FixedLayoutTests(TestCase):
+    def card(self, subject_count, layout):
+        school_class, session = build_synthetic_class(subject_count, subject_count, random.Random(subject_count))
+        compute_term_results(school_class, session, "First")
+        _, kwargs = class_report_card_jobs(school_class, session, "First")[0]
+        school = copy.copy(kwargs["school"])
+        school.report_card_layout = layout
+        return dict(kwargs, school=school)
+
+    def pages(self, kwargs):
+        return len(PAGE.findall(generate_student_result_pdf(**kwargs).getvalue()))
+
+    def with_layout(self, kwargs, layout):
+        school = copy.copy(kwargs["school"])
+        school.report_card_layout = layout
+        return dict(kwargs, school=school)
+
+    def rasterise(self, kwargs):
+        document = pdfium.PdfDocument(generate_student_result_pdf(**kwargs).getvalue())
+        try:
+            return [document[i].render(scale=2).to_pil().convert("L") for i in range(len(document))]
+        finally:
+            document.close()
+
+    def test_card_running_onto_second_page_is_drawn_on_canvas(self):
+        for subject_count in (10, 13, 14, 40):
+            with self.subTest(subjects=subject_count):
+                fixed = self.card(subject_count, School.ReportCardLayout.FIXED)
+                self.assertIsNotNone(render_report_card(fixed["school"], report_card_content(**fixed)))
+                flowing = self.with_layout(fixed, School.ReportCardLayout.FLOWING)
+                self.assertEqual(self.pages(fixed), self.pages(flowing))
+                self.assertEqual(self.pages(fixed), 1 if subject_count < 13 else 2)
+
+    @skipUnless(pdfium, "pypdfium2 is not installed (requirements-dev.txt)")
+    def test_layouts_rasterise_to_the_same_pixels(self):
+        from PIL import ImageChops
+
+        for subject_count in (10, 13, 40):
+            with self.subTest(subjects=subject_count):
+                fixed = self.card(subject_count, School.ReportCardLayout.FIXED)
+                flowing = self.with_layout(fixed, School.ReportCardLayout.FLOWING)
+                fixed_pages, flowing_pages = self.rasterise(fixed), self.rasterise(flowing)
+                self.assertEqual(len(fixed_pages), len(flowing_pages))
+                for number, (a, b) in enumerate(zip(flowing_pages, fixed_pages), 1):
+                    self.assertEqual(a.size, b.size)
+                    _, difference = ImageChops.difference(a, b).getextrema()
+                    self.assertLessEqual(difference, TOLERANCE, f"page {number}")
@@ -0,0 +1,40 @@
+import io
+import zipfile
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from academics.services import compute_term_results
+from academics.tests.fixtures import add_results, build_class
+from accounts.models import User
+
+
+@override_settings(PDF_CACHE_MAX_MB=0, REPORT_CARD_WORKERS=4)
+class ClassReportCardDownloadTests(TestCase):
+    def setUp(self):
+        self.fixture = build_class(["S1", "S2", "S3"], ["Maths"], name="DOWNLOAD")
+        add_results(self.fixture, "First", {
+            "S1": {"Maths": (10, 10, 35)},
+            "S2": {"Maths": (5, 5, 20)},
+            "S3": {"Maths": (15, 15, 50)},
+        })
+        compute_term_results(self.fixture.school_class, self.fixture.session, "First")
+        user = User.objects.create_user(
+            username="download-admin", password="x", role=User.Role.SCHOOL_ADMIN, school=self.fixture.school
+        )
+        self.client.force_login(user)
+
+    def test_request_renders_in_process_without_a_pool(self):
+        with mock.patch("portal.report_cards.ProcessPoolExecutor") as pool, \
+                mock.patch("portal.report_cards.connections") as connections:
+            response = self.client.get(
+                reverse("portal:download_comprehensive_result_pdf", args=[self.fixture.school_class.id]),
+                {"session_id": self.fixture.session.id, "term": "First"},
+                secure=True,
+            )
+            archive = zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content)))
+
+        pool.assert_not_called()
+        connections.close_all.assert_not_called()
+        self.assertEqual(len(archive.namelist()), 3)
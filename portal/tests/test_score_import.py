@@ -0,0 +1,64 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.urls import reverse
+
+from academics.models import StudentResult
+from academics.tests.fixtures import add_results, build_class
+from accounts.models import User
+from teachers.models import TeacherProfile
+
+
+class ScoreUploadViewTests(TestCase):
+    def setUp(self):
+        self.fixture = build_class(["S1", "S2"], ["Maths"], name="UPLOAD")
+        add_results(self.fixture, "First", {"S1": {"Maths": (10, 10, 30)}})
+        self.user = User.objects.create_user(
+            username="upload-admin", password="x", role=User.Role.SCHOOL_ADMIN, school=self.fixture.school
+        )
+        self.client.force_login(self.user)
+
+    def upload(self, text, **extra):
+        return self.client.post(
+            reverse("portal:teacher_upload_subject_scores", args=[self.fixture.school_class.id]),
+            {
+                "subject_id": self.fixture.subjects["Maths"].id,
+                "session_id": self.fixture.session.id,
+                "term": "First",
+                "file": SimpleUploadedFile("scores.csv", text.encode()),
+                **extra,
+            },
+            secure=True,
+        )
+
+    def stored(self):
+        return {
+            student_id: (test1, test2, exam)
+            for student_id, test1, test2, exam in StudentResult.objects.values_list(
+                "student_id", "test1", "test2", "exam"
+            )
+        }
+
+    def test_dry_run_writes_nothing_and_apply_saves(self):
+        sheet = "admission,test1,test2,exam\nS1,,12,40\nS2,5,5,20\n"
+        before = self.stored()
+
+        response = self.upload(sheet)
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertTrue(body["dry_run"])
+        self.assertEqual((body["summary"]["new"], body["summary"]["changed"]), (1, 1))
+        self.assertEqual(self.stored(), before)
+
+        response = self.upload(sheet, apply="1")
+        self.assertFalse(response.json()["dry_run"])
+        s1, s2 = self.fixture.students["S1"].id, self.fixture.students["S2"].id
+        self.assertEqual(self.stored(), {s1: (10, 12, 40), s2: (5, 5, 20)})
+
+    def test_teacher_not_assigned_to_the_subject_is_refused(self):
+        teacher = User.objects.create_user(
+            username="upload-teacher", password="x", role=User.Role.TEACHER, school=self.fixture.school
+        )
+        TeacherProfile.objects.create(user=teacher, school=self.fixture.school, staff_id="T1", phone="-")
+        self.client.force_login(teacher)
+        self.assertEqual(self.upload("admission,test1,test2,exam\nS1,1,1,1\n").status_code, 403)
+        self.assertEqual(StudentResult.objects.get().exam, 30)
@@ -0,0 +1,64 @@
+import json
+
+from django.test import TestCase
+from django.urls import reverse
+
+from academics.models import StudentResult
+from academics.tests.fixtures import add_results, build_class
+from accounts.models import User
+
+
+class ScoreSyncTests(TestCase):
+    def setUp(self):
+        self.fixture = build_class(["S1", "S2"], ["Maths"])
+        add_results(self.fixture, "First", {"S1": {"Maths": (10, 10, 30)}})
+        self.user = User.objects.create_user(
+            username="admin", password="x", role=User.Role.SCHOOL_ADMIN, school=self.fixture.school
+        )
+        self.client.force_login(self.user)
+
+    def sync(self, changes, **headers):
+        return self.client.post(
+            reverse("portal:teacher_sync_subject_scores", args=[self.fixture.school_class.id]),
+            json.dumps({
+                "subject_id": self.fixture.subjects["Maths"].id,
+                "session_id": self.fixture.session.id,
+                "term": "First",
+                "changes": changes,
+            }),
+            content_type="application/json",
+            secure=True,
+            headers=headers,
+        )
+
+    def result(self, admission):
+        return StudentResult.objects.get(student=self.fixture.students[admission], term="First")
+
+    def test_stale_base_version_is_reported_and_rest_of_batch_applied(self):
+        s1, s2 = self.fixture.students["S1"], self.fixture.students["S2"]
+        version = self.result("S1").version
+
+        response = self.sync([
+            {"student_id": s1.id, "base_version": version - 1, "exam": 40},
+            {"student_id": s2.id, "base_version": 0, "exam": 50},
+        ])
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([conflict["student_id"] for conflict in data["conflicts"]], [s1.id])
+        self.assertEqual(data["conflicts"][0]["server"]["exam"], 30)
+        self.assertEqual([row["student_id"] for row in data["applied"]], [s2.id])
+        self.assertEqual(self.result("S1").exam, 30)
+        self.assertEqual(self.result("S2").exam, 50)
+
+    def test_current_base_version_is_applied(self):
+        s1 = self.fixture.students["S1"]
+        version = self.result("S1").version
+
+        response = self.sync([{"student_id": s1.id, "base_version": version, "exam": 40}])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["conflicts"], [])
+        result = self.result("S1")
+        self.assertEqual((result.exam, result.total), (40, 60))
+        self.assertGreater(result.version, version)
@@ -18,6 +18,9 @@ urlpatterns = [
     path("teacher/<int:class_id>/add-student/", views.teacher_add_student, name="teacher_add_student"),
     path("teacher/<int:class_id>/enter-scores/", views.teacher_enter_subject_scores, name="teacher_enter_subject_scores"),
     path("teacher/<int:class_id>/save-scores/", views.teacher_save_subject_scores, name="teacher_save_subject_scores"),
+    path("teacher/<int:class_id>/upload-scores/", views.teacher_upload_subject_scores, name="teacher_upload_subject_scores"),
+    path("teacher/<int:class_id>/scores/sync/", views.teacher_sync_subject_scores, name="teacher_sync_subject_scores"),
+    path("teacher/<int:class_id>/scores/changes/", views.teacher_subject_score_changes, name="teacher_subject_score_changes"),
     path("teacher/<int:class_id>/results/", views.teacher_generate_results, name="teacher_generate_results"),
     path("teacher/<int:class_id>/compute-results/", views.teacher_trigger_compute_results, name="teacher_trigger_compute_results"),
     path("teacher/<int:class_id>/final-results/", views.form_teacher_generate_final_results, name="form_teacher_generate_final_results"),
@@ -32,14 +35,26 @@ urlpatterns = [
     path("teacher/<int:class_id>/assessments/affective-traits/", views.save_student_affective_traits, name="save_student_affective_traits"),
     path("teacher/<int:class_id>/assessments/psychomotor-traits/", views.save_student_psychomotor_traits, name="save_student_psychomotor_traits"),
     path("teacher/<int:class_id>/assessments/term-reports/", views.save_student_term_reports, name="save_student_term_reports"),
+    path("teacher/<int:class_id>/assessments/save/", views.save_student_assessments, name="save_student_assessments"),
     
     # PDF Download
     path("admin/<int:class_id>/results-pdf/", views.download_class_results_pdf, name="download_class_results_pdf"),
     path("admin/<int:class_id>/comprehensive-pdf/", views.download_comprehensive_result_pdf, name="download_comprehensive_result_pdf"),
     path("teacher/<int:class_id>/broadsheet-pdf/", views.download_form_teacher_broadsheet_pdf, name="download_form_teacher_broadsheet_pdf"),
     
+    # Background Exports (built by the export_worker command)
+    path("exports/", views.queue_export, name="queue_export"),
+    path("exports/<int:job_id>/", views.export_status, name="export_status"),
+    path("exports/<int:job_id>/download/", views.download_export, name="download_export"),
+    
+    # Result Publishing (frozen report cards)
+    path("teacher/<int:class_id>/publish-results/", views.publish_class_results, name="publish_class_results"),
+    path("student/results/<int:session_id>/<str:term>/", views.student_published_result, name="student_published_result"),
+    path("student/results/<int:session_id>/<str:term>/pdf/", views.download_published_result_pdf, name="download_published_result_pdf"),
+    
     # Principal Comments (School Admin)
     path("admin/<int:class_id>/principal-comments/", views.save_principal_comments, name="save_principal_comments"),
+    path("admin/principal-comments/bulk/", views.bulk_principal_comments, name="bulk_principal_comments"),
     
     # AJAX Endpoints - Data Retrieval
     path("api/students/", views.get_students_by_class, name="get_students_by_class"),
@@ -22,20 +22,8 @@ def download_class_cumulative_zip(request, class_id):
     if not session_id:
         return JsonResponse({'error': 'Missing session_id'}, status=400)
     session = AcademicSession.objects.get(id=session_id, school=school_class.school)
-    from .result_pdf_generator import generate_cumulative_result_pdf
-    from academics.services import get_cumulative_result_data
-    students = school_class.students.filter(is_active=True).order_by('last_name', 'first_name')
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-        for student in students:
-            results_data, cumulative_stats = get_cumulative_result_data(student, session)
-            pdf_buffer = generate_cumulative_result_pdf(school_class.school, student, session, results_data, cumulative_stats)
-            student_name = f"{student.last_name}_{student.first_name}".replace(' ', '_')
-            filename = f"{student_name}_{session.name}_Cumulative.pdf"
-            zip_file.writestr(filename, pdf_buffer.getvalue())
-    zip_buffer.seek(0)
     zip_filename = f"{school_class.name}_{session.name}_CumulativeResults.zip"
-    response = FileResponse(zip_buffer, content_type='application/zip')
+    response = StreamingHttpResponse(stream_zip(iter_class_cumulative_pdfs(school_class, session)), content_type='application/zip')
     response['Content-Disposition'] = f'attachment; filename="{zip_filename}"'
     return response
 @login_required
@@ -64,26 +52,39 @@ def download_cumulative_result(request):
     return response
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import JsonResponse, FileResponse
+from django.http import JsonResponse, FileResponse, HttpResponseNotModified, StreamingHttpResponse
 from django.views.decorators.http import require_GET, require_POST
-from django.db.models import Count, Q
+from django.db.models import Count, Q, Sum
 from django.contrib import messages
 from django.db import transaction
 from academics.models import (
     SchoolClass, Subject, StudentResult, ClassSubject, TermResultSummary,
     StudentAttendance, StudentAffectiveTraits, StudentPsychomotorTraits,
-    StudentTermReport, ClassTermInfo, RATING_CHOICES
+    StudentTermReport, ClassTermInfo, ScoreGridVersion, RATING_CHOICES, TERM_CHOICES
+)
+from academics.services import (
+    compute_term_results, refresh_term_results, load_class_result_matrix, save_subject_scores,
+    resolve_result_rows, upsert_results, load_subject_score_grid, sync_score_grid, score_grid_changes,
+    validate_class_assessments, save_class_assessments, save_result,
+    generate_term_comments, apply_principal_comments, AFFECTIVE_FIELDS, PSYCHOMOTOR_FIELDS
 )
-from academics.services import compute_term_results
+from academics.grading import get_grading_scale
 from students.models import Student
 from teachers.models import TeacherProfile
 from schools.models import AcademicSession, School
 from accounts.models import User
 from .forms import StudentResultForm
+from .idempotency import idempotent
+from .report_cards import (
+    iter_class_report_cards, iter_class_cumulative_pdfs, report_card_kwargs, published_class, published_school
+)
+from .zip_stream import stream_zip
+from .exports import check_export_jobs, enqueue_export, iter_export_zip, job_payload
+from .models import ExportJob
 from .result_pdf_generator import generate_student_result_pdf, generate_class_broadsheet_pdf
 import json
-import zipfile
 import io
+from collections import defaultdict
 # --- AI Assistant (Chatbot, Question Generator, Lesson Note, Download, CBT Publish) ---
 from ai_assistant.services import generate_cbt_questions  # if needed for AI endpoints
 from django.views.decorators.csrf import csrf_exempt
@@ -245,12 +246,24 @@ def student_dashboard(request):
     # Get all result summaries for this student (most recent first)
     summaries = TermResultSummary.objects.filter(student=student).select_related('academic_session').order_by('-academic_session__name', '-term')
     latest = summaries.first() if summaries else None
+    from academics.models import SessionResultSummary, PublishedResultSnapshot
+    # Terms with a published report card link straight to the frozen PDF
+    published = set(
+        PublishedResultSnapshot.objects.filter(student=student)
+        .values_list('publication__academic_session_id', 'publication__term')
+    )
+    for summary in summaries:
+        summary.is_published = (summary.academic_session_id, summary.term) in published
+    session_summary = SessionResultSummary.objects.filter(
+        student=student, academic_session=current_session
+    ).order_by('-updated_at').first() if current_session else None
 
     context = {
         'student': student,
         'current_session': current_session,
         'summaries': summaries,
         'latest': latest,
+        'session_summary': session_summary,
     }
     return render(request, "portal/student_dashboard.html", context)
 
@@ -362,51 +375,30 @@ def get_students_results(request):
     except SchoolClass.DoesNotExist:
         return JsonResponse({'error': 'Access denied'}, status=403)
     
-    students = Student.objects.filter(
-        school_class_id=class_id,
-        is_active=True
-    ).order_by('last_name', 'first_name')
+    # One LEFT JOIN of active students to their results; blanks come back as None
+    grid = load_subject_score_grid(
+        school_class, subject_id, session_id, term,
+        ('test1', 'test2', 'exam', 'total', 'grade', 'version')
+    )
     
-    data = []
-    for student in students:
-        try:
-            result = StudentResult.objects.get(
-                student=student,
-                school_class_id=class_id,
-                subject_id=subject_id,
-                academic_session_id=session_id,
-                term=term
-            )
-            result_data = {
-                'id': result.id,
-                'student_id': student.id,
-                'student_name': f"{student.last_name} {student.first_name}",
-                'admission_number': student.admission_number,
-                'test1': result.test1,
-                'test2': result.test2,
-                'exam': result.exam,
-                'total': result.total,
-                'grade': result.grade,
-            }
-        except StudentResult.DoesNotExist:
-            result_data = {
-                'id': None,
-                'student_id': student.id,
-                'student_name': f"{student.last_name} {student.first_name}",
-                'admission_number': student.admission_number,
-                'test1': 0,
-                'test2': 0,
-                'exam': 0,
-                'total': 0,
-                'grade': '-',
-            }
-        
-        data.append(result_data)
+    data = [{
+        'id': row['result_id'],
+        'student_id': row['id'],
+        'student_name': f"{row['last_name']} {row['first_name']}",
+        'admission_number': row['admission_number'],
+        'test1': row['test1'] or 0,
+        'test2': row['test2'] or 0,
+        'exam': row['exam'] or 0,
+        'total': row['total'] or 0,
+        'grade': row['grade'] if row['result_id'] else '-',
+        'version': row['version'] or 0,
+    } for row in grid]
     
     return JsonResponse({
         'success': True,
         'count': len(data),
-        'students': data
+        'students': data,
+        'version': ScoreGridVersion.current(school_class.id, subject_id, session_id, term),
     })
 
 
@@ -457,6 +449,7 @@ def get_term_results(request):
 
 @login_required
 @require_POST
+@idempotent
 def save_student_result(request):
     """AJAX endpoint to save individual student result"""
     try:
@@ -522,7 +515,8 @@ def save_student_result(request):
         result.test2 = test2
         result.exam = exam
         
-        result.save()
+        # Keeps subject/class positions current without a full recompute
+        save_result(result)
         
         return JsonResponse({
             'success': True,
@@ -537,6 +531,7 @@ def save_student_result(request):
 
 @login_required
 @require_POST
+@idempotent
 def bulk_save_results(request):
     """AJAX endpoint to save multiple student results at once"""
     try:
@@ -552,43 +547,36 @@ def bulk_save_results(request):
         return JsonResponse({'error': 'Teacher profile not found'}, status=404)
     
     results_list = data.get('results', [])
-    saved_count = 0
-    errors = []
+    if not isinstance(results_list, list):
+        return JsonResponse({'error': 'results must be a list'}, status=400)
+    
+    # Resolve every referenced student/class/subject/session in one query per model
+    entries, row_errors = resolve_result_rows(results_list, teacher_profile.school)
     
     try:
         with transaction.atomic():
-            for result_data in results_list:
-                try:
-                    student = Student.objects.get(id=result_data.get('student_id'))
-                    school_class = SchoolClass.objects.get(id=result_data.get('class_id'))
-                    subject = Subject.objects.get(id=result_data.get('subject_id'))
-                    session = AcademicSession.objects.get(id=result_data.get('session_id'))
-                    
-                    # Verify teacher has access
-                    if school_class.school != teacher_profile.school:
-                        errors.append(f"Access denied for {student.admission_number}")
-                        continue
-                    
-                    result, created = StudentResult.objects.update_or_create(
-                        student=student,
-                        school_class=school_class,
-                        subject=subject,
-                        academic_session=session,
-                        term=result_data.get('term'),
-                        defaults={
-                            'test1': int(result_data.get('test1', 0)),
-                            'test2': int(result_data.get('test2', 0)),
-                            'exam': int(result_data.get('exam', 0)),
-                        }
-                    )
-                    saved_count += 1
-                except Exception as e:
-                    errors.append(str(e))
+            saved = upsert_results(
+                entries, ('test1', 'test2', 'exam'),
+                get_grading_scale(teacher_profile.school)
+            )
+            
+            # Keep positions current for every class/term that was touched
+            changed = defaultdict(list)
+            for entry in saved:
+                changed[(entry['school_class_id'], entry['academic_session_id'], entry['term'])].append(
+                    (entry['student_id'], entry['subject_id'])
+                )
+            classes = SchoolClass.objects.in_bulk({class_id for class_id, _, _ in changed})
+            sessions = AcademicSession.objects.in_bulk({session_id for _, session_id, _ in changed})
+            for (class_id, session_id, term), pairs in changed.items():
+                refresh_term_results(classes[class_id], sessions[session_id], term, pairs)
         
+        saved_count = len(entries)
         return JsonResponse({
             'success': True,
             'saved_count': saved_count,
-            'errors': errors,
+            'errors': [f"Row {e['row'] + 1}: {e['error']}" for e in row_errors],
+            'row_errors': row_errors,
             'message': f'Successfully saved {saved_count} results'
         })
     except Exception as e:
@@ -597,6 +585,7 @@ def bulk_save_results(request):
 
 @login_required
 @require_POST
+@idempotent
 def compute_class_results(request):
     """AJAX endpoint to compute term results for a class"""
     try:
@@ -720,6 +709,7 @@ def teacher_class_management(request, class_id):
 
 @login_required
 @require_POST
+@idempotent
 def teacher_add_student(request, class_id):
     """AJAX endpoint to add a new student to a class"""
     user = request.user
@@ -827,58 +817,41 @@ def teacher_enter_subject_scores(request, class_id):
     except ClassSubject.DoesNotExist:
         return JsonResponse({'error': 'Access denied'}, status=403)
     
-    # Get all students
-    students = school_class.students.filter(is_active=True).order_by('last_name', 'first_name')
+    # One LEFT JOIN of active students to their results; blanks come back as None
+    grid = load_subject_score_grid(school_class, subject.id, session.id, term, ('test1', 'test2', 'exam', 'version'))
     
     students_data = []
-    for student in students:
-        try:
-            result = StudentResult.objects.get(
-                student=student,
-                school_class=school_class,
-                subject=subject,
-                academic_session=session,
-                term=term
-            )
-            students_data.append({
-                'student': {
-                    'id': student.id,
-                    'first_name': student.first_name,
-                    'last_name': student.last_name,
-                    'admission_number': student.admission_number,
-                },
-                'result': {
-                    'id': result.id,
-                    'test1': result.test1,
-                    'test2': result.test2,
-                    'exam': result.exam,
-                }
-            })
-        except StudentResult.DoesNotExist:
-            students_data.append({
-                'student': {
-                    'id': student.id,
-                    'first_name': student.first_name,
-                    'last_name': student.last_name,
-                    'admission_number': student.admission_number,
-                },
-                'result': {
-                    'test1': 0,
-                    'test2': 0,
-                    'exam': 0,
-                }
-            })
+    for row in grid:
+        result = {
+            'test1': row['test1'] or 0,
+            'test2': row['test2'] or 0,
+            'exam': row['exam'] or 0,
+            'version': row['version'] or 0,
+        }
+        if row['result_id']:
+            result = {'id': row['result_id'], **result}
+        students_data.append({
+            'student': {
+                'id': row['id'],
+                'first_name': row['first_name'],
+                'last_name': row['last_name'],
+                'admission_number': row['admission_number'],
+            },
+            'result': result
+        })
     
     return JsonResponse({
         'success': True,
         'subject': subject.name,
         'term': term,
-        'students': students_data
+        'students': students_data,
+        'version': ScoreGridVersion.current(school_class.id, subject.id, session.id, term),
     })
 
 
 @login_required
 @require_POST
+@idempotent
 def teacher_save_subject_scores(request, class_id):
     """AJAX endpoint to save all scores for a subject in bulk"""
     try:
@@ -921,49 +894,55 @@ def teacher_save_subject_scores(request, class_id):
     except (SchoolClass.DoesNotExist, Subject.DoesNotExist, AcademicSession.DoesNotExist, ClassSubject.DoesNotExist):
         return JsonResponse({'error': 'Access denied or invalid data'}, status=403)
     
+    # Validate the whole sheet up front; one query checks every student
+    class_student_ids = set(
+        Student.objects.filter(
+            id__in=[entry.get('student_id') for entry in scores if str(entry.get('student_id', '')).isdigit()],
+            school_class=school_class
+        ).values_list('id', flat=True)
+    )
+    
+    valid_scores = {}
     saved_count = 0
     errors = []
+    for score_entry in scores:
+        student_id = score_entry.get('student_id')
+        try:
+            test1 = int(score_entry.get('test1', 0))
+            test2 = int(score_entry.get('test2', 0))
+            exam = int(score_entry.get('exam', 0))
+        except (TypeError, ValueError) as e:
+            errors.append(f"Error saving student {student_id}: {str(e)}")
+            continue
+        
+        # Validate scores
+        if not (0 <= test1 <= 20):
+            errors.append(f"Student {student_id}: Test 1 must be 0-20")
+            continue
+        if not (0 <= test2 <= 20):
+            errors.append(f"Student {student_id}: Test 2 must be 0-20")
+            continue
+        if not (0 <= exam <= 60):
+            errors.append(f"Student {student_id}: Exam must be 0-60")
+            continue
+        
+        if not str(student_id).isdigit() or int(student_id) not in class_student_ids:
+            errors.append(f"Student {student_id} not found")
+            continue
+        
+        # CAs are reset; a repeated student keeps the last entry
+        valid_scores[int(student_id)] = {'test1': test1, 'test2': test2, 'exam': exam}
+        saved_count += 1
     
     try:
         with transaction.atomic():
-            for score_entry in scores:
-                try:
-                    student_id = score_entry.get('student_id')
-                    test1 = int(score_entry.get('test1', 0))
-                    test2 = int(score_entry.get('test2', 0))
-                    exam = int(score_entry.get('exam', 0))
-                    
-                    # Validate scores
-                    if not (0 <= test1 <= 20):
-                        errors.append(f"Student {student_id}: Test 1 must be 0-20")
-                        continue
-                    if not (0 <= test2 <= 20):
-                        errors.append(f"Student {student_id}: Test 2 must be 0-20")
-                        continue
-                    if not (0 <= exam <= 60):
-                        errors.append(f"Student {student_id}: Exam must be 0-60")
-                        continue
-                    
-                    student = Student.objects.get(id=student_id, school_class=school_class)
-                    
-                    result, created = StudentResult.objects.update_or_create(
-                        student=student,
-                        school_class=school_class,
-                        subject=subject,
-                        academic_session=session,
-                        term=term,
-                        defaults={
-                            'test1': test1,
-                            'test2': test2,
-                            'exam': exam,
-                            'ca1': 0, 'ca2': 0, 'ca3': 0, 'ca4': 0 # Reset CAs
-                        }
-                    )
-                    saved_count += 1
-                except Student.DoesNotExist:
-                    errors.append(f"Student {student_id} not found")
-                except Exception as e:
-                    errors.append(f"Error saving student {student_id}: {str(e)}")
+            saved_student_ids = save_subject_scores(school_class, subject, session, term, valid_scores)
+            
+            # Keep subject/class positions current without a full recompute
+            refresh_term_results(
+                school_class, session, term,
+                [(sid, subject.id) for sid in saved_student_ids]
+            )
         
         return JsonResponse({
             'success': True,
@@ -975,6 +954,173 @@ def teacher_save_subject_scores(request, class_id):
         return JsonResponse({'error': str(e)}, status=400)
 
 
+@login_required
+@require_POST
+def teacher_upload_subject_scores(request, class_id):
+    """
+    Import a CSV/XLSX score sheet (admission number, test1, test2, exam) for
+    a subject. Returns a dry-run diff unless 'apply' is set, in which case
+    every valid row is saved in one bulk upsert. Blank score cells keep the
+    stored score.
+    """
+    grid, error = _score_grid_for_request(request.user, class_id, request.POST)
+    if error:
+        return error
+    school_class, subject, session, term = grid
+    
+    sheet = request.FILES.get('file')
+    if sheet is None:
+        return JsonResponse({'error': 'Missing parameters'}, status=400)
+    apply = request.POST.get('apply') in ('1', 'true', 'yes')
+    
+    from academics.score_import import plan_score_import, ScoreSheetError
+    try:
+        plan = plan_score_import(sheet, school_class, subject, session, term)
+    except ScoreSheetError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    
+    summary = {
+        'valid_rows': len(plan['scores']),
+        'new': sum(1 for change in plan['changes'] if change['status'] == 'new'),
+        'changed': sum(1 for change in plan['changes'] if change['status'] == 'changed'),
+        'unchanged': plan['unchanged'],
+        'errors': len(plan['row_errors']),
+    }
+    
+    if apply:
+        try:
+            with transaction.atomic():
+                saved_student_ids = save_subject_scores(school_class, subject, session, term, plan['scores'])
+                refresh_term_results(
+                    school_class, session, term,
+                    [(sid, subject.id) for sid in saved_student_ids]
+                )
+        except Exception as e:
+            return JsonResponse({'error': str(e)}, status=400)
+    
+    return JsonResponse({
+        'success': True,
+        'dry_run': not apply,
+        'summary': summary,
+        'changes': plan['changes'],
+        'row_errors': plan['row_errors'],
+        'message': (
+            f"Saved scores for {summary['valid_rows']} students" if apply
+            else f"{summary['new']} new, {summary['changed']} changed, {summary['unchanged']} unchanged, {summary['errors']} rejected"
+        )
+    })
+
+
+def _score_grid_for_request(user, class_id, params):
+    """
+    Resolves the class, subject, session and term of a score grid request
+    for a teacher of the subject or a school admin.
+    Returns (grid, error_response) where grid is (school_class, subject, session, term).
+    """
+    if user.role not in [User.Role.TEACHER, User.Role.SCHOOL_ADMIN]:
+        return None, JsonResponse({'error': 'Unauthorized'}, status=403)
+    
+    teacher_profile = None
+    if user.role == User.Role.TEACHER:
+        try:
+            teacher_profile = TeacherProfile.objects.get(user=user)
+        except TeacherProfile.DoesNotExist:
+            return None, JsonResponse({'error': 'Teacher profile not found'}, status=404)
+    
+    subject_id = params.get('subject_id')
+    session_id = params.get('session_id')
+    term = params.get('term')
+    if not all([subject_id, session_id, term]):
+        return None, JsonResponse({'error': 'Missing parameters'}, status=400)
+    
+    try:
+        school_class = SchoolClass.objects.get(id=class_id, school=user.school)
+        subject = Subject.objects.get(id=subject_id, school=user.school)
+        session = AcademicSession.objects.get(id=session_id, school=user.school)
+        
+        # Verify teacher teaches this subject in this class (unless admin)
+        if user.role == User.Role.TEACHER:
+            ClassSubject.objects.get(
+                school_class=school_class,
+                subject=subject,
+                teacher=teacher_profile
+            )
+    except (SchoolClass.DoesNotExist, Subject.DoesNotExist, AcademicSession.DoesNotExist, ClassSubject.DoesNotExist):
+        return None, JsonResponse({'error': 'Access denied or invalid data'}, status=403)
+    
+    return (school_class, subject, session, term), None
+
+
+@login_required
+@require_POST
+@idempotent
+def teacher_sync_subject_scores(request, class_id):
+    """
+    Delta sync for the score grid: applies only the edited cells, each with
+    the row version the client last saw, and returns conflicts, the new
+    row versions and everything else that changed since the client's version.
+
+    A batch is applied cell by cell, not all or nothing: cells whose
+    base_version still matches are saved even when others conflict, so
+    the answer is 200 whenever the batch was processed. Clients must read
+    `conflicts` (rejected cells, with the server's values) and `errors`
+    (invalid cells) rather than the status code to learn what was not saved.
+    """
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return JsonResponse({'error': 'Invalid JSON'}, status=400)
+    
+    grid, error = _score_grid_for_request(request.user, class_id, data)
+    if error:
+        return error
+    
+    changes = data.get('changes', [])
+    if not isinstance(changes, list):
+        return JsonResponse({'error': 'changes must be a list'}, status=400)
+    
+    try:
+        since = int(data.get('since', 0))
+    except (TypeError, ValueError):
+        return JsonResponse({'error': 'since must be a version number'}, status=400)
+    
+    try:
+        applied, conflicts, errors = sync_score_grid(*grid, changes)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    
+    school_class, subject, session, term = grid
+    return JsonResponse({
+        'success': True,
+        'applied': applied,
+        'conflicts': conflicts,
+        'errors': errors,
+        'version': ScoreGridVersion.current(school_class.id, subject.id, session.id, term),
+        'changes': score_grid_changes(school_class, subject, session, term, since),
+    })
+
+
+@login_required
+@require_GET
+def teacher_subject_score_changes(request, class_id):
+    """Score grid rows changed since version ?since=N, plus the grid's current version."""
+    grid, error = _score_grid_for_request(request.user, class_id, request.GET)
+    if error:
+        return error
+    
+    try:
+        since = int(request.GET.get('since', 0))
+    except ValueError:
+        return JsonResponse({'error': 'since must be a version number'}, status=400)
+    
+    school_class, subject, session, term = grid
+    return JsonResponse({
+        'success': True,
+        'version': ScoreGridVersion.current(school_class.id, subject.id, session.id, term),
+        'changes': score_grid_changes(school_class, subject, session, term, since),
+    })
+
+
 @login_required
 @require_GET
 def teacher_generate_results(request, class_id):
@@ -1028,6 +1174,7 @@ def teacher_generate_results(request, class_id):
 
 @login_required
 @require_POST
+@idempotent
 def teacher_trigger_compute_results(request, class_id):
     """AJAX endpoint to trigger computation of term results for a class"""
     try:
@@ -1107,6 +1254,7 @@ def teacher_trigger_compute_results(request, class_id):
 
 @login_required
 @require_POST
+@idempotent
 def form_teacher_generate_final_results(request, class_id):
     """
     AJAX endpoint for form teacher to generate combined final results
@@ -1152,77 +1300,10 @@ def form_teacher_generate_final_results(request, class_id):
         return JsonResponse({'error': 'Class or session not found'}, status=404)
     
     try:
-        # Get all students in the class
-        students = school_class.students.filter(is_active=True).order_by('last_name', 'first_name')
-        
-        # Get all subjects for this class
-        all_subjects = Subject.objects.filter(
-            class_subjects__school_class=school_class
-        ).distinct().order_by('name')
-        
-        student_results = []
-        
-        for student in students:
-            # Get all scores for this student across all subjects
-            scores_by_subject = {}
-            total_score = 0
-            subject_count = 0
-            
-            for subject in all_subjects:
-                try:
-                    result = StudentResult.objects.get(
-                        student=student,
-                        school_class=school_class,
-                        subject=subject,
-                        academic_session=session,
-                        term=term
-                    )
-                    scores_by_subject[subject.name] = {
-                        'ca1': result.ca1,
-                        'ca2': result.ca2,
-                        'ca3': result.ca3,
-                        'ca4': result.ca4,
-                        'test1': result.test1,
-                        'test2': result.test2,
-                        'exam': result.exam,
-                        'total': result.total,
-                        'grade': result.grade
-                    }
-                    total_score += result.total
-                    subject_count += 1
-                except StudentResult.DoesNotExist:
-                    scores_by_subject[subject.name] = {
-                        'ca1': 0, 'ca2': 0, 'ca3': 0, 'ca4': 0,
-                        'test1': 0, 'test2': 0,
-                        'exam': 0, 'total': 0, 'grade': '-'
-                    }
-            
-            # Calculate average across all subjects
-            average = (total_score / subject_count) if subject_count > 0 else 0
-            
-            student_results.append({
-                'student_id': student.id,
-                'student': str(student),
-                'admission': student.admission_number,
-                'subjects': scores_by_subject,
-                'total': total_score,
-                'average': round(average, 2),
-                'subject_count': subject_count,
-            })
-        
-        # Sort by average to assign positions (handle ties)
-        student_results.sort(key=lambda x: x['average'], reverse=True)
-        
-        # Assign positions (handle ties correctly)
-        current_position = 1
-        last_average = None
-        
-        for index, result in enumerate(student_results):
-            if last_average is not None and result['average'] < last_average:
-                current_position = index + 1
-            
-            result['position'] = current_position
-            last_average = result['average']
+        # Load every result for the class in one query (scores, totals, averages, positions)
+        matrix = load_class_result_matrix(school_class, session, term)
+        all_subjects = matrix.subjects
+        student_results = matrix.student_rows()
         
         return JsonResponse({
             'success': True,
@@ -1297,75 +1378,10 @@ def download_class_results_pdf(request, class_id):
         return JsonResponse({'error': 'Academic session not found'}, status=404)
     
     try:
-        # Get all students in the class
-        students = school_class.students.filter(is_active=True).order_by('last_name', 'first_name')
-        
-        # Get all subjects for this class
-        all_subjects = Subject.objects.filter(
-            class_subjects__school_class=school_class
-        ).distinct().order_by('name')
-        
-        student_results = []
-        
-        for student in students:
-            # Get all scores for this student across all subjects
-            scores_by_subject = {}
-            total_score = 0
-            subject_count = 0
-            
-            for subject in all_subjects:
-                try:
-                    result = StudentResult.objects.get(
-                        student=student,
-                        school_class=school_class,
-                        subject=subject,
-                        academic_session=session,
-                        term=term
-                    )
-                    scores_by_subject[subject.name] = {
-                        'test1': result.test1,
-                        'test2': result.test2,
-                        'exam': result.exam,
-                        'total': result.total,
-                        'grade': result.grade
-                    }
-                    total_score += result.total
-                    subject_count += 1
-                except StudentResult.DoesNotExist:
-                    scores_by_subject[subject.name] = {
-                        'test1': 0,
-                        'test2': 0,
-                        'exam': 0,
-                        'total': 0,
-                        'grade': '-'
-                    }
-            
-            # Calculate average across all subjects
-            average = (total_score / subject_count) if subject_count > 0 else 0
-            
-            student_results.append({
-                'student_id': student.id,
-                'student': str(student),
-                'admission': student.admission_number,
-                'subjects': scores_by_subject,
-                'total': total_score,
-                'average': round(average, 2),
-                'subject_count': subject_count,
-            })
-        
-        # Sort by average to assign positions (handle ties)
-        student_results.sort(key=lambda x: x['average'], reverse=True)
-        
-        # Assign positions (handle ties correctly)
-        current_position = 1
-        last_average = None
-        
-        for index, result in enumerate(student_results):
-            if last_average is not None and result['average'] < last_average:
-                current_position = index + 1
-            
-            result['position'] = current_position
-            last_average = result['average']
+        # Load every result for the class in one query (scores, totals, averages, positions)
+        matrix = load_class_result_matrix(school_class, session, term)
+        all_subjects = matrix.subjects
+        student_results = matrix.student_rows()
         
         # Generate Broadsheet PDF using the new generator
         from .result_pdf_generator import generate_class_broadsheet_pdf
@@ -1429,79 +1445,10 @@ def download_form_teacher_broadsheet_pdf(request, class_id):
         return JsonResponse({'error': 'Academic session not found'}, status=404)
     
     try:
-        # Get all students in the class
-        students = school_class.students.filter(is_active=True).order_by('last_name', 'first_name')
-        
-        # Get all subjects for this class
-        all_subjects = Subject.objects.filter(
-            class_subjects__school_class=school_class
-        ).distinct().order_by('name')
-        
-        student_results = []
-        
-        for student in students:
-            # Get all scores for this student across all subjects
-            scores_by_subject = {}
-            total_score = 0
-            subject_count = 0
-            
-            for subject in all_subjects:
-                try:
-                    result = StudentResult.objects.get(
-                        student=student,
-                        school_class=school_class,
-                        subject=subject,
-                        academic_session=session,
-                        term=term
-                    )
-                    scores_by_subject[subject.name] = {
-                        'ca1': result.ca1,
-                        'ca2': result.ca2,
-                        'ca3': result.ca3,
-                        'ca4': result.ca4,
-                        'test1': result.test1,
-                        'test2': result.test2,
-                        'exam': result.exam,
-                        'total': result.total,
-                        'grade': result.grade,
-                        'subject_position': result.subject_position,
-                        'subject_highest': result.subject_highest,
-                    }
-                    total_score += result.total
-                    subject_count += 1
-                except StudentResult.DoesNotExist:
-                    scores_by_subject[subject.name] = {
-                        'ca1': 0, 'ca2': 0, 'ca3': 0, 'ca4': 0,
-                        'test1': 0, 'test2': 0, 'exam': 0, 'total': 0,
-                        'grade': '-', 'subject_position': None, 'subject_highest': 0
-                    }
-            
-            # Calculate average across all subjects
-            average = (total_score / subject_count) if subject_count > 0 else 0
-            
-            student_results.append({
-                'student_id': student.id,
-                'student': str(student),
-                'admission': student.admission_number,
-                'subjects': scores_by_subject,
-                'total': total_score,
-                'average': round(average, 2),
-                'subject_count': subject_count,
-            })
-        
-        # Sort by average to assign positions (handle ties)
-        student_results.sort(key=lambda x: x['average'], reverse=True)
-        
-        # Assign positions (handle ties correctly)
-        current_position = 1
-        last_average = None
-        
-        for index, result in enumerate(student_results):
-            if last_average is not None and result['average'] < last_average:
-                current_position = index + 1
-            
-            result['position'] = current_position
-            last_average = result['average']
+        # Load every result for the class in one query (scores, totals, averages, positions)
+        matrix = load_class_result_matrix(school_class, session, term)
+        all_subjects = matrix.subjects
+        student_results = matrix.student_rows()
         
         # Generate class broadsheet PDF
         pdf_buffer = generate_class_broadsheet_pdf(
@@ -1532,6 +1479,7 @@ def download_form_teacher_broadsheet_pdf(request, class_id):
 
 @login_required
 @require_POST
+@idempotent
 def create_teacher(request):
     """Create a new teacher (School Admin only)"""
     if request.user.role != User.Role.SCHOOL_ADMIN:
@@ -1591,6 +1539,7 @@ def create_teacher(request):
 
 @login_required
 @require_POST
+@idempotent
 def edit_teacher(request, teacher_id):
     if request.user.role != User.Role.SCHOOL_ADMIN:
         return JsonResponse({'error': 'Unauthorized'}, status=403)
@@ -1616,6 +1565,7 @@ def edit_teacher(request, teacher_id):
 
 @login_required
 @require_POST
+@idempotent
 def delete_teacher(request, teacher_id):
     if request.user.role != User.Role.SCHOOL_ADMIN:
         return JsonResponse({'error': 'Unauthorized'}, status=403)
@@ -1627,6 +1577,7 @@ def delete_teacher(request, teacher_id):
 
 @login_required
 @require_POST
+@idempotent
 def edit_subject(request, subject_id):
     if request.user.role != User.Role.SCHOOL_ADMIN:
         return JsonResponse({'error': 'Unauthorized'}, status=403)
@@ -1642,6 +1593,7 @@ def edit_subject(request, subject_id):
 
 @login_required
 @require_POST
+@idempotent
 def delete_subject(request, subject_id):
     if request.user.role != User.Role.SCHOOL_ADMIN:
         return JsonResponse({'error': 'Unauthorized'}, status=403)
@@ -1651,6 +1603,7 @@ def delete_subject(request, subject_id):
 
 @login_required
 @require_POST
+@idempotent
 def edit_class(request, class_id):
     if request.user.role != User.Role.SCHOOL_ADMIN:
         return JsonResponse({'error': 'Unauthorized'}, status=403)
@@ -1672,6 +1625,7 @@ def edit_class(request, class_id):
 
 @login_required
 @require_POST
+@idempotent
 def delete_class(request, class_id):
     if request.user.role != User.Role.SCHOOL_ADMIN:
         return JsonResponse({'error': 'Unauthorized'}, status=403)
@@ -1681,6 +1635,7 @@ def delete_class(request, class_id):
 
 @login_required
 @require_POST
+@idempotent
 def create_session(request):
     """Create a new academic session (School Admin only)"""
     if request.user.role != User.Role.SCHOOL_ADMIN:
@@ -1734,6 +1689,7 @@ def list_teachers(request):
 
 @login_required
 @require_POST
+@idempotent
 def create_subject(request):
     """Create a new subject (School Admin only)"""
     if request.user.role != User.Role.SCHOOL_ADMIN:
@@ -1793,6 +1749,7 @@ def list_subjects(request):
 
 @login_required
 @require_POST
+@idempotent
 def create_class(request):
     """Create a new class (School Admin only)"""
     if request.user.role != User.Role.SCHOOL_ADMIN:
@@ -1862,6 +1819,7 @@ def list_classes(request):
 
 @login_required
 @require_POST
+@idempotent
 def assign_teacher_to_class(request):
     """Assign teacher to class+subject (School Admin only)"""
     if request.user.role != User.Role.SCHOOL_ADMIN:
@@ -1907,6 +1865,7 @@ def assign_teacher_to_class(request):
 
 @login_required
 @require_POST
+@idempotent
 def edit_student(request, student_id):
     user = request.user
     student = get_object_or_404(Student, id=student_id, school=user.school)
@@ -1958,6 +1917,7 @@ def edit_student(request, student_id):
 
 @login_required
 @require_POST
+@idempotent
 def delete_student(request, student_id):
     user = request.user
     student = get_object_or_404(Student, id=student_id, school=user.school)
@@ -1977,6 +1937,7 @@ def delete_student(request, student_id):
 
 @login_required
 @require_POST
+@idempotent
 def admin_add_student(request):
     """Admin endpoint to add student to ANY class"""
     if request.user.role != User.Role.SCHOOL_ADMIN:
@@ -2030,6 +1991,7 @@ def admin_add_student(request):
 
 @login_required
 @require_POST
+@idempotent
 def generate_auto_comments(request, class_id):
     """
     Generate automatic comments for students based on their performance
@@ -2046,52 +2008,8 @@ def generate_auto_comments(request, class_id):
         school_class = get_object_or_404(SchoolClass, id=class_id, school=user.school)
         session = get_object_or_404(AcademicSession, id=session_id, school=user.school)
         
-        # Get students
-        students = school_class.students.filter(is_active=True)
+        comments_generated = generate_term_comments([school_class], session, term)
         
-        # For each student, find their average and generate a comment
-        comments_generated = 0
-        for student in students:
-            # Calculate average for current term
-            results = StudentResult.objects.filter(
-                student=student,
-                school_class=school_class,
-                academic_session=session,
-                term=term
-            )
-            
-            if not results.exists():
-                continue
-                
-            total_score = sum(r.total for r in results)
-            subject_count = results.count()
-            average = total_score / subject_count if subject_count > 0 else 0
-            
-            # Generate comment based on average
-            if average >= 80:
-                comment = "An excellent result. You are a star! Keep up the brilliant performance."
-            elif average >= 70:
-                comment = "A very good performance. You have shown great potential. Keep it up."
-            elif average >= 60:
-                comment = "A good result. With more focus on your weak areas, you can do even better."
-            elif average >= 50:
-                comment = "A fair performance. You need to put in more effort to reach your full potential."
-            elif average >= 40:
-                comment = "Pass mark obtained. You are capable of much more; please study harder next term."
-            else:
-                comment = "Poor performance. You need to be far more serious with your studies. See me for counseling."
-                
-            # Save or update comment in StudentTermReport
-            report, created = StudentTermReport.objects.get_or_create(
-                student=student,
-                school_class=school_class,
-                academic_session=session,
-                term=term
-            )
-            report.class_teacher_comment = comment
-            report.save()
-            comments_generated += 1
-            
         return JsonResponse({
             'success': True, 
             'message': f'Automatically generated comments for {comments_generated} students based on their performance.'
@@ -2192,102 +2110,66 @@ def get_student_assessments(request, class_id):
     )
     
     # Get all students
-    students = school_class.students.filter(is_active=True).order_by('last_name', 'first_name')
-    
-    students_data = []
-    for student in students:
-        # Get attendance
-        try:
-            attendance = StudentAttendance.objects.get(
-                student=student,
+    students = list(school_class.students.filter(is_active=True).order_by('last_name', 'first_name'))
+    student_ids = [student.id for student in students]
+    
+    # One query per table for the whole class, merged per student below
+    def rows_by_student(model, fields):
+        return {
+            row['student_id']: row
+            for row in model.objects.filter(
+                student__in=student_ids,
                 school_class=school_class,
                 academic_session=session,
                 term=term
-            )
-            attendance_data = {
-                'times_present': attendance.times_present,
-                'times_school_opened': attendance.times_school_opened
-            }
-        except StudentAttendance.DoesNotExist:
+            ).values('student_id', *fields)
+        }
+    
+    attendance_fields = ('times_present', 'times_school_opened')
+    report_fields = ('class_teacher_comment', 'promotion_status')
+    
+    attendance_rows = rows_by_student(StudentAttendance, attendance_fields)
+    affective_rows = rows_by_student(StudentAffectiveTraits, AFFECTIVE_FIELDS)
+    psychomotor_rows = rows_by_student(StudentPsychomotorTraits, PSYCHOMOTOR_FIELDS)
+    report_rows = rows_by_student(StudentTermReport, report_fields)
+    
+    # Performance summary for informative comments
+    performance = {
+        row['student']: row
+        for row in StudentResult.objects.filter(
+            student__in=student_ids,
+            school_class=school_class,
+            academic_session=session,
+            term=term
+        ).values('student').annotate(total_score=Sum('total'), count=Count('id'))
+    }
+    
+    students_data = []
+    for student in students:
+        attendance = attendance_rows.get(student.id)
+        if attendance:
+            attendance_data = {field: attendance[field] for field in attendance_fields}
+        else:
             attendance_data = {'times_present': 0, 'times_school_opened': class_info.times_school_opened}
         
-        # Get affective traits
-        try:
-            affective = StudentAffectiveTraits.objects.get(
-                student=student,
-                school_class=school_class,
-                academic_session=session,
-                term=term
-            )
-            affective_data = {
-                'punctuality': affective.punctuality,
-                'mental_alertness': affective.mental_alertness,
-                'respect': affective.respect,
-                'neatness': affective.neatness,
-                'honesty': affective.honesty,
-                'politeness': affective.politeness,
-                'relationship_with_peers': affective.relationship_with_peers,
-                'willingness_to_learn': affective.willingness_to_learn,
-                'spirit_of_teamwork': affective.spirit_of_teamwork,
-            }
-        except StudentAffectiveTraits.DoesNotExist:
-            affective_data = {
-                'punctuality': 'C', 'mental_alertness': 'C', 'respect': 'C',
-                'neatness': 'C', 'honesty': 'C', 'politeness': 'C',
-                'relationship_with_peers': 'C', 'willingness_to_learn': 'C',
-                'spirit_of_teamwork': 'C'
-            }
+        affective = affective_rows.get(student.id)
+        affective_data = {field: affective[field] if affective else 'C' for field in AFFECTIVE_FIELDS}
         
-        # Get psychomotor traits
-        try:
-            psychomotor = StudentPsychomotorTraits.objects.get(
-                student=student,
-                school_class=school_class,
-                academic_session=session,
-                term=term
-            )
-            psychomotor_data = {
-                'games_and_sports': psychomotor.games_and_sports,
-                'verbal_skills': psychomotor.verbal_skills,
-                'artistic_creativity': psychomotor.artistic_creativity,
-                'musical_skills': psychomotor.musical_skills,
-                'dance_skills': psychomotor.dance_skills,
-            }
-        except StudentPsychomotorTraits.DoesNotExist:
-            psychomotor_data = {
-                'games_and_sports': 'C', 'verbal_skills': 'C',
-                'artistic_creativity': 'C', 'musical_skills': 'C',
-                'dance_skills': 'C'
-            }
+        psychomotor = psychomotor_rows.get(student.id)
+        psychomotor_data = {field: psychomotor[field] if psychomotor else 'C' for field in PSYCHOMOTOR_FIELDS}
         
-        # Get term report
-        try:
-            report = StudentTermReport.objects.get(
-                student=student,
-                school_class=school_class,
-                academic_session=session,
-                term=term
-            )
-            report_data = {
-                'class_teacher_comment': report.class_teacher_comment,
-                'promotion_status': report.promotion_status,
-            }
-        except StudentTermReport.DoesNotExist:
+        report = report_rows.get(student.id)
+        if report:
+            report_data = {field: report[field] for field in report_fields}
+        else:
             report_data = {
                 'class_teacher_comment': '',
                 'promotion_status': 'PENDING'
             }
         
-        # Get performance summary for informative comments
-        results = StudentResult.objects.filter(
-            student=student,
-            school_class=school_class,
-            academic_session=session,
-            term=term
-        )
-        total_score = sum(r.total for r in results)
-        count = results.count()
-        avg = round(total_score / count, 2) if count > 0 else 0
+        summary = performance.get(student.id)
+        count = summary['count'] if summary else 0
+        avg = round(summary['total_score'] / count, 2) if count > 0 else 0
         
         students_data.append({
             'student_id': student.id,
@@ -2314,6 +2196,7 @@ def get_student_assessments(request, class_id):
 
 @login_required
 @require_POST
+@idempotent
 def save_class_term_info(request, class_id):
     """
     AJAX endpoint to save class term info (times school opened, next term date)
@@ -2381,6 +2264,7 @@ def save_class_term_info(request, class_id):
 
 @login_required
 @require_POST
+@idempotent
 def save_student_attendance(request, class_id):
     """
     AJAX endpoint to save student attendance
@@ -2462,6 +2346,7 @@ def save_student_attendance(request, class_id):
 
 @login_required
 @require_POST
+@idempotent
 def save_student_affective_traits(request, class_id):
     """
     AJAX endpoint to save student affective traits
@@ -2541,6 +2426,7 @@ def save_student_affective_traits(request, class_id):
 
 @login_required
 @require_POST
+@idempotent
 def save_student_psychomotor_traits(request, class_id):
     """
     AJAX endpoint to save student psychomotor traits
@@ -2616,6 +2502,7 @@ def save_student_psychomotor_traits(request, class_id):
 
 @login_required
 @require_POST
+@idempotent
 def save_student_term_reports(request, class_id):
     """
     AJAX endpoint to save student term reports (comments, promotion)
@@ -2697,6 +2584,70 @@ def save_student_term_reports(request, class_id):
 
 @login_required
 @require_POST
+@idempotent
+def save_student_assessments(request, class_id):
+    """
+    AJAX endpoint to save class term info, attendance, affective traits,
+    psychomotor traits and term reports in one request. The whole payload
+    is validated first; nothing is saved if any part is rejected.
+    """
+    user = request.user
+    
+    if user.role != User.Role.TEACHER:
+        return JsonResponse({'error': 'Unauthorized'}, status=403)
+    
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return JsonResponse({'error': 'Invalid JSON'}, status=400)
+    
+    try:
+        teacher_profile = TeacherProfile.objects.get(user=user)
+    except TeacherProfile.DoesNotExist:
+        return JsonResponse({'error': 'Teacher profile not found'}, status=404)
+    
+    try:
+        school_class = SchoolClass.objects.get(id=class_id, school=teacher_profile.school)
+    except SchoolClass.DoesNotExist:
+        return JsonResponse({'error': 'Class not found'}, status=404)
+    
+    if school_class.form_teacher != teacher_profile:
+        return JsonResponse({'error': 'Only form teacher can update this'}, status=403)
+    
+    session_id = data.get('session_id')
+    term = data.get('term')
+    
+    if not all([session_id, term]):
+        return JsonResponse({'error': 'Missing parameters'}, status=400)
+    if term not in dict(TERM_CHOICES):
+        return JsonResponse({'error': 'Invalid term'}, status=400)
+    
+    try:
+        session = AcademicSession.objects.get(id=session_id, school=teacher_profile.school)
+    except AcademicSession.DoesNotExist:
+        return JsonResponse({'error': 'Session not found'}, status=404)
+    
+    sections, errors = validate_class_assessments(school_class, data)
+    if errors:
+        return JsonResponse({'error': 'Some assessments are invalid; nothing was saved', 'errors': errors}, status=400)
+    
+    try:
+        saved = save_class_assessments(
+            school_class, session, term, sections, class_teacher_name=str(teacher_profile)
+        )
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    
+    return JsonResponse({
+        'success': True,
+        'saved': saved,
+        'message': 'Assessments saved successfully'
+    })
+
+
+@login_required
+@require_POST
+@idempotent
 def save_principal_comments(request, class_id):
     """
     AJAX endpoint for school admin to save principal comments
@@ -2728,35 +2679,81 @@ def save_principal_comments(request, class_id):
     except AcademicSession.DoesNotExist:
         return JsonResponse({'error': 'Session not found'}, status=404)
     
-    saved_count = 0
     try:
-        with transaction.atomic():
-            for cmt in comments_list:
-                student_id = cmt.get('student_id')
-                
-                try:
-                    student = Student.objects.get(id=student_id, school_class=school_class)
-                except Student.DoesNotExist:
-                    continue
-                
-                report, created = StudentTermReport.objects.get_or_create(
-                    student=student,
-                    school_class=school_class,
-                    academic_session=session,
-                    term=term
-                )
-                report.principal_comment = cmt.get('principal_comment', '')
-                report.save()
-                saved_count += 1
+        counts, _ = apply_principal_comments([school_class], session, term, overrides=comments_list, apply_defaults=False)
         
         return JsonResponse({
             'success': True,
-            'message': f'Principal comments saved for {saved_count} students'
+            'message': f'Principal comments saved for {counts["written"]} students'
         })
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=400)
 
 
+@login_required
+@require_POST
+@idempotent
+def bulk_principal_comments(request):
+    """
+    AJAX endpoint for school admin to sign off principal comments for one
+    class (class_id) or the whole school (no class_id) in one request.
+    Explicit comments go in overrides; every other student with computed
+    results gets the default comment for the band of their term average.
+    """
+    user = request.user
+    
+    if user.role != User.Role.SCHOOL_ADMIN:
+        return JsonResponse({'error': 'Unauthorized - School Admin only'}, status=403)
+    
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return JsonResponse({'error': 'Invalid JSON'}, status=400)
+    
+    session_id = data.get('session_id')
+    term = data.get('term')
+    class_id = data.get('class_id')
+    overrides = data.get('overrides', [])
+    band_comments = data.get('band_comments') or {}
+    
+    if not all([session_id, term]):
+        return JsonResponse({'error': 'Missing parameters'}, status=400)
+    if term not in dict(TERM_CHOICES):
+        return JsonResponse({'error': 'Invalid term'}, status=400)
+    if not isinstance(overrides, list) or not isinstance(band_comments, dict):
+        return JsonResponse({'error': 'overrides must be a list and band_comments an object'}, status=400)
+    
+    try:
+        session = AcademicSession.objects.get(id=session_id, school=user.school)
+    except AcademicSession.DoesNotExist:
+        return JsonResponse({'error': 'Session not found'}, status=404)
+    
+    classes = SchoolClass.objects.filter(school=user.school, is_active=True)
+    if class_id:
+        classes = classes.filter(id=class_id)
+        if not classes.exists():
+            return JsonResponse({'error': 'Class not found'}, status=404)
+    
+    try:
+        with transaction.atomic():
+            counts, errors = apply_principal_comments(
+                classes, session, term,
+                overrides=overrides,
+                apply_defaults=data.get('apply_defaults', True),
+                band_comments=band_comments,
+                overwrite_existing=data.get('overwrite_existing', False),
+            )
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    
+    return JsonResponse({
+        'success': True,
+        'counts': counts,
+        'errors': errors,
+        'message': f'Principal comments saved for {counts["written"]} students'
+    })
+
+
 @login_required
 @require_GET
 def download_comprehensive_result_pdf(request, class_id):
@@ -2798,172 +2795,13 @@ def download_comprehensive_result_pdf(request, class_id):
         return JsonResponse({'error': 'Academic session not found'}, status=404)
     
     try:
-        # Get all students in the class
-        students = school_class.students.filter(is_active=True).order_by('last_name', 'first_name')
-        
-        # Get all subjects for this class
-        all_subjects = Subject.objects.filter(
-            class_subjects__school_class=school_class
-        ).distinct().order_by('name')
-        
-        # Get class term info
-        class_info = ClassTermInfo.objects.filter(
-            school_class=school_class,
-            academic_session=session,
-            term=term
-        ).first()
-        
-        student_results = []
-        
-        for student in students:
-            # Get all scores for this student across all subjects
-            scores_by_subject = {}
-            total_score = 0
-            subject_count = 0
-            
-            for subject in all_subjects:
-                try:
-                    result = StudentResult.objects.get(
-                        student=student,
-                        school_class=school_class,
-                        subject=subject,
-                        academic_session=session,
-                        term=term
-                    )
-                    scores_by_subject[subject.name] = {
-                        'ca1': result.ca1,
-                        'ca2': result.ca2,
-                        'ca3': result.ca3,
-                        'ca4': result.ca4,
-                        'test1': result.test1,
-                        'test2': result.test2,
-                        'exam': result.exam,
-                        'total': result.total,
-                        'grade': result.grade,
-                        'remark': result.remark,
-                        'subject_position': result.subject_position,
-                        'subject_highest': result.subject_highest,
-                    }
-                    total_score += result.total
-                    subject_count += 1
-                except StudentResult.DoesNotExist:
-                    scores_by_subject[subject.name] = {
-                        'ca1': 0, 'ca2': 0, 'ca3': 0, 'ca4': 0,
-                        'test1': 0, 'test2': 0, 'exam': 0, 'total': 0,
-                        'grade': '-', 'remark': '-',
-                        'subject_position': None, 'subject_highest': 0
-                    }
-            
-            # Calculate average across all subjects
-            average = (total_score / subject_count) if subject_count > 0 else 0
-            
-            student_results.append({
-                'student_id': student.id,
-                'student_obj': student,
-                'student': str(student),
-                'admission': student.admission_number,
-                'subjects': scores_by_subject,
-                'total': total_score,
-                'average': round(average, 2),
-                'subject_count': subject_count,
-            })
-        
-        # Sort by average to assign positions (handle ties)
-        student_results.sort(key=lambda x: x['average'], reverse=True)
-        
-        # Assign positions (handle ties correctly)
-        current_position = 1
-        last_average = None
-        
-        for index, result in enumerate(student_results):
-            if last_average is not None and result['average'] < last_average:
-                current_position = index + 1
-            
-            result['position'] = current_position
-            last_average = result['average']
-        
-        # Create ZIP file with individual PDFs
-        zip_buffer = io.BytesIO()
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            for result in student_results:
-                student = result['student_obj']
-                
-                # Get attendance
-                attendance = StudentAttendance.objects.filter(
-                    student=student,
-                    school_class=school_class,
-                    academic_session=session,
-                    term=term
-                ).first()
-                
-                # Get affective traits
-                affective = StudentAffectiveTraits.objects.filter(
-                    student=student,
-                    school_class=school_class,
-                    academic_session=session,
-                    term=term
-                ).first()
-                
-                # Get psychomotor traits
-                psychomotor = StudentPsychomotorTraits.objects.filter(
-                    student=student,
-                    school_class=school_class,
-                    academic_session=session,
-                    term=term
-                ).first()
-                
-                # Get term report
-                term_report = StudentTermReport.objects.filter(
-                    student=student,
-                    school_class=school_class,
-                    academic_session=session,
-                    term=term
-                ).first()
-
-                # Get all results for this student in this session for previous term total calculation
-                all_session_results = StudentResult.objects.filter(
-                    student=student,
-                    academic_session=session
-                ).select_related('subject')
-                
-                all_term_results = {}
-                for r in all_session_results:
-                    if r.term not in all_term_results:
-                        all_term_results[r.term] = {}
-                    all_term_results[r.term][r.subject.name] = {
-                        'total': r.total,
-                        'grade': r.grade
-                    }
-                
-                # Generate comprehensive PDF using the class school (more direct)
-                pdf_buffer = generate_student_result_pdf(
-                    school=school_class.school,
-                    school_class=school_class,
-                    academic_session=session,
-                    term=term,
-                    student_data=result,
-                    subjects=all_subjects,
-                    attendance_data=attendance,
-                    affective_traits=affective,
-                    psychomotor_traits=psychomotor,
-                    term_report=term_report,
-                    class_info=class_info,
-                    all_term_results=all_term_results
-                )
-                
-                # Create filename
-                student_name = result['student'].replace(' ', '_')
-                admission_num = result['admission'].replace(' ', '_').replace('/', '-')
-                filename = f"{student_name}_{admission_num}.pdf"
-                
-                # Add PDF to ZIP
-                zip_file.writestr(filename, pdf_buffer.getvalue())
-        
-        # Reset buffer position
-        zip_buffer.seek(0)
+        # Class data is loaded here; report cards are built one at a time in
+        # this process while the ZIP streams, in admission number order. The
+        # process pool is left to background exports (queue_export).
+        report_cards = iter_class_report_cards(school_class, session, term, workers=1)
         
-        # Create response
-        response = FileResponse(zip_buffer, content_type='application/zip')
+        # Each PDF goes out as soon as it is rendered
+        response = StreamingHttpResponse(stream_zip(report_cards), content_type='application/zip')
         zip_filename = f"{user.school.name.replace(' ', '_')}_{school_class.name}_{term}Term_Results_{session.name.replace('/', '-')}.zip"
         response['Content-Disposition'] = f'attachment; filename="{zip_filename}"'
         
@@ -2974,6 +2812,245 @@ def download_comprehensive_result_pdf(request, class_id):
         traceback.print_exc()
         return JsonResponse({'error': f'Error generating PDFs: {str(e)}'}, status=400)
 
+# --- Background Exports (class and school ZIPs built by export_worker) ---
+
+@login_required
+@require_POST
+@idempotent
+def queue_export(request):
+    """
+    Queue a class or school ZIP export (School Admin, or Form Teacher for
+    their own class). Returns the job; poll its status_url until done.
+    """
+    user = request.user
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return JsonResponse({'error': 'Invalid JSON'}, status=400)
+    
+    kind = data.get('kind')
+    if kind not in ExportJob.Kind.values:
+        return JsonResponse({'error': 'Unknown export type'}, status=400)
+    
+    if user.role == User.Role.SCHOOL_ADMIN:
+        school = user.school
+        teacher_profile = None
+    elif user.role == User.Role.TEACHER:
+        teacher_profile = TeacherProfile.objects.filter(user=user).first()
+        if teacher_profile is None:
+            return JsonResponse({'error': 'Teacher profile not found'}, status=404)
+        school = teacher_profile.school
+    else:
+        return JsonResponse({'error': 'Unauthorized'}, status=403)
+    
+    try:
+        session = AcademicSession.objects.get(id=data.get('session_id'), school=school)
+    except (AcademicSession.DoesNotExist, ValueError, TypeError):
+        return JsonResponse({'error': 'Academic session not found'}, status=404)
+    params = {'session_id': session.id}
+    
+    if kind != ExportJob.Kind.CLASS_CUMULATIVE:
+        term = data.get('term')
+        if term not in dict(TERM_CHOICES):
+            return JsonResponse({'error': 'Invalid term'}, status=400)
+        params['term'] = term
+    
+    if kind == ExportJob.Kind.SCHOOL_REPORT_CARDS:
+        if teacher_profile is not None:
+            return JsonResponse({'error': 'Unauthorized - School Admin only'}, status=403)
+    else:
+        try:
+            school_class = SchoolClass.objects.get(id=data.get('class_id'), school=school)
+        except (SchoolClass.DoesNotExist, ValueError, TypeError):
+            return JsonResponse({'error': 'Class not found'}, status=404)
+        if teacher_profile is not None and school_class.form_teacher_id != teacher_profile.id:
+            return JsonResponse({'error': 'Unauthorized - You must be the form teacher of this class'}, status=403)
+        params['class_id'] = school_class.id
+    
+    job = enqueue_export(user, school, kind, params)
+    return JsonResponse({'success': True, 'job': job_payload(job)}, status=202)
+
+
+def _export_job_for_request(request, job_id):
+    """The job if the user queued it, or is an admin of its school; else None."""
+    user = request.user
+    jobs = ExportJob.objects.filter(id=job_id)
+    if user.role == User.Role.SCHOOL_ADMIN:
+        jobs = jobs.filter(school=user.school)
+    else:
+        jobs = jobs.filter(requested_by=user)
+    return jobs.first()
+
+
+@login_required
+@require_GET
+def export_status(request, job_id):
+    """Progress of a queued export."""
+    job = _export_job_for_request(request, job_id)
+    if job is None:
+        return JsonResponse({'error': 'Export not found'}, status=404)
+    if job.status in (ExportJob.Status.QUEUED, ExportJob.Status.RUNNING):
+        # Surfaces a dead worker here even when no worker is left to notice
+        check_export_jobs()
+        job.refresh_from_db()
+    return JsonResponse({'success': True, 'job': job_payload(job)})
+
+
+@login_required
+@require_GET
+def download_export(request, job_id):
+    """Download the ZIP of a finished export."""
+    job = _export_job_for_request(request, job_id)
+    if job is None:
+        return JsonResponse({'error': 'Export not found'}, status=404)
+    if job.status != ExportJob.Status.DONE:
+        return JsonResponse({'error': 'Export is not ready yet', 'job': job_payload(job)}, status=409)
+    if not job.chunks.exists():
+        return JsonResponse({'error': 'Export file has expired; please export again'}, status=410)
+    response = StreamingHttpResponse(iter_export_zip(job), content_type='application/zip')
+    response['Content-Disposition'] = f'attachment; filename="{job.filename}"'
+    response['Content-Length'] = str(job.size)
+    return response
+
+# --- Published Results (frozen report cards) ---
+
+# Published snapshots never change, so browsers may reuse them for a while;
+# the ETag changes with every republish.
+PUBLISHED_RESULT_MAX_AGE = 300
+
+
+@login_required
+@require_POST
+@idempotent
+def publish_class_results(request, class_id):
+    """
+    Freeze the class's term results into per-student report card snapshots
+    (School Admin or Form Teacher). Publishing again creates a new version.
+    """
+    user = request.user
+    
+    if user.role == User.Role.SCHOOL_ADMIN:
+        school = user.school
+        try:
+            school_class = SchoolClass.objects.get(id=class_id, school=school)
+        except SchoolClass.DoesNotExist:
+            return JsonResponse({'error': 'Class not found'}, status=404)
+    elif user.role == User.Role.TEACHER:
+        try:
+            teacher_profile = TeacherProfile.objects.get(user=user)
+            school = teacher_profile.school
+            school_class = SchoolClass.objects.get(id=class_id, school=school)
+        except (TeacherProfile.DoesNotExist, SchoolClass.DoesNotExist):
+            return JsonResponse({'error': 'Class not found'}, status=404)
+        if school_class.form_teacher != teacher_profile:
+            return JsonResponse({'error': 'Unauthorized - You must be the form teacher of this class'}, status=403)
+    else:
+        return JsonResponse({'error': 'Unauthorized'}, status=403)
+    
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return JsonResponse({'error': 'Invalid JSON'}, status=400)
+    
+    session_id = data.get('session_id')
+    term = data.get('term')
+    if not all([session_id, term]):
+        return JsonResponse({'error': 'Missing session_id or term'}, status=400)
+    
+    try:
+        session = AcademicSession.objects.get(id=session_id, school=school)
+    except AcademicSession.DoesNotExist:
+        return JsonResponse({'error': 'Academic session not found'}, status=404)
+    
+    from academics.publishing import publish_class_results as publish
+    try:
+        publication = publish(school_class, session, term, published_by=user)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    
+    return JsonResponse({
+        'success': True,
+        'version': publication.version,
+        'students': publication.student_count,
+        'message': f'Published {term} term results (version {publication.version}) for {publication.student_count} students'
+    })
+
+
+def _published_snapshot_for_request(request, session_id, term):
+    """
+    Returns (snapshot, error_response) for the logged-in student.
+    error_response is set when the snapshot cannot be served.
+    """
+    user = request.user
+    if user.role != User.Role.STUDENT:
+        return None, JsonResponse({'error': 'Unauthorized'}, status=403)
+    
+    student = get_object_or_404(Student, user=user)
+    session = get_object_or_404(AcademicSession, id=session_id, school=student.school)
+    
+    from academics.publishing import get_published_snapshot
+    snapshot = get_published_snapshot(student, session, term)
+    if snapshot is None:
+        return None, JsonResponse({'error': 'Result has not been published'}, status=404)
+    return snapshot, None
+
+
+def _published_etag(snapshot, kind, key=None):
+    """
+    The JSON is the snapshot itself; a PDF also depends on the renderer and
+    the asset files it draws, which its cache key covers.
+    """
+    if key is not None:
+        return f'"{kind}-{key[:32]}"'
+    return f'"{kind}-{snapshot.publication_id}-{snapshot.student_id}"'
+
+
+def _with_cache_headers(response, etag):
+    response['ETag'] = etag
+    response['Cache-Control'] = f'private, max-age={PUBLISHED_RESULT_MAX_AGE}'
+    return response
+
+
+@login_required
+@require_GET
+def student_published_result(request, session_id, term):
+    """Published term report card of the logged-in student, as JSON."""
+    snapshot, error = _published_snapshot_for_request(request, session_id, term)
+    if error:
+        return error
+    
+    etag = _published_etag(snapshot, 'json')
+    if request.headers.get('If-None-Match') == etag:
+        return _with_cache_headers(HttpResponseNotModified(), etag)
+    
+    return _with_cache_headers(JsonResponse({'success': True, 'result': snapshot.data}), etag)
+
+
+@login_required
+@require_GET
+def download_published_result_pdf(request, session_id, term):
+    """Published term report card of the logged-in student, as PDF."""
+    snapshot, error = _published_snapshot_for_request(request, session_id, term)
+    if error:
+        return error
+    
+    data = snapshot.data
+    school_class = snapshot.publication.school_class
+    kwargs = report_card_kwargs(
+        data, published_school(data, school_class.school), published_class(data, school_class)
+    )
+    etag = _published_etag(snapshot, 'pdf', generate_student_result_pdf.key(**kwargs))
+    if request.headers.get('If-None-Match') == etag:
+        return _with_cache_headers(HttpResponseNotModified(), etag)
+    
+    pdf_buffer = generate_student_result_pdf(**kwargs)
+    
+    student = data['student']
+    filename = f"{student['name'].split(' (')[0].replace(' ', '_')}_{data['academic_session']['name'].replace('/', '-')}_{data['term']}_Term.pdf"
+    response = FileResponse(pdf_buffer, as_attachment=True, filename=filename, content_type='application/pdf')
+    return _with_cache_headers(response, etag)
+
+
 # --- AI Assistant (Chatbot, Question Generator, Lesson Note, Download, CBT Publish) ---
 
 @login_required
@@ -0,0 +1,48 @@
+"""
+ZIP archives written as a stream.
+
+stream_zip() takes an iterable of (filename, bytes) members and yields
+the archive piece by piece: each member's compressed bytes as soon as it
+has been added, then the central directory. Nothing but the member being
+written is held in memory, so a download of any size can go straight
+into a StreamingHttpResponse and the first bytes leave before the last
+member exists.
+"""
+import zipfile
+
+
+class _Drain:
+    """
+    Write-only file for ZipFile. It has no tell() or seek(), so ZipFile
+    writes each member's sizes in a data descriptor after the data instead
+    of seeking back into the local header.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def take(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_zip(members, compression=zipfile.ZIP_DEFLATED):
+    """Yields the bytes of a ZIP archive holding the (filename, bytes) members, in order."""
+    drain = _Drain()
+    with zipfile.ZipFile(drain, "w", compression) as archive:
+        for filename, data in members:
+            archive.writestr(filename, data)
+            chunk = drain.take()
+            if chunk:
+                yield chunk
+    chunk = drain.take()
+    if chunk:
+        yield chunk
@@ -1,16 +1,41 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from .models import School, Scheme, SchoolSubscription, AcademicSession, Term
 
 @admin.register(School)
 class SchoolAdmin(admin.ModelAdmin):
     list_display = ("name", "get_is_active", "created_at")
     search_fields = ("name",)
-    list_filter = ("is_active",)
+    list_filter = ("is_active", "report_card_layout")
+    actions = ["compute_term_results"]
 
     def get_is_active(self, obj):
         return obj.is_active
     get_is_active.short_description = "Active"
 
+    def compute_term_results(self, request, queryset):
+        # Imported here: academics depends on schools, not the other way round
+        from academics.models import TERM_CHOICES
+        from academics.services import school_term_jobs
+
+        # A whole school is too much work for an admin request, so this only
+        # says which compute_school_results runs are needed
+        commands = []
+        for school in queryset:
+            for term, _ in TERM_CHOICES:
+                if school_term_jobs(term, school=school):
+                    commands.append(f"python manage.py compute_school_results --school {school.id} --term {term}")
+
+        if not commands:
+            self.message_user(request, "No results found in the active session.", messages.WARNING)
+            return
+
+        self.message_user(
+            request,
+            "Term results are computed outside the web request. Run: " + "; ".join(commands),
+            messages.INFO,
+        )
+    compute_term_results.short_description = "Show how to compute term results for all classes (active session)"
+
 @admin.register(Scheme)
 class SchemeAdmin(admin.ModelAdmin):
     list_display = ("name", "price", "duration_months")
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schools', '0004_school_principal_signature_school_stamp'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='school',
+            name='report_card_layout',
+            field=models.CharField(choices=[('flowing', 'Flowing (laid out per card)'), ('fixed', 'Fixed (drawn at set positions, faster)')], default='flowing', help_text='How student report card PDFs are rendered. Both print the same page.', max_length=10),
+        ),
+    ]
@@ -28,12 +28,23 @@ class School(models.Model):
     """
     Root entity. Every other domain object must belong to a School.
     """
+
+    class ReportCardLayout(models.TextChoices):
+        FLOWING = "flowing", "Flowing (laid out per card)"
+        FIXED = "fixed", "Fixed (drawn at set positions, faster)"
+
     name = models.CharField(max_length=255, unique=True)
     address = models.TextField()
     motto = models.CharField(max_length=255, blank=True, null=True)
     logo = models.ImageField(upload_to="school_logos/", blank=True, null=True)
     principal_signature = models.ImageField(upload_to="school_signatures/", blank=True, null=True, help_text="Principal's signature")
     stamp = models.ImageField(upload_to="school_stamps/", blank=True, null=True, help_text="School Official Stamp")
+    report_card_layout = models.CharField(
+        max_length=10,
+        choices=ReportCardLayout.choices,
+        default=ReportCardLayout.FLOWING,
+        help_text="How student report card PDFs are rendered. Both print the same page.",
+    )
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
 